@@ -0,0 +1,26 @@
+"""Add momentum_changed_at to stock_indicator_states for incremental rescoring
+
+Revision ID: e9b1d3f5a7c0
+Revises: d7f9b1c3e5a8
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b1d3f5a7c0'
+down_revision: Union[str, None] = 'd7f9b1c3e5a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('stock_indicator_states', sa.Column('momentum_changed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('stock_indicator_states', 'momentum_changed_at')
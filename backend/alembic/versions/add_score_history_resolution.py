@@ -0,0 +1,26 @@
+"""Add resolution (retention tier) to stock_score_history
+
+Revision ID: e7a3c5d9f2b4
+Revises: d5f1b3a8e6c9
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c5d9f2b4'
+down_revision: Union[str, None] = 'd5f1b3a8e6c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('stock_score_history', sa.Column('resolution', sa.String(length=10), nullable=False, server_default='daily'))
+
+
+def downgrade() -> None:
+    op.drop_column('stock_score_history', 'resolution')
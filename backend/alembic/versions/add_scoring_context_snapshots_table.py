@@ -0,0 +1,44 @@
+"""Add scoring_context_snapshots table for versioned scoring inputs
+
+Revision ID: a7c2e9d4b1f0
+Revises: f3a5b7c9d2e1
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c2e9d4b1f0'
+down_revision: Union[str, None] = 'f3a5b7c9d2e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create scoring_context_snapshots table
+    op.create_table('scoring_context_snapshots',
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('roic_p90', sa.Float(), nullable=False),
+        sa.Column('roic_p75', sa.Float(), nullable=False),
+        sa.Column('roic_p50', sa.Float(), nullable=False),
+        sa.Column('roic_p25', sa.Float(), nullable=False),
+        sa.Column('sector_benchmarks', sa.JSON(), nullable=False),
+        sa.Column('stock_count', sa.Integer(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_index(op.f('ix_scoring_context_snapshots_version'), 'scoring_context_snapshots', ['version'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_scoring_context_snapshots_version'), table_name='scoring_context_snapshots')
+    op.drop_table('scoring_context_snapshots')
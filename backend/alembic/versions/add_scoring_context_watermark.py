@@ -0,0 +1,26 @@
+"""Add fundamentals_watermark to scoring_context_snapshots for incremental rescoring
+
+Revision ID: b3d8f1a6c5e2
+Revises: a7c2e9d4b1f0
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d8f1a6c5e2'
+down_revision: Union[str, None] = 'a7c2e9d4b1f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('scoring_context_snapshots', sa.Column('fundamentals_watermark', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('scoring_context_snapshots', 'fundamentals_watermark')
@@ -0,0 +1,54 @@
+"""Add running sums and counts to sector_averages
+
+Revision ID: c4e9a2f7d3b8
+Revises: b3d8f1a6c5e2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e9a2f7d3b8'
+down_revision: Union[str, None] = 'b3d8f1a6c5e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (sector_averages suffix, stock_fundamentals column, outlier cap)
+METRICS = [
+    ('pe', 'pe_ratio', 100),
+    ('roic', 'roic', 200),
+    ('roe', 'roe', 200),
+    ('debt_equity', 'debt_equity', 5),
+    ('ev_ebitda', 'ev_ebitda', 100),
+    ('gross_margin', 'gross_margin', 100),
+    ('operating_margin', 'operating_margin', 100),
+    ('net_margin', 'net_margin', 100),
+]
+
+
+def upgrade() -> None:
+    for suffix, _, _ in METRICS:
+        op.add_column('sector_averages', sa.Column(f'sum_{suffix}', sa.Numeric(20, 4), nullable=False, server_default='0'))
+        op.add_column('sector_averages', sa.Column(f'count_{suffix}', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from the current fundamentals so incremental updates start from correct totals
+    for suffix, column, cap in METRICS:
+        kept = f"""
+            FROM stock_fundamentals f JOIN stocks s ON s.id = f.stock_id
+            WHERE s.sector = sector_averages.sector AND f.{column} > 0 AND f.{column} <= {cap}
+        """
+        op.execute(f"""
+            UPDATE sector_averages SET
+                sum_{suffix} = (SELECT COALESCE(SUM(f.{column}), 0) {kept}),
+                count_{suffix} = (SELECT COUNT(f.{column}) {kept})
+        """)
+
+
+def downgrade() -> None:
+    for suffix, _, _ in METRICS:
+        op.drop_column('sector_averages', f'count_{suffix}')
+        op.drop_column('sector_averages', f'sum_{suffix}')
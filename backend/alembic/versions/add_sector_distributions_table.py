@@ -0,0 +1,47 @@
+"""Add sector_distributions table for per-sector metric quantiles
+
+Revision ID: d5f1b3a8e6c9
+Revises: c4e9a2f7d3b8
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1b3a8e6c9'
+down_revision: Union[str, None] = 'c4e9a2f7d3b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create sector_distributions table
+    op.create_table('sector_distributions',
+        sa.Column('sector', sa.String(length=100), nullable=False),
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('min_value', sa.Numeric(precision=14, scale=4), nullable=True),
+        sa.Column('p10', sa.Numeric(precision=14, scale=4), nullable=True),
+        sa.Column('p25', sa.Numeric(precision=14, scale=4), nullable=True),
+        sa.Column('median', sa.Numeric(precision=14, scale=4), nullable=True),
+        sa.Column('p75', sa.Numeric(precision=14, scale=4), nullable=True),
+        sa.Column('p90', sa.Numeric(precision=14, scale=4), nullable=True),
+        sa.Column('max_value', sa.Numeric(precision=14, scale=4), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_index('idx_sector_distribution_sector_metric', 'sector_distributions', ['sector', 'metric'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_sector_distribution_sector_metric', table_name='sector_distributions')
+    op.drop_table('sector_distributions')
@@ -0,0 +1,69 @@
+"""Add signal_transitions table recorded by the daily score snapshot
+
+Revision ID: f9b2d4e6a8c1
+Revises: e7a3c5d9f2b4
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f9b2d4e6a8c1'
+down_revision: Union[str, None] = 'e7a3c5d9f2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The "signal" enum type already exists (created with stock_scores)
+signal_enum = postgresql.ENUM('STRONG_BUY', 'BUY', 'HOLD', 'SELL', 'STRONG_SELL', name='signal', create_type=False)
+
+
+def upgrade() -> None:
+    # Create signal_transitions table
+    op.create_table('signal_transitions',
+        sa.Column('stock_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('transition_date', sa.Date(), nullable=False),
+        sa.Column('previous_signal', signal_enum, nullable=False),
+        sa.Column('new_signal', signal_enum, nullable=False),
+        sa.Column('previous_score', sa.Numeric(precision=5, scale=2), nullable=False),
+        sa.Column('new_score', sa.Numeric(precision=5, scale=2), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['stock_id'], ['stocks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_index('idx_signal_transition_date', 'signal_transitions', ['transition_date'], unique=False)
+    op.create_index('idx_signal_transition_stock_date', 'signal_transitions', ['stock_id', 'transition_date'], unique=True)
+
+    # Backfill from existing history: every row whose signal differs from the stock's previous row
+    if op.get_bind().dialect.name == 'postgresql':
+        new_id = "gen_random_uuid()"
+    else:
+        new_id = "lower(hex(randomblob(16)))"
+    op.execute(f"""
+        INSERT INTO signal_transitions
+            (id, stock_id, transition_date, previous_signal, new_signal, previous_score, new_score,
+             created_at, updated_at, is_deleted)
+        SELECT {new_id}, stock_id, snapshot_date, previous_signal, signal, previous_score, total_score,
+               CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, false
+        FROM (
+            SELECT stock_id, snapshot_date, signal, total_score,
+                   LAG(signal) OVER (PARTITION BY stock_id ORDER BY snapshot_date) AS previous_signal,
+                   LAG(total_score) OVER (PARTITION BY stock_id ORDER BY snapshot_date) AS previous_score
+            FROM stock_score_history
+        ) AS ordered
+        WHERE previous_signal IS NOT NULL AND previous_signal <> signal
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_signal_transition_stock_date', table_name='signal_transitions')
+    op.drop_index('idx_signal_transition_date', table_name='signal_transitions')
+    op.drop_table('signal_transitions')
@@ -0,0 +1,48 @@
+"""Add stock_indicator_states table for incremental technical indicators
+
+Revision ID: a3d5f7b9c2e4
+Revises: f9b2d4e6a8c1
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d5f7b9c2e4'
+down_revision: Union[str, None] = 'f9b2d4e6a8c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create stock_indicator_states table (states are built by the next sync)
+    op.create_table('stock_indicator_states',
+        sa.Column('stock_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('as_of', sa.Date(), nullable=False),
+        sa.Column('buffers', sa.JSON(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('sma_50', sa.Float(), nullable=False),
+        sa.Column('sma_200', sa.Float(), nullable=False),
+        sa.Column('rsi', sa.Float(), nullable=False),
+        sa.Column('volume', sa.BigInteger(), nullable=False),
+        sa.Column('volume_sma_20', sa.Float(), nullable=False),
+        sa.Column('price_vs_sma50', sa.Float(), nullable=False),
+        sa.Column('price_vs_sma200', sa.Float(), nullable=False),
+        sa.Column('volume_trend', sa.Float(), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['stock_id'], ['stocks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('stock_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('stock_indicator_states')
@@ -0,0 +1,26 @@
+"""Add prices_checked_on to stocks for the price store
+
+Revision ID: d7f9b1c3e5a8
+Revises: c5e7a9b1d3f6
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f9b1c3e5a8'
+down_revision: Union[str, None] = 'c5e7a9b1d3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('stocks', sa.Column('prices_checked_on', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('stocks', 'prices_checked_on')
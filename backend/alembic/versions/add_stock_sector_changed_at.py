@@ -0,0 +1,26 @@
+"""Add sector_changed_at to stocks for incremental rescoring
+
+Revision ID: c5e7a9b1d3f6
+Revises: a3d5f7b9c2e4
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e7a9b1d3f6'
+down_revision: Union[str, None] = 'a3d5f7b9c2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('stocks', sa.Column('sector_changed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('stocks', 'sector_changed_at')
@@ -38,6 +38,7 @@ class AvanzaAIClient:
     - Getting pre-built strategy results
     - Deep diving on individual stocks
     - Comparing multiple stocks
+    - Charting score history for many stocks at once
     - Running custom screeners
     """
 
@@ -269,6 +270,58 @@ class AvanzaAIClient:
             logger.error(f"Failed to compare stocks: {e}")
             return pd.DataFrame()
 
+    def get_score_history(
+        self,
+        tickers: List[str],
+        days: int = 30,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Get daily score history for several stocks with a single request.
+
+        Args:
+            tickers: List of stock tickers
+            days: Days of history when start_date is omitted (default: 30)
+            start_date: First date, ISO format (optional)
+            end_date: Last date, ISO format (optional; default: latest snapshot)
+
+        Returns:
+            DataFrame indexed by date with (ticker, column) columns, where
+            column is total_score, value_score, quality_score, momentum_score,
+            health_score or signal
+
+        Example:
+            >>> history = client.get_score_history(["VOLV-B", "SCVB"], days=90)
+            >>> print(history["VOLV-B"]["total_score"].tail())
+        """
+        payload: Dict[str, Any] = {"tickers": tickers, "days": days}
+        if start_date:
+            payload["start_date"] = start_date
+        if end_date:
+            payload["end_date"] = end_date
+
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/stocks/score-history/batch",
+                json=payload
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            if data.get("series"):
+                index = pd.to_datetime(data["dates"])
+                return pd.concat(
+                    {ticker: pd.DataFrame(columns, index=index) for ticker, columns in data["series"].items()},
+                    axis=1
+                )
+            else:
+                return pd.DataFrame()
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to get score history: {e}")
+            return pd.DataFrame()
+
     def run_custom_screener(self, expression: str) -> pd.DataFrame:
         """
         Run a custom screening query with dynamic expressions.
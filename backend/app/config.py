@@ -23,6 +23,25 @@ class Settings(BaseSettings):
     REDIS_ENABLED: bool = False  # Set to True via docker-compose env
     CACHE_TTL_DEFAULT: int = 300  # 5 minutes
     CACHE_TTL_SCORES: int = 600  # 10 minutes for leaderboards/scores
+    # Computed indicator frames, keyed by (ticker, period, last bar date)
+    INDICATOR_CACHE_SIZE: int = 256  # Frames kept in each process
+    INDICATOR_CACHE_TTL_SECONDS: int = 86_400
+
+    # Scoring
+    # Incremental rescoring escalates to a full recompute when the global ROIC
+    # percentiles or any sector benchmark move by more than this fraction.
+    SCORING_DRIFT_TOLERANCE: float = 0.05
+    # Worker processes for sector-sharded scoring in scripts such as seed_data.py; 0 = one per
+    # CPU core. Parallel Celery recomputes run one task per sector instead.
+    SCORING_WORKERS: int = 0
+
+    # Score history
+    # Store a history row only when a stock's scores or signal change; readers forward-fill.
+    SCORE_HISTORY_CHANGE_ONLY: bool = False
+    # The compaction job keeps one row per stock per week for history older than
+    # this many days, and one per month beyond SCORE_HISTORY_WEEKLY_DAYS.
+    SCORE_HISTORY_DAILY_DAYS: int = 90
+    SCORE_HISTORY_WEEKLY_DAYS: int = 730
 
     # AI Features
     ENABLE_AI_ENDPOINTS: bool = True
@@ -59,6 +78,19 @@ class Settings(BaseSettings):
     # If true, uses mock data even if USE_REAL_STOCK_API is true (override for testing)
     FORCE_MOCK_DATA: bool = False
 
+    # Price history is served from the stock_prices table and only the missing
+    # trailing days are fetched. A ticker seen for the first time is loaded
+    # with this much history, so every chart period is served from the store.
+    PRICE_STORE_HISTORY_PERIOD: str = "5y"
+    # Concurrent provider fetches when backfilling price history for many stocks
+    PRICE_FETCH_WORKERS: int = 8
+
+    # Local memory-mapped price cache (Arrow IPC files per ticker, needs pyarrow)
+    # for worker nodes and the desktop app; avoids hydrating prices from SQL.
+    PRICE_CACHE_ENABLED: bool = False
+    PRICE_CACHE_DIR: str = "./price_cache"
+    PRICE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # Least recently used tickers are evicted beyond this
+
     # LLM (AI insights)
     ANTHROPIC_API_KEY: str = ""
     LLM_ENABLED: bool = True
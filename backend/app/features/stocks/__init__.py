@@ -10,6 +10,7 @@ from app.features.stocks.models import (
     InstrumentType,
     Signal,
 )
+from app.features.stocks.services import sector_stats  # noqa: F401  (registers SectorAverage listeners)
 
 __all__ = [
     "Stock",
@@ -5,7 +5,7 @@ from typing import Optional
 from decimal import Decimal
 
 from sqlalchemy import (
-    Column, Integer, String, Numeric, DateTime, Date,
+    Column, Integer, String, Numeric, DateTime, Date, Float, JSON,
     ForeignKey, Enum as SQLEnum, Index, BigInteger
 )
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
@@ -58,12 +58,18 @@ class Stock(BaseEntity):
 
     # Metadata
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set when the sector changes (incremental rescoring); other column updates leave it alone
+    sector_changed_at = Column(DateTime, nullable=True)
+    # Day the provider was last asked for trailing prices (PriceStore.refresh asks at most once a day)
+    prices_checked_on = Column(Date, nullable=True)
 
     # Relationships
     prices = relationship("StockPrice", back_populates="stock", cascade="all, delete-orphan")
     fundamentals = relationship("StockFundamental", back_populates="stock", uselist=False, cascade="all, delete-orphan")
     scores = relationship("StockScore", back_populates="stock", uselist=False, cascade="all, delete-orphan")
     score_history = relationship("StockScoreHistory", back_populates="stock", foreign_keys="[StockScoreHistory.stock_id]", cascade="all, delete-orphan")
+    signal_transitions = relationship("SignalTransition", back_populates="stock", cascade="all, delete-orphan")
+    indicator_state = relationship("StockIndicatorState", back_populates="stock", uselist=False, cascade="all, delete-orphan")
     watchlist_items = relationship("WatchlistItem", back_populates="stock", cascade="all, delete-orphan")
 
     # Indexes
@@ -206,6 +212,9 @@ class StockScoreHistory(BaseEntity):
     # Signal
     signal = Column(SQLEnum(Signal), nullable=False)
 
+    # Retention tier: "daily", or "weekly"/"monthly" once rolled up by compaction
+    resolution = Column(String(10), nullable=False, default="daily")
+
     # Relationship
     stock = relationship("Stock", back_populates="score_history", foreign_keys=[stock_id])
 
@@ -219,6 +228,67 @@ class StockScoreHistory(BaseEntity):
         return f"<StockScoreHistory(stock_id={self.stock_id}, date={self.snapshot_date}, total={self.total_score})>"
 
 
+class SignalTransition(BaseEntity):
+    """A change of a stock's signal (e.g. HOLD -> BUY), recorded by the daily snapshot."""
+
+    __tablename__ = "signal_transitions"
+
+    stock_id = Column(PGUUID(as_uuid=True), ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False)
+    transition_date = Column(Date, nullable=False)
+
+    previous_signal = Column(SQLEnum(Signal), nullable=False)
+    new_signal = Column(SQLEnum(Signal), nullable=False)
+
+    # Total scores on either side of the transition
+    previous_score = Column(Numeric(5, 2), nullable=False)
+    new_score = Column(Numeric(5, 2), nullable=False)
+
+    stock = relationship("Stock", back_populates="signal_transitions")
+
+    __table_args__ = (
+        Index('idx_signal_transition_date', 'transition_date'),
+        Index('idx_signal_transition_stock_date', 'stock_id', 'transition_date', unique=True),
+    )
+
+    def __repr__(self):
+        return (
+            f"<SignalTransition(stock_id={self.stock_id}, date={self.transition_date}, "
+            f"{self.previous_signal} -> {self.new_signal})>"
+        )
+
+
+class StockIndicatorState(BaseEntity):
+    """Rolling technical-indicator state of a stock, advanced one bar at a time."""
+
+    __tablename__ = "stock_indicator_states"
+
+    stock_id = Column(PGUUID(as_uuid=True), ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False, unique=True)
+    # Date of the last bar applied (today's bar while intraday quotes update it)
+    as_of = Column(Date, nullable=False)
+
+    # Window buffers: last 200 closes, 20 volumes and 14 gains/losses
+    buffers = Column(JSON, nullable=False)
+
+    # Latest indicator values (keys of PriceDataService.get_latest_indicators())
+    price = Column(Float, nullable=False)
+    sma_50 = Column(Float, nullable=False)
+    sma_200 = Column(Float, nullable=False)
+    rsi = Column(Float, nullable=False)
+    volume = Column(BigInteger, nullable=False)
+    volume_sma_20 = Column(Float, nullable=False)
+    price_vs_sma50 = Column(Float, nullable=False)
+    price_vs_sma200 = Column(Float, nullable=False)
+    volume_trend = Column(Float, nullable=True)
+
+    # Last time the momentum score these values give changed (incremental rescoring)
+    momentum_changed_at = Column(DateTime, nullable=True)
+
+    stock = relationship("Stock", back_populates="indicator_state")
+
+    def __repr__(self):
+        return f"<StockIndicatorState(stock_id={self.stock_id}, as_of={self.as_of}, rsi={self.rsi})>"
+
+
 class SectorAverage(BaseEntity):
     """Cached sector benchmarks for comparison."""
 
@@ -236,6 +306,25 @@ class SectorAverage(BaseEntity):
     avg_operating_margin = Column(Numeric(10, 2), nullable=True)
     avg_net_margin = Column(Numeric(10, 2), nullable=True)
 
+    # Running sums and counts of the values behind each average (within the
+    # outlier caps), kept current on every StockFundamental write
+    sum_pe = Column(Numeric(20, 4), nullable=False, default=0)
+    count_pe = Column(Integer, nullable=False, default=0)
+    sum_roic = Column(Numeric(20, 4), nullable=False, default=0)
+    count_roic = Column(Integer, nullable=False, default=0)
+    sum_roe = Column(Numeric(20, 4), nullable=False, default=0)
+    count_roe = Column(Integer, nullable=False, default=0)
+    sum_debt_equity = Column(Numeric(20, 4), nullable=False, default=0)
+    count_debt_equity = Column(Integer, nullable=False, default=0)
+    sum_ev_ebitda = Column(Numeric(20, 4), nullable=False, default=0)
+    count_ev_ebitda = Column(Integer, nullable=False, default=0)
+    sum_gross_margin = Column(Numeric(20, 4), nullable=False, default=0)
+    count_gross_margin = Column(Integer, nullable=False, default=0)
+    sum_operating_margin = Column(Numeric(20, 4), nullable=False, default=0)
+    count_operating_margin = Column(Integer, nullable=False, default=0)
+    sum_net_margin = Column(Numeric(20, 4), nullable=False, default=0)
+    count_net_margin = Column(Integer, nullable=False, default=0)
+
     # Metadata
     stock_count = Column(Integer, nullable=False, default=0)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -244,6 +333,58 @@ class SectorAverage(BaseEntity):
         return f"<SectorAverage(sector={self.sector}, count={self.stock_count})>"
 
 
+class SectorDistribution(BaseEntity):
+    """Quantiles of one fundamental metric within a sector (refreshed with SectorAverage)."""
+
+    __tablename__ = "sector_distributions"
+
+    sector = Column(String(100), nullable=False)
+    metric = Column(String(50), nullable=False)
+
+    # Number of stocks in the sector with a value for the metric
+    sample_count = Column(Integer, nullable=False, default=0)
+
+    min_value = Column(Numeric(14, 4), nullable=True)
+    p10 = Column(Numeric(14, 4), nullable=True)
+    p25 = Column(Numeric(14, 4), nullable=True)
+    median = Column(Numeric(14, 4), nullable=True)
+    p75 = Column(Numeric(14, 4), nullable=True)
+    p90 = Column(Numeric(14, 4), nullable=True)
+    max_value = Column(Numeric(14, 4), nullable=True)
+
+    __table_args__ = (
+        Index('idx_sector_distribution_sector_metric', 'sector', 'metric', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<SectorDistribution(sector={self.sector}, metric={self.metric}, median={self.median})>"
+
+
+class ScoringContextSnapshot(BaseEntity):
+    """Versioned scoring inputs (ROIC percentiles + sector benchmarks) built at recompute time."""
+
+    __tablename__ = "scoring_context_snapshots"
+
+    version = Column(Integer, unique=True, nullable=False, index=True)
+
+    # Global ROIC percentile thresholds (floats, so breakdowns reproduce recompute scores exactly)
+    roic_p90 = Column(Float, nullable=False)
+    roic_p75 = Column(Float, nullable=False)
+    roic_p50 = Column(Float, nullable=False)
+    roic_p25 = Column(Float, nullable=False)
+
+    # Sector name -> SectorBenchmarks fields
+    sector_benchmarks = Column(JSON, nullable=False, default=dict)
+
+    # Metadata
+    stock_count = Column(Integer, nullable=False, default=0)
+    # Latest StockFundamental/Stock update covered; incremental rescoring picks up rows after it
+    fundamentals_watermark = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ScoringContextSnapshot(version={self.version}, stocks={self.stock_count})>"
+
+
 class Watchlist(BaseEntity):
     """User watchlists (localStorage for MVP, DB for auth version)."""
 
@@ -296,7 +437,11 @@ __all__ = [
     "StockFundamental",
     "StockScore",
     "StockScoreHistory",
+    "SignalTransition",
+    "StockIndicatorState",
     "SectorAverage",
+    "SectorDistribution",
+    "ScoringContextSnapshot",
     "Watchlist",
     "WatchlistItem",
 ]
@@ -1,5 +1,6 @@
 """Stock API endpoints."""
 import logging
+from datetime import date, timedelta
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
@@ -12,21 +13,27 @@ from app.config import settings
 logger = logging.getLogger(__name__)
 from app.infrastructure.repositories import get_stock_repository, StockRepository
 from app.shared.auth import require_admin
-from app.features.stocks.models import Stock, InstrumentType, StockFundamental
+from app.features.stocks.models import Stock, InstrumentType
 from app.features.stocks.schemas import (
     StockListResponse,
     StockDetailResponse,
+    ScoreRankingResponse,
     StockListPaginatedResponse,
     StockSearchResponse,
     StockImportRequest,
     StockImportResponse,
     ScreenerCriteria,
     ScreenerResponse,
+    ScenarioRequest,
+    ScoreHistoryBatchRequest,
 )
 from app.features.stocks.services import ScreenerService
 from app.features.stocks.services.sector_service import SectorService
 from app.features.stocks.services.price_data_service import get_price_data_service, PriceDataService
+from app.features.stocks.services.price_store import PriceStore
+from app.features.stocks.services.indicator_cache import get_indicator_frame
 from app.features.stocks.services.score_tracking_service import ScoreTrackingService
+from app.features.stocks.services.score_rank_index import get_rank_index
 from app.features.integrations.yahoo_finance_client import get_yahoo_finance_client, YahooFinanceClient
 
 router = APIRouter(prefix="/api/stocks", tags=["stocks"])
@@ -240,6 +247,11 @@ async def get_stock(
 
     # Convert to Pydantic model for caching
     response = StockDetailResponse.model_validate(stock)
+    if stock.scores:
+        rank_index = get_rank_index(db)
+        response.ranking = ScoreRankingResponse(
+            **rank_index.ranking(float(stock.scores.total_score), stock.sector)
+        )
 
     # Cache the response
     cache.set(cache_key, response.model_dump(), ttl_seconds=settings.CACHE_TTL_DEFAULT)
@@ -561,6 +573,8 @@ async def explosive_growth_strategy(
 
 @router.post("/scores/calculate", status_code=status.HTTP_200_OK, dependencies=[Depends(require_admin)])
 async def calculate_all_scores(
+    incremental: bool = Query(default=False, description="Only rescore stocks changed since the last recompute"),
+    parallel: bool = Query(default=False, description="Dispatch a Celery recompute that scores one task per sector"),
     db: Session = Depends(get_db)
 ):
     """
@@ -574,13 +588,36 @@ async def calculate_all_scores(
     Use this after importing new stocks or updating fundamentals.
 
     Args:
+        incremental: Only rescore changed stocks; escalates to a full
+                     recompute if percentiles or sector benchmarks drifted
+        parallel: Run the recompute as a Celery task whose full recomputes
+                  fan out one task per sector; returns the task id at once
         db: Database session
 
     Returns:
-        Result with count of scored stocks
+        Result with count of scored stocks, or the dispatched task id
     """
+    if parallel:
+        from app.tasks.score_tasks import recalculate_all_scores
+
+        task = recalculate_all_scores.delay(incremental=incremental, parallel=True)
+        return {
+            "success": True,
+            "status": "dispatched",
+            "task_id": task.id,
+            "message": "Score recompute dispatched to the task queue."
+        }
+
     sector_service = SectorService(db)
 
+    if incremental:
+        result = sector_service.calculate_scores_incremental()
+        return {
+            "success": True,
+            **result,
+            "message": f"Rescored {result['scored_count']} stocks ({result['mode']} recompute)."
+        }
+
     # First, calculate and cache sector averages
     sector_benchmarks = sector_service.calculate_and_cache_sector_averages()
 
@@ -625,7 +662,7 @@ async def get_score_breakdown(
     Raises:
         HTTPException: 404 if stock not found or no fundamentals available
     """
-    from app.features.stocks.services.scoring_service import ScoringService
+    from app.features.stocks.services.scoring_context import get_scoring_context
 
     repo = get_stock_repository(db)
 
@@ -645,31 +682,31 @@ async def get_score_breakdown(
             detail=f"No fundamental data available for '{ticker}'"
         )
 
-    # Get sector benchmarks and all fundamentals for scoring
-    sector_service = SectorService(db)
-    sector_benchmarks = sector_service.get_cached_sector_benchmarks()
-
-    all_fundamentals = db.query(StockFundamental).join(Stock).all()
+    # Percentile thresholds and sector benchmarks from the last recompute
+    scoring_context = get_scoring_context(db)
 
     # Fetch technical indicators for momentum scoring (Phase 4)
     technical_indicators = None
     if include_momentum:
         try:
-            df = price_service.fetch_historical_prices(ticker, period="1y")
+            df = get_indicator_frame(db, price_service, stock, period="1y")
             if df is not None and not df.empty:
-                df = price_service.calculate_technical_indicators(df)
                 technical_indicators = price_service.get_latest_indicators(df)
         except Exception as e:
             logger.warning(f"Could not fetch price data for {ticker}: {e}")
 
     # Calculate score with optional momentum indicators
-    scoring_service = ScoringService(all_fundamentals, sector_benchmarks)
+    scoring_service = scoring_context.scoring_service()
     breakdown = scoring_service.calculate_score(
         stock_full.fundamentals,
         stock_full.sector,
         technical_indicators=technical_indicators
     )
 
+    # Rank the live total against the stored totals of the last recompute
+    ranking = get_rank_index(db).ranking(breakdown.total_score, stock_full.sector)
+    breakdown.percentile = ranking["percentile"]
+
     return {
         "ticker": stock_full.ticker,
         "name": stock_full.name,
@@ -685,7 +722,14 @@ async def get_score_breakdown(
         "strengths": breakdown.strengths,
         "weaknesses": breakdown.weaknesses,
         "reasoning": breakdown.reasoning,
+        "percentile": breakdown.percentile,
+        "rank": ranking["rank"],
+        "ranked_count": ranking["ranked_count"],
+        "sector_percentile": ranking["sector_percentile"],
+        "sector_rank": ranking["sector_rank"],
+        "sector_count": ranking["sector_count"],
         "has_momentum_data": technical_indicators is not None,
+        "scoring_context_version": scoring_context.version,
     }
 
 
@@ -707,7 +751,7 @@ async def get_leaderboard(
         db: Database session
 
     Returns:
-        List of top-scoring stocks with their scores
+        List of top-scoring stocks with their scores, ranks and percentiles
     """
     # Check cache first
     cache = get_cache_service()
@@ -732,6 +776,7 @@ async def get_leaderboard(
         query = query.filter(Stock.sector == sector)
 
     results = query.limit(limit).all()
+    rank_index = get_rank_index(db)
 
     response = [
         {
@@ -744,6 +789,7 @@ async def get_leaderboard(
             "quality_score": float(score.quality_score),
             "momentum_score": float(score.momentum_score),
             "health_score": float(score.health_score),
+            **rank_index.ranking(float(score.total_score), stock.sector),
         }
         for stock, score in results
     ]
@@ -793,6 +839,7 @@ async def get_stocks_by_signal(
         .limit(limit)
         .all()
     )
+    rank_index = get_rank_index(db)
 
     return [
         {
@@ -805,6 +852,7 @@ async def get_stocks_by_signal(
             "quality_score": float(score.quality_score),
             "momentum_score": float(score.momentum_score),
             "health_score": float(score.health_score),
+            **rank_index.ranking(float(score.total_score), stock.sector),
         }
         for stock, score in results
     ]
@@ -829,6 +877,7 @@ async def get_sector_leaderboards(
     """
     repo = get_stock_repository(db)
     sectors = repo.get_all_sectors()
+    rank_index = get_rank_index(db)
 
     sector_leaderboards = {}
 
@@ -850,6 +899,7 @@ async def get_sector_leaderboards(
                 "name": stock.name,
                 "total_score": float(score.total_score),
                 "signal": score.signal.value,
+                **rank_index.ranking(float(score.total_score), sector),
             }
             for stock, score in results
         ]
@@ -898,8 +948,11 @@ async def get_historical_prices(
             detail=f"Stock with ticker '{ticker}' not found"
         )
 
-    # Fetch historical prices
-    df = price_service.fetch_historical_prices(ticker, period=period)
+    # Fetch historical prices, with technical indicators if requested
+    if include_indicators:
+        df = get_indicator_frame(db, price_service, stock, period=period)
+    else:
+        df = PriceStore(db, price_service).get_prices(stock, period=period)
 
     if df is None or df.empty:
         raise HTTPException(
@@ -907,10 +960,6 @@ async def get_historical_prices(
             detail=f"Unable to fetch price data for '{ticker}'"
         )
 
-    # Calculate technical indicators if requested
-    if include_indicators:
-        df = price_service.calculate_technical_indicators(df)
-
     # Convert DataFrame to JSON-friendly format
     result = {
         "ticker": ticker,
@@ -962,7 +1011,7 @@ async def get_latest_indicators(
         )
 
     # Fetch and calculate indicators
-    df = price_service.fetch_historical_prices(ticker, period=period)
+    df = get_indicator_frame(db, price_service, stock, period=period)
 
     if df is None or df.empty:
         raise HTTPException(
@@ -970,7 +1019,6 @@ async def get_latest_indicators(
             detail=f"Unable to fetch price data for '{ticker}'"
         )
 
-    df = price_service.calculate_technical_indicators(df)
     indicators = price_service.get_latest_indicators(df)
 
     return {
@@ -1024,7 +1072,7 @@ async def get_momentum_score(
         )
 
     # Fetch and calculate indicators
-    df = price_service.fetch_historical_prices(ticker, period=period)
+    df = get_indicator_frame(db, price_service, stock, period=period)
 
     if df is None or df.empty:
         return {
@@ -1035,7 +1083,6 @@ async def get_momentum_score(
             "components": []
         }
 
-    df = price_service.calculate_technical_indicators(df)
     indicators = price_service.get_latest_indicators(df)
 
     # Calculate momentum score
@@ -1129,6 +1176,44 @@ async def get_top_candidates(
     return response
 
 
+@router.post("/recommendations/scenarios")
+async def run_weight_scenarios(
+    request: ScenarioRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Rank the universe under several what-if weightings at once.
+
+    Each scenario is either a horizon key (short/medium/long) or a custom
+    set of weights for the value, quality, momentum and health components.
+    All scenarios are evaluated in one matrix product over the stored
+    component scores; each returns its top candidates with their rank
+    movement against the baseline scenario.
+
+    Args:
+        request: Scenarios, candidates per scenario, sector filter and baseline
+        db: Database session
+
+    Returns:
+        Baseline name, universe size and ranked candidates per scenario
+
+    Raises:
+        HTTPException: 400 if a scenario or the baseline is invalid
+    """
+    from app.features.stocks.services.recommendation_service import RecommendationService
+
+    service = RecommendationService(db)
+    try:
+        return service.run_scenarios(
+            scenarios=[scenario.model_dump() for scenario in request.scenarios],
+            limit=request.limit,
+            sector=request.sector,
+            baseline=request.baseline,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/{ticker}/trade-signals")
 async def get_trade_signals(
     ticker: str,
@@ -1166,15 +1251,13 @@ async def get_trade_signals(
             detail=f"Stock with ticker '{ticker}' not found"
         )
 
-    df = price_service.fetch_historical_prices(ticker, period=period)
+    df = get_indicator_frame(db, price_service, stock, period=period)
     if df is None or df.empty:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Unable to fetch price data for '{ticker}'"
         )
 
-    df = price_service.calculate_technical_indicators(df)
-
     signal_service = get_trade_signal_service()
     events = signal_service.compute_signals(df)
     outlook = signal_service.current_outlook(df, events)
@@ -1206,22 +1289,63 @@ async def snapshot_all_scores(
         db: Database session
 
     Returns:
-        Result with count of snapshots created
+        Result with counts of snapshots created and updated
     """
     tracking_service = ScoreTrackingService(db)
-    count = tracking_service.snapshot_all_scores()
+    counts = tracking_service.snapshot_all_scores()
 
     return {
         "success": True,
-        "snapshots_created": count,
-        "message": f"Successfully created {count} score snapshots."
+        "snapshots_created": counts["created"],
+        "snapshots_updated": counts["updated"],
+        "message": f"Successfully created {counts['created']} and updated {counts['updated']} score snapshots."
+    }
+
+
+@router.post("/score-history/batch")
+async def get_score_history_batch(
+    request: ScoreHistoryBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Get score history for many stocks in one call, in columnar form.
+
+    Loads every requested stock's history with one query and returns a
+    shared date axis plus, per ticker, one array per score component and
+    the signal (forward-filled like /{ticker}/score-history; null before a
+    stock's first snapshot). Replaces one score-history call per stock when
+    charting a watchlist or comparison.
+
+    Args:
+        request: Tickers (up to 500) and date range
+        db: Database session
+
+    Returns:
+        Date axis, per-ticker series and tickers without history
+    """
+    start_date = request.start_date or date.today() - timedelta(days=request.days)
+    if request.end_date is not None and request.end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must not be before start_date"
+        )
+
+    tracking_service = ScoreTrackingService(db)
+    history = tracking_service.get_score_history_batch(
+        [ticker.upper() for ticker in request.tickers], start_date, request.end_date
+    )
+
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": history["dates"][-1] if history["dates"] else None,
+        **history,
     }
 
 
 @router.get("/{ticker}/score-history")
 async def get_score_history(
     ticker: str,
-    days: int = Query(default=30, le=90, description="Number of days of history"),
+    days: int = Query(default=30, le=1825, description="Number of days of history"),
     db: Session = Depends(get_db)
 ):
     """
@@ -1229,10 +1353,11 @@ async def get_score_history(
 
     Returns daily score snapshots for the specified time period, showing how
     the stock's total score and component scores have changed over time.
+    Sparse history (change-only rows, weekly/monthly tiers) is forward-filled.
 
     Args:
         ticker: Stock ticker symbol
-        days: Number of days of history to retrieve (max 90)
+        days: Number of days of history to retrieve (max 5 years)
         db: Database session
 
     Returns:
@@ -1351,27 +1476,33 @@ async def get_top_movers(
 
 @router.get("/score-changes/signals")
 async def get_signal_changes(
-    days: int = Query(default=7, description="Number of days to look back"),
+    days: int = Query(default=7, ge=1, le=1825, description="Number of days to look back"),
+    limit: int = Query(default=100, ge=1, le=500, description="Maximum number of transitions"),
+    offset: int = Query(default=0, ge=0, description="Number of transitions to skip"),
     db: Session = Depends(get_db)
 ):
     """
     Get stocks that had signal changes (e.g., HOLD -> BUY).
 
-    Returns all stocks where the buy/sell signal changed over the specified period,
-    which can indicate important shifts in stock quality or momentum.
+    Returns the buy/sell signal transitions recorded by the daily snapshots
+    over the specified period, newest first, which can indicate important
+    shifts in stock quality or momentum. Use limit/offset to page.
 
     Args:
         days: Number of days to look back
+        limit: Maximum number of transitions to return
+        offset: Number of transitions to skip
         db: Database session
 
     Returns:
-        List of stocks with signal changes
+        List of signal transitions
     """
     tracking_service = ScoreTrackingService(db)
-    changes = tracking_service.get_signal_changes(days=days)
+    changes = tracking_service.get_signal_changes(days=days, limit=limit, offset=offset)
 
     return {
         "period_days": days,
         "count": len(changes),
+        "offset": offset,
         "signal_changes": changes
     }
@@ -1,6 +1,6 @@
 """Stock schemas for API request/response validation."""
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Dict, Optional, List
 from uuid import UUID
 from decimal import Decimal
 from pydantic import BaseModel, Field, ConfigDict
@@ -88,6 +88,16 @@ class ScoreResponse(ScoreBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ScoreRankingResponse(BaseModel):
+    """Rank and percentile of a stock's total score, overall and within its sector."""
+    rank: Optional[int] = Field(None, description="Rank by total score (1 = best)")
+    percentile: Optional[int] = Field(None, description="Share of stocks scoring at or below (0-100)")
+    ranked_count: Optional[int] = Field(None, description="Number of scored stocks")
+    sector_rank: Optional[int] = Field(None, description="Rank within the sector")
+    sector_percentile: Optional[int] = Field(None, description="Percentile within the sector")
+    sector_count: Optional[int] = Field(None, description="Number of scored stocks in the sector")
+
+
 # Price schemas
 class PriceBase(BaseModel):
     """Base schema for stock prices."""
@@ -125,6 +135,7 @@ class StockDetailResponse(StockBase):
     last_updated: datetime
     scores: Optional[ScoreResponse] = None
     fundamentals: Optional[FundamentalsResponse] = None
+    ranking: Optional[ScoreRankingResponse] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -237,6 +248,10 @@ class ScreenerResult(StockDetailResponse):
     match_score: Optional[int] = Field(None, description="How well it matches criteria (0-100)")
     strengths: List[str] = Field(default_factory=list, description="Key strengths")
     weaknesses: List[str] = Field(default_factory=list, description="Key weaknesses")
+    sector_percentiles: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Percentile (0-100) of each fundamental metric among sector peers",
+    )
 
 
 class ScreenerResponse(BaseModel):
@@ -247,6 +262,34 @@ class ScreenerResponse(BaseModel):
     strategy_name: Optional[str] = Field(None, description="Name of pre-built strategy if applicable")
 
 
+# Recommendation scenario schemas
+class WeightScenario(BaseModel):
+    """One what-if weighting of the four component scores."""
+    name: str = Field(..., min_length=1, max_length=50, description="Scenario name (or a horizon key)")
+    weights: Optional[Dict[str, float]] = Field(
+        None,
+        description="Weight per component (value, quality, momentum, health); "
+                    "omit to use the horizon profile named by `name`",
+    )
+
+
+class ScenarioRequest(BaseModel):
+    """Request to rank the universe under several weight scenarios."""
+    scenarios: List[WeightScenario] = Field(..., min_length=1, max_length=50)
+    limit: int = Field(default=10, ge=1, le=50, description="Top candidates per scenario")
+    sector: Optional[str] = Field(None, description="Filter by sector")
+    baseline: Optional[str] = Field(None, description="Scenario to measure rank movement against (default: first)")
+
+
+# Score history schemas
+class ScoreHistoryBatchRequest(BaseModel):
+    """Request for the score history of several stocks over one date range."""
+    tickers: List[str] = Field(..., min_length=1, max_length=500, description="Stock ticker symbols")
+    start_date: Optional[date] = Field(None, description="First date (default: `days` before today)")
+    end_date: Optional[date] = Field(None, description="Last date (default: latest snapshot)")
+    days: int = Field(default=30, ge=1, le=1825, description="Days of history when start_date is omitted")
+
+
 # Export all schemas
 __all__ = [
     "StockBase",
@@ -256,6 +299,7 @@ __all__ = [
     "FundamentalsResponse",
     "ScoreBase",
     "ScoreResponse",
+    "ScoreRankingResponse",
     "PriceBase",
     "PriceResponse",
     "StockListResponse",
@@ -270,4 +314,7 @@ __all__ = [
     "ScreenerCriteria",
     "ScreenerResult",
     "ScreenerResponse",
+    "WeightScenario",
+    "ScenarioRequest",
+    "ScoreHistoryBatchRequest",
 ]
@@ -0,0 +1,147 @@
+"""
+Shared cache of computed technical-indicator frames.
+
+A stock detail page requests historical prices, latest indicators, the
+momentum score, trade signals and the score breakdown; each needs the same
+price history with the same indicators. Frames are cached in two levels, an
+in-process LRU in front of Redis, keyed by ticker, period, last bar date and
+a fingerprint of that bar's values, so one page view costs one price load
+and one indicator computation.
+
+Keying on the last stored bar makes entries self-invalidating: when the
+price store appends a new bar, or revises the last one (e.g. a bar stored
+while its session was open), the key changes and the old entry ages out.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date
+from io import StringIO
+from typing import Callable, Optional
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.features.stocks.models import Stock, StockPrice
+from app.features.stocks.services.price_data_service import PriceDataService
+from app.features.stocks.services.price_store import PriceStore
+from app.infrastructure.cache import get_cache_service
+from app.infrastructure.cache.redis_cache import generate_cache_key, hash_params
+
+logger = logging.getLogger(__name__)
+
+
+def indicator_cache_key(ticker: str, period: str, last_bar_date: date, last_bar_fingerprint: str) -> str:
+    return generate_cache_key("indicators", ticker.upper(), period, last_bar_date.isoformat(), last_bar_fingerprint)
+
+
+def last_bar_fingerprint(db: Session, stock: Stock, last_bar_date: date) -> str:
+    """Short hash of a stored bar's OHLCV values."""
+    bar = db.execute(
+        select(StockPrice.open, StockPrice.high, StockPrice.low, StockPrice.close, StockPrice.volume)
+        .where(StockPrice.stock_id == stock.id, StockPrice.date == last_bar_date)
+    ).one()
+    return hash_params(**{name: str(value) for name, value in bar._mapping.items()})
+
+
+class IndicatorCache:
+    """Two-level (in-process LRU, then Redis) cache of indicator frames."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Cached frame (a copy the caller may modify), or None."""
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+                return frame.copy()
+
+        payload = get_cache_service().get(key)
+        if payload is None:
+            return None
+        frame = pd.read_json(StringIO(payload["frame"]), orient="split", convert_dates=["date"])
+        self._remember(key, frame)
+        return frame.copy()
+
+    def set(self, key: str, frame: pd.DataFrame) -> None:
+        """Store a frame in both levels."""
+        self._remember(key, frame.copy())
+        get_cache_service().set(
+            key,
+            {"frame": frame.to_json(orient="split", date_format="iso", double_precision=15, index=False)},
+            ttl_seconds=settings.INDICATOR_CACHE_TTL_SECONDS,
+        )
+
+    def get_or_compute(self, key: str, compute: Callable[[], Optional[pd.DataFrame]]) -> Optional[pd.DataFrame]:
+        """Cached frame, or compute, cache and return it (None results are not cached)."""
+        frame = self.get(key)
+        if frame is not None:
+            return frame
+        frame = compute()
+        if frame is not None and not frame.empty:
+            self.set(key, frame)
+        return frame
+
+    def clear(self) -> None:
+        """Drop the in-process level."""
+        with self._lock:
+            self._frames.clear()
+
+    def _remember(self, key: str, frame: pd.DataFrame) -> None:
+        with self._lock:
+            self._frames[key] = frame
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+
+
+_indicator_cache: Optional[IndicatorCache] = None
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Get or create the process-wide indicator cache."""
+    global _indicator_cache
+    if _indicator_cache is None:
+        _indicator_cache = IndicatorCache(max_entries=settings.INDICATOR_CACHE_SIZE)
+    return _indicator_cache
+
+
+def get_indicator_frame(
+    db: Session,
+    price_service: PriceDataService,
+    stock: Stock,
+    period: str = "1y",
+) -> Optional[pd.DataFrame]:
+    """
+    Price history with technical indicators for a stock, via the shared cache.
+
+    Args:
+        db: Database session
+        price_service: Price data service
+        stock: Stock to get indicators for
+        period: Time period (1mo, 3mo, 6mo, 1y, 2y, 5y)
+
+    Returns:
+        Output of calculate_technical_indicators() over the period's prices,
+        or None if no price data is available
+    """
+    store = PriceStore(db, price_service)
+
+    def compute() -> Optional[pd.DataFrame]:
+        df = store.load_period(stock, period)
+        if df is None or df.empty:
+            return None
+        return price_service.calculate_technical_indicators(df)
+
+    last_bar = store.refresh(stock)
+    if last_bar is None:
+        # Nothing stored (no data, or fallback data that is not stored): no stable key
+        return compute()
+    key = indicator_cache_key(stock.ticker, period, last_bar, last_bar_fingerprint(db, stock, last_bar))
+    return get_indicator_cache().get_or_compute(key, compute)
@@ -0,0 +1,403 @@
+"""
+Incremental technical-indicator state.
+
+calculate_technical_indicators() recomputes every rolling window over the
+whole price history. RollingIndicators keeps just what the windows need -
+the last 200 closes, 20 volumes and 14 close-to-close gains/losses - with
+running window sums, so each new bar updates SMA-50, SMA-200, RSI-14, the
+20-day volume average and the derived ratios in constant time, giving the
+same values as the manual full recompute (rolling means with min_periods=1).
+
+IndicatorStateStore persists one state per stock (stock_indicator_states)
+with the latest values as columns, so the whole universe's momentum inputs
+are one query away. States are advanced from newly stored bars (sync) or
+from intraday quotes for today's bar (apply_bars).
+"""
+import logging
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.features.stocks.models import StockIndicatorState, StockPrice
+from app.features.stocks.services.momentum_service import get_momentum_service
+from app.features.stocks.services.price_store import last_complete_session
+from app.infrastructure.database import bulk_upsert
+
+logger = logging.getLogger(__name__)
+
+SMA_SHORT = 50
+SMA_LONG = 200
+RSI_PERIOD = 14
+VOLUME_SMA = 20
+
+# Latest-value columns of stock_indicator_states (keys of RollingIndicators.latest())
+INDICATOR_COLUMNS = (
+    "price", "sma_50", "sma_200", "rsi", "volume", "volume_sma_20",
+    "price_vs_sma50", "price_vs_sma200", "volume_trend",
+)
+
+# Columns MomentumScoringService.score_batch() reads
+MOMENTUM_INPUTS = ("price", "price_vs_sma50", "price_vs_sma200", "rsi", "volume_trend")
+
+# (date, close, volume)
+Bar = Tuple[date, float, int]
+
+
+class RollingIndicators:
+    """Rolling-window indicator state for one stock, updated one bar at a time."""
+
+    def __init__(
+        self,
+        as_of: Optional[date] = None,
+        closes: Iterable[float] = (),
+        volumes: Iterable[int] = (),
+        gains: Iterable[float] = (),
+        losses: Iterable[float] = (),
+    ):
+        self.as_of = as_of
+        self.closes = deque(closes, maxlen=SMA_LONG)
+        self.volumes = deque(volumes, maxlen=VOLUME_SMA)
+        self.gains = deque(gains, maxlen=RSI_PERIOD)
+        self.losses = deque(losses, maxlen=RSI_PERIOD)
+
+        # Window sums are rebuilt from the buffers, so float drift never outlives a load
+        self._close_sum_short = sum(list(self.closes)[-SMA_SHORT:])
+        self._close_sum_long = sum(self.closes)
+        self._volume_sum = sum(self.volumes)
+        self._gain_sum = sum(self.gains)
+        self._loss_sum = sum(self.losses)
+        # Non-zero entries per RSI window; a window of zeros averages to exactly 0
+        self._gain_count = sum(1 for gain in self.gains if gain)
+        self._loss_count = sum(1 for loss in self.losses if loss)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "RollingIndicators":
+        """Build the state from price data (date, close and volume columns, ascending)."""
+        state = cls()
+        if df is None or df.empty:
+            return state
+        tail = df.iloc[-(SMA_LONG + 1):]
+        for bar_date, close, volume in zip(pd.to_datetime(tail["date"]).dt.date, tail["close"], tail["volume"]):
+            state.push(bar_date, float(close), int(volume))
+        return state
+
+    def push(self, bar_date: date, close: float, volume: int) -> bool:
+        """
+        Apply a daily bar.
+
+        A bar for the current as_of date replaces the last bar (intraday
+        updates of today's bar); a later date appends a bar.
+
+        Returns:
+            Whether the state changed (False for a repeat of the last bar)
+
+        Raises:
+            ValueError: If the bar is older than the state
+        """
+        if self.as_of is not None and bar_date < self.as_of:
+            raise ValueError(f"Bar {bar_date} is older than indicator state as of {self.as_of}")
+        if bar_date == self.as_of:
+            if close == self.closes[-1] and volume == self.volumes[-1]:
+                return False
+            self._replace_last(close, volume)
+            return True
+
+        # The first bar counts as no change, as in the full recompute
+        self._push_change(close - self.closes[-1] if self.closes else 0.0)
+        if len(self.closes) >= SMA_SHORT:
+            self._close_sum_short -= self.closes[-SMA_SHORT]
+        if len(self.closes) == SMA_LONG:
+            self._close_sum_long -= self.closes[0]
+        self.closes.append(close)
+        self._close_sum_short += close
+        self._close_sum_long += close
+
+        if len(self.volumes) == VOLUME_SMA:
+            self._volume_sum -= self.volumes[0]
+        self.volumes.append(volume)
+        self._volume_sum += volume
+
+        self.as_of = bar_date
+        return True
+
+    def latest(self) -> Dict[str, float]:
+        """Indicator values at the last bar, keyed like PriceDataService.get_latest_indicators()."""
+        if not self.closes:
+            return {}
+        close = self.closes[-1]
+        volume = self.volumes[-1]
+        sma_50 = self._close_sum_short / min(len(self.closes), SMA_SHORT)
+        sma_200 = self._close_sum_long / len(self.closes)
+        volume_sma_20 = self._volume_sum / len(self.volumes)
+
+        avg_gain = self._gain_sum / len(self.gains) if self._gain_count else 0.0
+        avg_loss = self._loss_sum / len(self.losses) if self._loss_count else 0.0
+        rs = avg_gain / (avg_loss or 1e-10)  # Avoid division by zero
+        rsi = 100 - (100 / (1 + rs))
+
+        return {
+            "price": close,
+            "sma_50": sma_50,
+            "sma_200": sma_200,
+            "rsi": rsi,
+            "volume": volume,
+            "volume_sma_20": volume_sma_20,
+            "price_vs_sma50": (close / sma_50 - 1) * 100,
+            "price_vs_sma200": (close / sma_200 - 1) * 100,
+            "volume_trend": (volume / volume_sma_20 - 1) * 100 if volume_sma_20 else float("nan"),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Window buffers, JSON-serializable."""
+        return {
+            "closes": list(self.closes),
+            "volumes": list(self.volumes),
+            "gains": list(self.gains),
+            "losses": list(self.losses),
+        }
+
+    @classmethod
+    def from_dict(cls, as_of: date, buffers: Dict[str, Any]) -> "RollingIndicators":
+        return cls(as_of=as_of, **buffers)
+
+    def _push_change(self, delta: float) -> None:
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if len(self.gains) == RSI_PERIOD:
+            evicted_gain, evicted_loss = self.gains[0], self.losses[0]
+            self._gain_sum -= evicted_gain
+            self._loss_sum -= evicted_loss
+            self._gain_count -= bool(evicted_gain)
+            self._loss_count -= bool(evicted_loss)
+        self.gains.append(gain)
+        self.losses.append(loss)
+        self._gain_sum += gain
+        self._loss_sum += loss
+        self._gain_count += bool(gain)
+        self._loss_count += bool(loss)
+
+    def _replace_last(self, close: float, volume: int) -> None:
+        change = close - self.closes[-1]
+        self.closes[-1] = close
+        self._close_sum_short += change
+        self._close_sum_long += change
+
+        self._volume_sum += volume - self.volumes[-1]
+        self.volumes[-1] = volume
+
+        if len(self.closes) > 1:
+            delta = close - self.closes[-2]
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            self._gain_sum += gain - self.gains[-1]
+            self._loss_sum += loss - self.losses[-1]
+            self._gain_count += bool(gain) - bool(self.gains[-1])
+            self._loss_count += bool(loss) - bool(self.losses[-1])
+            self.gains[-1] = gain
+            self.losses[-1] = loss
+
+
+class IndicatorStateStore:
+    """Persisted RollingIndicators per stock (stock_indicator_states)."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load(self, stock_ids: Sequence[Any]) -> Dict[Any, RollingIndicators]:
+        """Stored states by stock id (stocks without one are left out)."""
+        if not stock_ids:
+            return {}
+        rows = self.db.execute(
+            select(StockIndicatorState.stock_id, StockIndicatorState.as_of, StockIndicatorState.buffers)
+            .where(StockIndicatorState.stock_id.in_(list(stock_ids)))
+        ).all()
+        return {stock_id: RollingIndicators.from_dict(as_of, buffers) for stock_id, as_of, buffers in rows}
+
+    def latest(self, stock_ids: Optional[Sequence[Any]] = None) -> Dict[Any, Dict[str, float]]:
+        """Latest indicator values by stock id, from the stored columns (no buffer decoding)."""
+        columns = [getattr(StockIndicatorState, name) for name in INDICATOR_COLUMNS]
+        query = select(StockIndicatorState.stock_id, *columns)
+        if stock_ids is not None:
+            query = query.where(StockIndicatorState.stock_id.in_(list(stock_ids)))
+        return {
+            row.stock_id: {name: getattr(row, name) for name in INDICATOR_COLUMNS}
+            for row in self.db.execute(query)
+        }
+
+    def latest_columns(self, stock_ids: Sequence[Any]) -> Dict[str, np.ndarray]:
+        """
+        Latest indicator values as float arrays aligned with stock_ids.
+
+        Stocks without a state get one built from their stored prices first
+        (one query for all of them); stocks without prices are NaN.
+        """
+        latest = self.latest(stock_ids)
+        missing = [stock_id for stock_id in stock_ids if stock_id not in latest]
+        if missing and self.sync(missing):
+            latest.update(self.latest(missing))
+
+        nan_row = dict.fromkeys(INDICATOR_COLUMNS)
+        rows = [latest.get(stock_id, nan_row) for stock_id in stock_ids]
+        return {
+            name: np.array([row[name] for row in rows], dtype=float)
+            for name in INDICATOR_COLUMNS
+        }
+
+    def sync(self, stock_ids: Sequence[Any]) -> int:
+        """
+        Advance states with bars stored in stock_prices since their as_of date.
+
+        Stocks without a state get one built from their last stored bars, as
+        do stocks whose as_of bar was never stored (an intraday bar applied on
+        a holiday or for a halted ticker), so that bar is dropped.
+
+        Args:
+            stock_ids: Stocks to sync
+
+        Returns:
+            Number of states written (states no new or revised bar was
+            applied to are not rewritten)
+        """
+        ids = list(stock_ids)
+        states = self.load(ids)
+        bars = self._bars_since(states)
+        for stock_id, state in list(states.items()):
+            if not bars.get(stock_id) or bars[stock_id][0][0] != state.as_of:
+                del states[stock_id]
+        bars.update(self._trailing_bars([stock_id for stock_id in ids if stock_id not in states]))
+
+        changed = {}
+        for stock_id, stock_bars in bars.items():
+            state = states.get(stock_id)
+            if state is None:
+                state = RollingIndicators()
+                for bar in stock_bars:
+                    state.push(*bar)
+                changed[stock_id] = state
+            else:
+                applied = [state.push(*bar) for bar in stock_bars]
+                if any(applied):
+                    changed[stock_id] = state
+        return self.save(changed)
+
+    def apply_bars(self, bars: Dict[Any, Bar]) -> int:
+        """
+        Apply one bar per stock (e.g. today's bar from intraday quotes).
+
+        Stocks without a stored state, or whose state is newer than the bar
+        or misses the session before it, are skipped; sync() builds and
+        catches those up from stock_prices. A bar equal to the state's last
+        one (an unchanged quote) is not rewritten.
+
+        Returns:
+            Number of states written
+        """
+        states = self.load(list(bars))
+        changed = {}
+        for stock_id, state in states.items():
+            bar_date, close, volume = bars[stock_id]
+            if bar_date < state.as_of or state.as_of < last_complete_session(bar_date):
+                continue
+            if state.push(bar_date, close, volume):
+                changed[stock_id] = state
+        return self.save(changed)
+
+    def save(self, states: Dict[Any, RollingIndicators]) -> int:
+        """
+        Upsert states (the caller commits).
+
+        momentum_changed_at is stamped only where the momentum score the new
+        values give differs from the stored one, so incremental rescoring
+        picks up momentum moves without rescoring every stock whose
+        indicators moved within a scoring band.
+        """
+        rows: List[Dict[str, Any]] = []
+        for stock_id, state in states.items():
+            if state.as_of is None:
+                continue
+            rows.append({
+                "stock_id": stock_id,
+                "as_of": state.as_of,
+                "buffers": state.to_dict(),
+                **{name: _finite(value) for name, value in state.latest().items()},
+            })
+        if not rows:
+            return 0
+
+        stored = {
+            row.stock_id: row._mapping
+            for row in self.db.execute(
+                select(
+                    StockIndicatorState.stock_id,
+                    StockIndicatorState.momentum_changed_at,
+                    *(getattr(StockIndicatorState, name) for name in MOMENTUM_INPUTS),
+                ).where(StockIndicatorState.stock_id.in_([row["stock_id"] for row in rows]))
+            )
+        }
+        momentum = get_momentum_service()
+        new_scores = momentum.score_batch(_momentum_columns(rows))
+        old_scores = momentum.score_batch(_momentum_columns([stored.get(row["stock_id"]) for row in rows]))
+        now = datetime.utcnow()
+        for row, new_score, old_score in zip(rows, new_scores, old_scores):
+            previous = stored.get(row["stock_id"])
+            if new_score != old_score:
+                row["momentum_changed_at"] = now
+            else:
+                row["momentum_changed_at"] = previous["momentum_changed_at"] if previous else None
+        return bulk_upsert(self.db, StockIndicatorState, rows, conflict_columns=["stock_id"])
+
+    def _bars_since(self, states: Dict[Any, RollingIndicators]) -> Dict[Any, List[Bar]]:
+        """Stored bars on or after each state's as_of date (the as_of bar may have been revised)."""
+        if not states:
+            return {}
+        rows = self.db.execute(
+            select(StockPrice.stock_id, StockPrice.date, StockPrice.close, StockPrice.volume)
+            .join(StockIndicatorState, StockIndicatorState.stock_id == StockPrice.stock_id)
+            .where(StockPrice.stock_id.in_(list(states)), StockPrice.date >= StockIndicatorState.as_of)
+            .order_by(StockPrice.stock_id, StockPrice.date)
+        ).all()
+        return _group_bars(rows)
+
+    def _trailing_bars(self, stock_ids: Sequence[Any]) -> Dict[Any, List[Bar]]:
+        """The last SMA_LONG + 1 stored bars of each stock (enough to fill every window)."""
+        if not stock_ids:
+            return {}
+        ranked = (
+            select(
+                StockPrice.stock_id,
+                StockPrice.date,
+                StockPrice.close,
+                StockPrice.volume,
+                func.row_number().over(partition_by=StockPrice.stock_id, order_by=StockPrice.date.desc()).label("recency"),
+            )
+            .where(StockPrice.stock_id.in_(list(stock_ids)))
+            .subquery()
+        )
+        rows = self.db.execute(
+            select(ranked.c.stock_id, ranked.c.date, ranked.c.close, ranked.c.volume)
+            .where(ranked.c.recency <= SMA_LONG + 1)
+            .order_by(ranked.c.stock_id, ranked.c.date)
+        ).all()
+        return _group_bars(rows)
+
+
+def _group_bars(rows) -> Dict[Any, List[Bar]]:
+    bars: Dict[Any, List[Bar]] = {}
+    for stock_id, bar_date, close, volume in rows:
+        bars.setdefault(stock_id, []).append((bar_date, float(close), int(volume or 0)))
+    return bars
+
+
+def _momentum_columns(rows: Sequence[Optional[Mapping[str, Any]]]) -> Dict[str, np.ndarray]:
+    """Momentum inputs of stored or new state rows as float arrays (None rows are NaN)."""
+    return {
+        name: np.array([row[name] if row is not None else None for row in rows], dtype=float)
+        for name in MOMENTUM_INPUTS
+    }
+
+
+def _finite(value: float) -> Optional[float]:
+    return None if value != value else value  # NaN -> NULL
@@ -13,6 +13,16 @@ from typing import Dict, Tuple, Optional, List
 from dataclasses import dataclass
 import logging
 
+import numpy as np
+
+from app.features.stocks.services.scoring_tables import (
+    MOMENTUM_NEUTRAL,
+    PRICE_VS_SMA200,
+    PRICE_VS_SMA50,
+    RSI,
+    VOLUME_TREND,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -102,6 +112,30 @@ class MomentumScoringService:
 
         return score, details
 
+    def score_batch(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Momentum scores for many stocks in one vectorized pass.
+
+        Gives the same points as calculate_momentum_score() per stock. Rows
+        without indicators (NaN price) get the neutral MOMENTUM_NEUTRAL,
+        as ScoringService.calculate_score() does without price data.
+
+        Args:
+            columns: Float arrays keyed price, price_vs_sma50,
+                     price_vs_sma200, rsi and volume_trend (as stored by
+                     IndicatorStateStore)
+
+        Returns:
+            Momentum score (0-25) per stock
+        """
+        score = (
+            PRICE_VS_SMA50.lookup_array(columns["price_vs_sma50"])
+            + PRICE_VS_SMA200.lookup_array(columns["price_vs_sma200"])
+            + RSI.lookup_array(columns["rsi"])
+            + VOLUME_TREND.lookup_array(columns["volume_trend"])
+        )
+        return np.where(np.isnan(columns["price"]), MOMENTUM_NEUTRAL, score)
+
     def _score_price_vs_sma50(self, price_vs_sma50: float) -> float:
         """
         Score price position relative to 50-day MA (0-7 points).
@@ -115,22 +149,7 @@ class MomentumScoringService:
         Returns:
             Score from 0 to 7
         """
-        if price_vs_sma50 >= 10:  # >10% above = overbought
-            return 4.0
-        elif price_vs_sma50 >= 5:  # 5-10% above = strong uptrend
-            return 7.0
-        elif price_vs_sma50 >= 2:  # 2-5% above = uptrend
-            return 6.0
-        elif price_vs_sma50 >= 0:  # 0-2% above = mild uptrend
-            return 4.5
-        elif price_vs_sma50 >= -2:  # 0-2% below = mild downtrend
-            return 3.0
-        elif price_vs_sma50 >= -5:  # 2-5% below = downtrend
-            return 2.0
-        elif price_vs_sma50 >= -10:  # 5-10% below = strong downtrend
-            return 1.0
-        else:  # >10% below = oversold (could be opportunity or red flag)
-            return 0.0
+        return PRICE_VS_SMA50.lookup(price_vs_sma50)
 
     def _score_price_vs_sma200(self, price_vs_sma200: float) -> float:
         """
@@ -145,22 +164,7 @@ class MomentumScoringService:
         Returns:
             Score from 0 to 7
         """
-        if price_vs_sma200 >= 20:  # >20% above = extended rally
-            return 5.0
-        elif price_vs_sma200 >= 10:  # 10-20% above = strong bull trend
-            return 7.0
-        elif price_vs_sma200 >= 5:  # 5-10% above = bull trend
-            return 6.0
-        elif price_vs_sma200 >= 0:  # 0-5% above = mild bull
-            return 4.5
-        elif price_vs_sma200 >= -5:  # 0-5% below = mild bear
-            return 3.0
-        elif price_vs_sma200 >= -10:  # 5-10% below = bear trend
-            return 2.0
-        elif price_vs_sma200 >= -20:  # 10-20% below = strong bear
-            return 1.0
-        else:  # >20% below = deep bear (capitulation zone)
-            return 0.0
+        return PRICE_VS_SMA200.lookup(price_vs_sma200)
 
     def _score_rsi(self, rsi: float) -> float:
         """
@@ -175,20 +179,7 @@ class MomentumScoringService:
         Returns:
             Score from 0 to 6
         """
-        if rsi >= 80:  # Severely overbought
-            return 1.0
-        elif rsi >= 70:  # Overbought (could reverse)
-            return 3.0
-        elif rsi >= 60:  # Mild overbought
-            return 5.0
-        elif rsi >= 40:  # Goldilocks zone (not too hot, not too cold)
-            return 6.0
-        elif rsi >= 30:  # Mild oversold
-            return 5.0
-        elif rsi >= 20:  # Oversold (could bounce)
-            return 3.0
-        else:  # Severely oversold (<20)
-            return 1.0
+        return RSI.lookup(rsi)
 
     def _score_volume_trend(self, volume_trend: float) -> float:
         """
@@ -204,20 +195,7 @@ class MomentumScoringService:
         Returns:
             Score from 0 to 5
         """
-        if volume_trend >= 100:  # Extreme volume (2x average)
-            return 4.0  # Could be good or bad (volatility)
-        elif volume_trend >= 50:  # Strong volume (1.5x average)
-            return 5.0
-        elif volume_trend >= 20:  # Above average volume (1.2x)
-            return 4.0
-        elif volume_trend >= 0:  # Normal to slightly above
-            return 3.0
-        elif volume_trend >= -20:  # Slightly below average
-            return 2.0
-        elif volume_trend >= -50:  # Low volume
-            return 1.0
-        else:  # Very low volume (<50% of average)
-            return 0.0
+        return VOLUME_TREND.lookup(volume_trend)
 
     def get_momentum_signal(self, score: float) -> str:
         """
@@ -0,0 +1,138 @@
+"""
+Parallel scoring of a universe sharded by sector.
+
+Sector benchmarks are per sector and the ROIC percentiles are fixed before
+scoring starts, so every sector can be scored independently. Each shard is
+sent to a worker process together with only its own sector's benchmarks;
+the per-shard results are scattered back into universe-wide arrays so the
+caller can persist them in one bulk write.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.features.stocks.services.scoring_service import (
+    BatchScores,
+    ScoringService,
+    SectorBenchmarks,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Number of workers to use; 0 or None means one per CPU core."""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def shard_by_sector(sector_codes: np.ndarray) -> List[np.ndarray]:
+    """
+    Split row indices by sector code.
+
+    Args:
+        sector_codes: Sector code per stock as produced by encode_sectors()
+
+    Returns:
+        One index array per distinct code (stocks without a sector form their own shard)
+    """
+    sector_codes = np.asarray(sector_codes, dtype=np.int64)
+    return [np.flatnonzero(sector_codes == code) for code in np.unique(sector_codes)]
+
+
+def score_shard(
+    roic_percentiles: Tuple[float, float, float, float],
+    sector_benchmarks: Dict[str, SectorBenchmarks],
+    sector: Optional[str],
+    columns: Dict[str, np.ndarray],
+    momentum_scores: Optional[np.ndarray],
+) -> BatchScores:
+    """Score one single-sector shard (runs in a worker process or a Celery shard task)."""
+    service = ScoringService.from_percentiles(roic_percentiles, sector_benchmarks)
+    n = len(next(iter(columns.values())))
+    if sector is None:
+        sector_codes, sectors = np.full(n, -1, dtype=np.int64), []
+    else:
+        sector_codes, sectors = np.zeros(n, dtype=np.int64), [sector]
+    return service.score_batch(columns, sector_codes, sectors, momentum_scores=momentum_scores)
+
+
+def score_batch_by_sector(
+    scoring_service: ScoringService,
+    columns: Dict[str, np.ndarray],
+    sector_codes: np.ndarray,
+    sectors: Sequence[str],
+    momentum_scores: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+) -> BatchScores:
+    """
+    Score a universe with one shard per sector, shards running in parallel.
+
+    Produces the same result as scoring_service.score_batch() on the whole
+    universe.
+
+    Args:
+        scoring_service: Service holding the ROIC percentiles and sector benchmarks
+        columns: Metric columns as produced by fundamentals_to_columns()
+        sector_codes: Sector code per stock as produced by encode_sectors() (-1 = none)
+        sectors: Sector names indexed by sector_codes
+        momentum_scores: Momentum score per stock (None = neutral)
+        workers: Worker processes (0/None = one per CPU core, 1 = in-process).
+                 Inside a daemonic process (a Celery prefork worker), which
+                 may not start children, scoring always runs in-process.
+
+    Returns:
+        BatchScores with one entry per stock, in input order
+    """
+    sector_codes = np.asarray(sector_codes, dtype=np.int64)
+    shards = shard_by_sector(sector_codes)
+    workers = min(resolve_workers(workers), len(shards))
+    if workers > 1 and multiprocessing.current_process().daemon:
+        logger.info("Daemonic worker process: scoring shards in-process")
+        workers = 1
+    if workers <= 1:
+        return scoring_service.score_batch(columns, sector_codes, sectors, momentum_scores=momentum_scores)
+
+    if momentum_scores is not None:
+        momentum_scores = np.asarray(momentum_scores, dtype=float)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for rows in shards:
+            code = int(sector_codes[rows[0]])
+            sector = sectors[code] if code >= 0 else None
+            bench = scoring_service.sector_benchmarks.get(sector) if sector else None
+            futures.append(executor.submit(
+                score_shard,
+                scoring_service.roic_percentiles,
+                {sector: bench} if bench else {},
+                sector,
+                {metric: column[rows] for metric, column in columns.items()},
+                momentum_scores[rows] if momentum_scores is not None else None,
+            ))
+        results = [future.result() for future in futures]
+
+    n = len(sector_codes)
+    merged = BatchScores(
+        total_score=np.empty(n),
+        value_score=np.empty(n),
+        quality_score=np.empty(n),
+        momentum_score=np.empty(n),
+        health_score=np.empty(n),
+        signal_codes=np.empty(n, dtype=np.int64),
+    )
+    for rows, result in zip(shards, results):
+        merged.total_score[rows] = result.total_score
+        merged.value_score[rows] = result.value_score
+        merged.quality_score[rows] = result.quality_score
+        merged.momentum_score[rows] = result.momentum_score
+        merged.health_score[rows] = result.health_score
+        merged.signal_codes[rows] = result.signal_codes
+
+    logger.info(f"Scored {n} stocks in {len(shards)} sector shards on {workers} workers")
+    return merged
@@ -0,0 +1,214 @@
+"""
+Memory-mapped columnar price cache on local disk.
+
+Each ticker's daily OHLCV history is kept as Arrow IPC files under
+PRICE_CACHE_DIR/<TICKER>/, one file per appended segment (named by its first
+date). Files are opened with memory mapping and handed to pandas without
+copying the columns, so a worker or the desktop app loads a five-year
+history without hydrating thousands of Numeric rows from SQL.
+
+New bars are written as a new segment; a revised last bar, or more than
+MAX_SEGMENTS segments, rewrites the ticker as one file. The least recently
+used tickers are deleted once the cache exceeds PRICE_CACHE_MAX_BYTES.
+
+Requires pyarrow; without it (or with PRICE_CACHE_ENABLED=false)
+get_price_cache() returns None and prices are served from the database.
+"""
+import logging
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    if settings.PRICE_CACHE_ENABLED:
+        logger.warning("pyarrow not installed. The price cache is disabled; prices are served from the database.")
+    HAS_PYARROW = False
+
+# Segments per ticker before they are compacted into one file
+MAX_SEGMENTS = 16
+
+SEGMENT_SUFFIX = ".arrow"
+
+_UNSAFE_CHARACTERS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+class PriceCache:
+    """Per-ticker Arrow IPC files, read via memory mapping."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        if HAS_PYARROW:
+            self._schema = pa.schema([
+                ("date", pa.timestamp("ns")),
+                ("open", pa.float64()),
+                ("high", pa.float64()),
+                ("low", pa.float64()),
+                ("close", pa.float64()),
+                ("volume", pa.int64()),
+            ])
+
+    def read(self, ticker: str, start: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        """
+        Cached history of a ticker, optionally from a date on.
+
+        Columns are zero-copy, read-only views of the mapped files when the
+        ticker is a single segment.
+
+        Returns:
+            DataFrame with date, open, high, low, close and volume columns in
+            ascending date order, or None if the ticker is not cached
+        """
+        table = self._read_table(ticker)
+        if table is None:
+            return None
+        if start is not None:
+            dates = table.column("date").to_numpy()
+            table = table.slice(int(np.searchsorted(dates, np.datetime64(start, "ns"))))
+        return table.to_pandas(split_blocks=True)
+
+    def write(self, ticker: str, df: pd.DataFrame) -> None:
+        """Replace a ticker's cached history."""
+        table = self._to_table(df)
+        with self._lock:
+            directory = self._ticker_dir(ticker)
+            stale = self._segments(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+            written = self._write_segment(directory, table)
+            for path in stale:
+                if path != written:
+                    path.unlink(missing_ok=True)
+            self._evict(keep=directory)
+
+    def merge(self, ticker: str, df: pd.DataFrame) -> None:
+        """
+        Add bars to a ticker's cached history.
+
+        Bars after the last cached date are appended as a new segment; bars
+        overlapping the cached range replace the cached ones (rewrite).
+        """
+        if df is None or df.empty:
+            return
+        cached = self._read_table(ticker)
+        if cached is None or cached.num_rows == 0:
+            self.write(ticker, df)
+            return
+
+        last = cached.column("date")[-1].value
+        new = self._to_table(df)
+        first_new = new.column("date")[0].value
+        directory = self._ticker_dir(ticker)
+        if first_new > last and len(self._segments(directory)) < MAX_SEGMENTS:
+            with self._lock:
+                self._write_segment(directory, new)
+                self._evict(keep=directory)
+            return
+
+        kept = cached.slice(0, int(np.searchsorted(cached.column("date").to_numpy().view("int64"), first_new)))
+        self.write(ticker, pa.concat_tables([kept, new]).to_pandas())
+
+    def invalidate(self, ticker: str) -> None:
+        """Drop a ticker from the cache."""
+        with self._lock:
+            shutil.rmtree(self._ticker_dir(ticker), ignore_errors=True)
+
+    def size_bytes(self) -> int:
+        """Total size of the cached files."""
+        return sum(path.stat().st_size for path in self.directory.glob(f"*/*{SEGMENT_SUFFIX}"))
+
+    def _read_table(self, ticker: str) -> "Optional[pa.Table]":
+        directory = self._ticker_dir(ticker)
+        tables = []
+        try:
+            for path in self._segments(directory):
+                with pa.memory_map(str(path)) as source:
+                    tables.append(pa.ipc.open_file(source).read_all())
+            if tables:
+                os.utime(directory)  # Recently used, for eviction
+        except (FileNotFoundError, pa.ArrowInvalid) as e:
+            # Evicted or rewritten by another process while listing; treat as a miss
+            logger.debug(f"Price cache miss for {ticker}: {e}")
+            return None
+        if not tables:
+            return None
+        return tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+
+    def _to_table(self, df: pd.DataFrame) -> "pa.Table":
+        columns = {
+            "date": pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[ns]"),
+            "open": pd.to_numeric(df["open"]).to_numpy(dtype=float),
+            "high": pd.to_numeric(df["high"]).to_numpy(dtype=float),
+            "low": pd.to_numeric(df["low"]).to_numpy(dtype=float),
+            "close": pd.to_numeric(df["close"]).to_numpy(dtype=float),
+            "volume": pd.to_numeric(df["volume"]).fillna(0).to_numpy(dtype=np.int64),
+        }
+        return pa.Table.from_pydict(columns, schema=self._schema)
+
+    def _write_segment(self, directory: Path, table: "pa.Table") -> Path:
+        """Write a table as one record batch, atomically, named by its first date."""
+        first = pd.Timestamp(table.column("date")[0].value)
+        path = directory / f"{first:%Y%m%d}{SEGMENT_SUFFIX}"
+        partial = path.with_suffix(f".{os.getpid()}.tmp")
+        with pa.OSFile(str(partial), "wb") as sink:
+            with pa.ipc.new_file(sink, self._schema) as writer:
+                writer.write_table(table.combine_chunks())
+        os.replace(partial, path)
+        return path
+
+    def _evict(self, keep: Path) -> None:
+        """Delete least recently used tickers until the cache fits its budget."""
+        entries = []
+        total = 0
+        for directory in self.directory.iterdir():
+            if not directory.is_dir():
+                continue
+            size = sum(path.stat().st_size for path in directory.glob(f"*{SEGMENT_SUFFIX}"))
+            entries.append((directory.stat().st_mtime, size, directory))
+            total += size
+        for _, size, directory in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            if directory == keep:
+                continue
+            try:
+                shutil.rmtree(directory)
+            except OSError as e:  # e.g. still mapped on Windows
+                logger.debug(f"Could not evict {directory}: {e}")
+                continue
+            total -= size
+
+    def _ticker_dir(self, ticker: str) -> Path:
+        return self.directory / _UNSAFE_CHARACTERS.sub("_", ticker.upper())
+
+    @staticmethod
+    def _segments(directory: Path) -> List[Path]:
+        if not directory.is_dir():
+            return []
+        return sorted(directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+
+_price_cache: Optional[PriceCache] = None
+
+
+def get_price_cache() -> Optional[PriceCache]:
+    """Get the process-wide price cache, or None if it is disabled or pyarrow is missing."""
+    global _price_cache
+    if not settings.PRICE_CACHE_ENABLED or not HAS_PYARROW:
+        return None
+    if _price_cache is None:
+        _price_cache = PriceCache(settings.PRICE_CACHE_DIR, settings.PRICE_CACHE_MAX_BYTES)
+    return _price_cache
@@ -10,9 +10,9 @@ This module handles:
 Phase 4 implementation for momentum score calculation.
 """
 import logging
+import zlib
 from datetime import datetime, timedelta, date
 from typing import List, Optional, Dict, Any, Tuple
-from decimal import Decimal
 import random
 
 import pandas as pd
@@ -30,6 +30,26 @@ except ImportError:
     logger.warning("pandas-ta not installed. Technical indicators will use manual calculations.")
     HAS_PANDAS_TA = False
 
+# Calendar days covered by each supported period
+PERIOD_DAYS = {
+    "1mo": 30,
+    "3mo": 90,
+    "6mo": 180,
+    "1y": 365,
+    "2y": 730,
+    "5y": 1825,
+}
+
+
+def mock_seed(key: str) -> int:
+    """
+    Seed for a ticker's mock price series.
+
+    zlib.crc32 is stable across processes, unlike hash() which is randomized
+    per run, so the same ticker always produces the same chart.
+    """
+    return zlib.crc32(key.encode("utf-8"))
+
 
 class PriceDataService:
     """Service for fetching and processing historical price data."""
@@ -42,7 +62,8 @@ class PriceDataService:
         self,
         ticker: str,
         period: str = "1y",
-        interval: str = "1d"
+        interval: str = "1d",
+        start: Optional[date] = None
     ) -> Optional[pd.DataFrame]:
         """
         Fetch historical price data from Yahoo Finance using yfinance.
@@ -51,6 +72,7 @@ class PriceDataService:
             ticker: Stock ticker symbol
             period: Time period (1mo, 3mo, 6mo, 1y, 2y, 5y)
             interval: Data interval (1d, 1wk, 1mo)
+            start: If set, fetch from this date to today instead of `period`
 
         Returns:
             DataFrame with OHLCV data or None if error
@@ -60,7 +82,10 @@ class PriceDataService:
 
             # Download data
             stock = yf.Ticker(ticker)
-            df = stock.history(period=period, interval=interval)
+            if start is not None:
+                df = stock.history(start=start.isoformat(), interval=interval)
+            else:
+                df = stock.history(period=period, interval=interval)
 
             if df.empty:
                 logger.warning(f"No price data returned for {ticker}")
@@ -77,6 +102,7 @@ class PriceDataService:
                 logger.error(f"Missing required columns for {ticker}")
                 return None
 
+            df.attrs["source"] = "yahoo"
             logger.info(f"✅ Fetched {len(df)} price records for {ticker}")
             return df
 
@@ -90,60 +116,58 @@ class PriceDataService:
         days: int = 365,
         start_price: float = 100.0,
         volatility: float = 0.02,
-        trend: float = 0.0001
+        trend: float = 0.0001,
+        seed: Optional[int] = None
     ) -> pd.DataFrame:
         """
         Generate realistic mock historical price data using geometric Brownian motion.
 
+        The whole series is drawn from a per-call np.random.Generator with
+        array operations, so concurrent calls neither share nor disturb
+        random state and the same seed always yields the same series.
+
         Args:
             ticker: Stock ticker symbol
             days: Number of days of historical data
             start_price: Starting price
             volatility: Daily volatility (0.02 = 2%)
             trend: Daily drift (0.0001 = 0.01% per day)
+            seed: Random seed (defaults to mock_seed(ticker))
 
         Returns:
             DataFrame with OHLCV data
         """
         logger.info(f"Generating {days} days of mock price data for {ticker}")
+        rng = np.random.default_rng(mock_seed(ticker) if seed is None else seed)
 
         # Generate dates
         end_date = datetime.now()
         dates = pd.date_range(end=end_date, periods=days, freq='D')
 
-        # Generate prices using geometric Brownian motion
-        prices = [start_price]
-        for _ in range(days - 1):
-            # Random walk with drift
-            change = np.random.normal(trend, volatility)
-            new_price = prices[-1] * (1 + change)
-            prices.append(max(new_price, 0.01))  # Prevent negative prices
-
-        prices = np.array(prices)
-
-        # Generate OHLC from close prices
-        data = []
-        for i, (date, close) in enumerate(zip(dates, prices)):
-            # Generate realistic OHLC
-            daily_range = close * np.random.uniform(0.01, 0.05)  # 1-5% daily range
-            high = close + np.random.uniform(0, daily_range)
-            low = close - np.random.uniform(0, daily_range)
-            open_price = low + np.random.uniform(0, high - low)
-
-            # Generate volume (higher volume = higher volatility)
-            base_volume = 1000000
-            volume = int(base_volume * np.random.lognormal(0, 0.5))
-
-            data.append({
-                'date': date,
-                'open': round(open_price, 2),
-                'high': round(high, 2),
-                'low': round(low, 2),
-                'close': round(close, 2),
-                'volume': volume,
-            })
-
-        df = pd.DataFrame(data)
+        # Random walk with drift: close[i] = close[i-1] * (1 + change[i])
+        changes = rng.normal(trend, volatility, max(days - 1, 0))
+        growth = np.concatenate(([1.0], np.cumprod(np.maximum(1 + changes, 1e-6))))[:days]
+        close = np.maximum(start_price * growth, 0.01)  # Prevent negative prices
+
+        # Generate realistic OHLC around each close (1-5% daily range)
+        daily_range = close * rng.uniform(0.01, 0.05, days)
+        high = close + rng.uniform(0, 1, days) * daily_range
+        low = close - rng.uniform(0, 1, days) * daily_range
+        open_price = low + rng.uniform(0, 1, days) * (high - low)
+
+        # Generate volume (higher volume = higher volatility)
+        base_volume = 1000000
+        volume = (base_volume * rng.lognormal(0, 0.5, days)).astype(np.int64)
+
+        df = pd.DataFrame({
+            'date': dates,
+            'open': np.round(open_price, 2),
+            'high': np.round(high, 2),
+            'low': np.round(low, 2),
+            'close': np.round(close, 2),
+            'volume': volume,
+        })
+        df.attrs["source"] = "mock"
         logger.info(f"✅ Generated {len(df)} price records for {ticker}")
         return df
 
@@ -169,24 +193,8 @@ class PriceDataService:
 
         if should_use_mock:
             # Generate mock data
-            days_map = {
-                "1mo": 30,
-                "3mo": 90,
-                "6mo": 180,
-                "1y": 365,
-                "2y": 730,
-                "5y": 1825,
-            }
-            days = days_map.get(period, 365)
-
-            # Use ticker-based seed for consistent mock data. zlib.crc32 is
-            # stable across processes, unlike hash() which is randomized per
-            # run — the same ticker must always produce the same chart.
-            import zlib
-            np.random.seed(zlib.crc32(ticker.encode("utf-8")) % 2**32)
-            df = self.generate_mock_historical_prices(ticker, days=days)
-            np.random.seed()  # Reset seed
-            return df
+            days = PERIOD_DAYS.get(period, 365)
+            return self.generate_mock_historical_prices(ticker, days=days, seed=mock_seed(ticker))
         else:
             # Try real API, fallback to mock
             df = self.fetch_historical_prices_yahoo(ticker, period=period)
@@ -195,6 +203,41 @@ class PriceDataService:
                 return self.fetch_historical_prices(ticker, period=period, use_mock=True)
             return df
 
+    def fetch_prices_since(
+        self,
+        ticker: str,
+        start: date,
+        start_price: Optional[float] = None,
+        use_mock: Optional[bool] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch daily prices from a date through today (trailing updates).
+
+        Args:
+            ticker: Stock ticker symbol
+            start: First date to fetch
+            start_price: Close on `start`, to continue a mock series from
+            use_mock: Override to force mock data (None = use settings)
+
+        Returns:
+            DataFrame with OHLCV data
+        """
+        should_use_mock = use_mock if use_mock is not None else not self.use_real_api
+
+        if should_use_mock:
+            days = (date.today() - start).days + 1
+
+            # Seeded by ticker and start date, so a retried update is identical
+            return self.generate_mock_historical_prices(
+                ticker, days=days, start_price=start_price or 100.0, seed=mock_seed(f"{ticker}:{start.isoformat()}")
+            )
+        else:
+            df = self.fetch_historical_prices_yahoo(ticker, start=start)
+            if df is None:
+                logger.warning(f"Falling back to mock data for {ticker}")
+                return self.fetch_prices_since(ticker, start, start_price=start_price, use_mock=True)
+            return df
+
     def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate technical indicators for price data.
@@ -325,6 +368,34 @@ class PriceDataService:
             'volume_trend': 0,
         }
 
+    def prepare_price_frame(self, df: pd.DataFrame, stock_id) -> pd.DataFrame:
+        """
+        Convert provider OHLCV data to stock_prices columns, whole columns at once.
+
+        Args:
+            df: DataFrame with OHLCV data
+            stock_id: UUID of the stock
+
+        Returns:
+            DataFrame with stock_id, date, open, high, low, close, volume and
+            adjusted_close columns, ready for copy_upsert
+        """
+        dates = pd.to_datetime(df['date'])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)  # Keep the exchange-local trading date
+        close = pd.to_numeric(df['close']).round(4)
+
+        return pd.DataFrame({
+            'stock_id': stock_id,
+            'date': dates.dt.date.values,
+            'open': pd.to_numeric(df['open']).round(4).values,
+            'high': pd.to_numeric(df['high']).round(4).values,
+            'low': pd.to_numeric(df['low']).round(4).values,
+            'close': close.values,
+            'volume': pd.to_numeric(df['volume']).round().astype('Int64').values,
+            'adjusted_close': (pd.to_numeric(df['adjusted_close']).round(4) if 'adjusted_close' in df else close).values,
+        })
+
     def prepare_price_records(
         self,
         ticker: str,
@@ -340,22 +411,11 @@ class PriceDataService:
             stock_id: UUID of the stock
 
         Returns:
-            List of dictionaries ready for database insertion
+            List of dictionaries ready for database insertion; prices are
+            floats (not Decimals) and missing values are None
         """
-        records = []
-
-        for _, row in df.iterrows():
-            record = {
-                'stock_id': stock_id,
-                'date': row['date'].date() if isinstance(row['date'], pd.Timestamp) else row['date'],
-                'open': Decimal(str(row['open'])) if pd.notna(row['open']) else None,
-                'high': Decimal(str(row['high'])) if pd.notna(row['high']) else None,
-                'low': Decimal(str(row['low'])) if pd.notna(row['low']) else None,
-                'close': Decimal(str(row['close'])),
-                'volume': int(row['volume']) if pd.notna(row['volume']) else None,
-                'adjusted_close': Decimal(str(row.get('adjusted_close', row['close']))),
-            }
-            records.append(record)
+        frame = self.prepare_price_frame(df, stock_id)
+        records = frame.astype(object).where(frame.notna(), None).to_dict('records')
 
         logger.info(f"Prepared {len(records)} price records for {ticker}")
         return records
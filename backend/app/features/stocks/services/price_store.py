@@ -0,0 +1,347 @@
+"""
+Read-through price store backed by the stock_prices table.
+
+Price history is served from the database. Only the trailing days missing
+since the last stored bar are fetched from the provider (Yahoo Finance or
+mock data) and appended in bulk; a ticker with no stored prices is loaded
+once with PRICE_STORE_HISTORY_PERIOD of history. Chart, indicator, momentum
+and trade-signal requests therefore no longer trigger a network fetch on
+every call.
+
+The last stored bar is re-fetched with each trailing update, so a bar stored
+while its session was still open is corrected once the session closes. When
+the real API is enabled, mock data it falls back to is served but never
+stored, so it cannot shadow real prices later.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.features.stocks.models import Stock, StockPrice
+from app.features.stocks.services.price_cache import PriceCache, get_price_cache
+from app.features.stocks.services.price_data_service import PERIOD_DAYS, PriceDataService
+from app.infrastructure.database.bulk import copy_upsert
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ("date", "open", "high", "low", "close", "volume")
+
+# Stocks fetched per bulk write when backfilling
+BACKFILL_BATCH_TICKERS = 200
+
+
+def last_complete_session(today: date) -> date:
+    """Latest weekday strictly before today (the last session known to have closed)."""
+    day = today - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+class PriceStore:
+    """Serves historical prices from stock_prices, filling gaps from the provider."""
+
+    def __init__(self, db: Session, price_service: PriceDataService):
+        self.db = db
+        self.price_service = price_service
+        # Provider data served but not stored (mock fallback), by stock id
+        self._unstored: Dict[Any, pd.DataFrame] = {}
+
+    def get_prices(self, stock: Stock, period: str = "1y") -> Optional[pd.DataFrame]:
+        """
+        Get daily OHLCV history for a stock.
+
+        Args:
+            stock: Stock to get prices for
+            period: Time period (1mo, 3mo, 6mo, 1y, 2y, 5y)
+
+        Returns:
+            DataFrame with date, open, high, low, close and volume columns in
+            ascending date order, or None if no price data is available
+        """
+        self.refresh(stock)
+        return self.load_period(stock, period)
+
+    def refresh(self, stock: Stock) -> Optional[date]:
+        """
+        Bring a stock's stored prices up to date.
+
+        Loads full history for a ticker without stored prices and fetches the
+        trailing days when the newest bar is older than the last closed
+        session. The trailing days are requested at most once a day per stock
+        (Stock.prices_checked_on), so a holiday or a halted or delisted ticker
+        that leaves the store behind does not cost a provider call per request.
+
+        Returns:
+            Date of the newest stored bar, or None if nothing is stored
+        """
+        today = date.today()
+        latest = self.db.execute(
+            select(func.max(StockPrice.date)).where(StockPrice.stock_id == stock.id)
+        ).scalar()
+
+        if latest is None:
+            df = self.price_service.fetch_historical_prices(stock.ticker, period=settings.PRICE_STORE_HISTORY_PERIOD)
+            if not self._append(stock, df):
+                if df is not None and not df.empty:
+                    self._unstored[stock.id] = df
+                return None
+        elif latest < last_complete_session(today) and stock.prices_checked_on != today:
+            last_close = self.db.execute(
+                select(StockPrice.close).where(StockPrice.stock_id == stock.id, StockPrice.date == latest)
+            ).scalar()
+            df = self.price_service.fetch_prices_since(stock.ticker, latest, start_price=float(last_close))
+            self._append(stock, df)
+            self.db.execute(update(Stock).where(Stock.id == stock.id).values(prices_checked_on=today))
+            self.db.commit()
+            stock.prices_checked_on = today
+        else:
+            return latest
+
+        return self.db.execute(
+            select(func.max(StockPrice.date)).where(StockPrice.stock_id == stock.id)
+        ).scalar()
+
+    def load_period(self, stock: Stock, period: str = "1y") -> Optional[pd.DataFrame]:
+        """Prices of a stock over a period as of the last refresh (no provider fetch)."""
+        start = date.today() - timedelta(days=PERIOD_DAYS.get(period, 365))
+        unstored = self._unstored.get(stock.id)
+        if unstored is not None:
+            return unstored[pd.to_datetime(unstored["date"]).dt.date >= start].reset_index(drop=True)
+        cache = get_price_cache()
+        if cache is not None:
+            return self._load_cached(cache, stock, start)
+        return self.load(stock, start)
+
+    def load(self, stock: Stock, start: date) -> Optional[pd.DataFrame]:
+        """Stored prices of a stock from a date on (None if there are none)."""
+        rows = self.db.execute(
+            select(*(getattr(StockPrice, name) for name in PRICE_COLUMNS))
+            .where(StockPrice.stock_id == stock.id, StockPrice.date >= start)
+            .order_by(StockPrice.date)
+        ).all()
+        if not rows:
+            return None
+
+        df = pd.DataFrame(rows, columns=list(PRICE_COLUMNS))
+        df["date"] = pd.to_datetime(df["date"])
+        for name in ("open", "high", "low", "close"):
+            df[name] = df[name].astype(float)
+        df["volume"] = df["volume"].fillna(0).astype("int64")
+        return df
+
+    def _load_cached(self, cache: PriceCache, stock: Stock, start: date) -> Optional[pd.DataFrame]:
+        """
+        Stored prices from a date on, via the local memory-mapped cache.
+
+        The cache is checked against the newest stored bar (one indexed row):
+        bars stored since the cached ones are read from the database and
+        appended, and a revised last bar is merged in.
+        """
+        newest = self.db.execute(
+            select(StockPrice.date, StockPrice.close, StockPrice.volume)
+            .where(StockPrice.stock_id == stock.id)
+            .order_by(StockPrice.date.desc())
+            .limit(1)
+        ).first()
+        if newest is None:
+            return None
+
+        cached = cache.read(stock.ticker)
+        if cached is None or cached.empty or cached["date"].iloc[-1].date() > newest.date:
+            cache.write(stock.ticker, self.load(stock, date.min))
+        else:
+            last = cached.iloc[-1]
+            if not _same_bar(last, newest.date, newest.close, newest.volume):
+                since = self.load(stock, last["date"].date())
+                first = since.iloc[0]
+                if _same_bar(last, first["date"].date(), first["close"], first["volume"]):
+                    since = since.iloc[1:]  # Cached bars are current: append only the new ones
+                cache.merge(stock.ticker, since)
+        return cache.read(stock.ticker, start=pd.Timestamp(start))
+
+    def backfill(self, stocks: Sequence[Stock], period: Optional[str] = None) -> Dict[str, int]:
+        """
+        Load full price history for many stocks.
+
+        Provider data for BACKFILL_BATCH_TICKERS stocks at a time is fetched
+        concurrently (PRICE_FETCH_WORKERS threads), converted column-wise and
+        written with one copy_upsert per batch.
+
+        Args:
+            stocks: Stocks to load
+            period: History to fetch (default: PRICE_STORE_HISTORY_PERIOD)
+
+        Returns:
+            Dict with the number of stocks loaded and price rows written
+        """
+        period = period or settings.PRICE_STORE_HISTORY_PERIOD
+        loaded = rows = 0
+
+        def fetch(stock: Stock) -> Optional[pd.DataFrame]:
+            return self.price_service.fetch_historical_prices(stock.ticker, period=period)
+
+        # Fetches are network-bound; conversion and writes stay on this session's thread
+        with ThreadPoolExecutor(max_workers=max(1, settings.PRICE_FETCH_WORKERS)) as executor:
+            for start in range(0, len(stocks), BACKFILL_BATCH_TICKERS):
+                batch = stocks[start:start + BACKFILL_BATCH_TICKERS]
+                frames = [
+                    (stock, self.price_service.prepare_price_frame(df, stock.id))
+                    for stock, df in zip(batch, executor.map(fetch, batch))
+                    if self._storable(stock, df)
+                ]
+                if frames:
+                    batch_frame = pd.concat([frame for _, frame in frames], ignore_index=True)
+                    rows += copy_upsert(self.db, StockPrice, batch_frame, conflict_columns=["stock_id", "date"])
+                    self.db.commit()
+                    for stock, frame in frames:
+                        self._update_cached(stock, frame)
+                    loaded += len(frames)
+                logger.info(f"Backfilled prices for {loaded} stocks ({rows} rows)")
+        return {"stocks": loaded, "rows": rows}
+
+    def refresh_many(self, stocks: Sequence[Stock]) -> Dict[str, int]:
+        """
+        Bring many stocks' stored prices up to date (refresh() for a universe).
+
+        The newest stored bar of BACKFILL_BATCH_TICKERS stocks at a time is
+        read in one query, the provider fetches of the stale ones run
+        concurrently (PRICE_FETCH_WORKERS threads) and each batch is written
+        with one copy_upsert.
+
+        Args:
+            stocks: Stocks to refresh
+
+        Returns:
+            Dict with the number of stocks fetched and price rows written
+        """
+        today = date.today()
+        last_session = last_complete_session(today)
+        fetched = rows = 0
+
+        def fetch(job: Tuple[Stock, Optional[date], Any]) -> Optional[pd.DataFrame]:
+            stock, latest, last_close = job
+            if latest is None:
+                return self.price_service.fetch_historical_prices(stock.ticker, period=settings.PRICE_STORE_HISTORY_PERIOD)
+            return self.price_service.fetch_prices_since(stock.ticker, latest, start_price=float(last_close))
+
+        with ThreadPoolExecutor(max_workers=max(1, settings.PRICE_FETCH_WORKERS)) as executor:
+            for start in range(0, len(stocks), BACKFILL_BATCH_TICKERS):
+                batch = stocks[start:start + BACKFILL_BATCH_TICKERS]
+                newest = self._newest_bars([stock.id for stock in batch])
+                jobs = []
+                for stock in batch:
+                    latest, last_close = newest.get(stock.id, (None, None))
+                    if latest is None or (latest < last_session and stock.prices_checked_on != today):
+                        jobs.append((stock, latest, last_close))
+                if not jobs:
+                    continue
+
+                frames = [
+                    (stock, self.price_service.prepare_price_frame(df, stock.id))
+                    for (stock, _, _), df in zip(jobs, executor.map(fetch, jobs))
+                    if self._storable(stock, df)
+                ]
+                if frames:
+                    batch_frame = pd.concat([frame for _, frame in frames], ignore_index=True)
+                    rows += copy_upsert(self.db, StockPrice, batch_frame, conflict_columns=["stock_id", "date"])
+                trailing = [stock.id for stock, latest, _ in jobs if latest is not None]
+                if trailing:
+                    self.db.execute(update(Stock).where(Stock.id.in_(trailing)).values(prices_checked_on=today))
+                self.db.commit()
+                for stock, frame in frames:
+                    self._update_cached(stock, frame)
+                fetched += len(jobs)
+                logger.info(f"Refreshed prices for {fetched} stocks ({rows} rows)")
+        return {"stocks": fetched, "rows": rows}
+
+    def _newest_bars(self, stock_ids: Sequence[Any]) -> Dict[Any, Tuple[date, Any]]:
+        """(date, close) of each stock's newest stored bar (stocks without prices are left out)."""
+        newest = (
+            select(StockPrice.stock_id, func.max(StockPrice.date).label("date"))
+            .where(StockPrice.stock_id.in_(list(stock_ids)))
+            .group_by(StockPrice.stock_id)
+            .subquery()
+        )
+        rows = self.db.execute(
+            select(StockPrice.stock_id, StockPrice.date, StockPrice.close)
+            .join(newest, and_(StockPrice.stock_id == newest.c.stock_id, StockPrice.date == newest.c.date))
+        ).all()
+        return {stock_id: (bar_date, close) for stock_id, bar_date, close in rows}
+
+    def _storable(self, stock: Stock, df: Optional[pd.DataFrame]) -> bool:
+        """Whether provider data should be stored (not empty, not mock fallback data)."""
+        if df is None or df.empty:
+            return False
+        if self.price_service.use_real_api and df.attrs.get("source") == "mock":
+            logger.info(f"Not storing fallback mock prices for {stock.ticker}")
+            return False
+        return True
+
+    def _update_cached(self, stock: Stock, frame: pd.DataFrame) -> None:
+        """
+        Bring a cached ticker in line with bars just written over its cached range.
+
+        _load_cached only compares the newest bar, so revised older bars would
+        otherwise be served stale. Written bars equal to the cached ones are
+        ignored (a trailing refresh always rewrites the last stored bar);
+        from the first one that differs the written bars are merged in. Bars
+        after the cached range are left to _load_cached, which appends them
+        as a new segment on the next read.
+        """
+        cache = get_price_cache()
+        if cache is None or frame.empty:
+            return
+        written = pd.DataFrame({
+            "date": pd.to_datetime(frame["date"]),
+            # Rounded like the stored Numeric(12, 4) values the cache is built from
+            **{name: frame[name].map(lambda value: round(float(value), 4)) for name in ("open", "high", "low", "close")},
+            "volume": pd.to_numeric(frame["volume"]).fillna(0).astype("int64"),
+        }).sort_values("date", ignore_index=True)
+        cached = cache.read(stock.ticker, start=written["date"].iloc[0])
+        if cached is None or cached.empty:
+            return
+
+        joined = cached.merge(written, on="date", how="left", suffixes=("_cached", ""), indicator=True)
+        if (joined["_merge"] != "both").any():
+            # Cached bars the write does not cover (e.g. a shorter backfill)
+            cache.invalidate(stock.ticker)
+            return
+        changed = pd.Series(False, index=joined.index)
+        for name in ("open", "high", "low", "close", "volume"):
+            old, new = joined[f"{name}_cached"], joined[name]
+            changed |= (old != new) & ~(old.isna() & new.isna())
+        if changed.any():
+            cache.merge(stock.ticker, written[written["date"] >= joined.loc[changed.idxmax(), "date"]])
+
+    def _append(self, stock: Stock, df: Optional[pd.DataFrame]) -> int:
+        """
+        Upsert provider data into stock_prices (one row per stock and date).
+
+        Returns:
+            Number of rows written (0 for no data or mock fallback data)
+        """
+        if not self._storable(stock, df):
+            return 0
+
+        frame = self.price_service.prepare_price_frame(df, stock.id)
+        written = copy_upsert(self.db, StockPrice, frame, conflict_columns=["stock_id", "date"])
+        self.db.commit()
+        self._update_cached(stock, frame)
+        logger.info(f"Stored {written} price records for {stock.ticker}")
+        return written
+
+
+def _same_bar(cached: pd.Series, bar_date: date, close, volume) -> bool:
+    """Whether a cached bar matches a stored one."""
+    return (
+        cached["date"].date() == bar_date
+        and cached["close"] == float(close)
+        and cached["volume"] == int(volume or 0)
+    )
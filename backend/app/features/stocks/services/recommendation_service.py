@@ -12,10 +12,18 @@ financial health — 0-25 each) are re-weighted per horizon:
 
 The result is a "horizon fit" score (0-100) used to rank top candidates.
 
+Weight scenarios generalise the fixed horizons: any number of weight
+vectors (horizon keys or user-defined) are evaluated in one matrix product
+of the N x 4 component matrix and a 4 x K weight matrix, returning the top
+candidates per scenario and how their rank moved against a baseline.
+
 IMPORTANT: Educational/research purposes only. Not financial advice.
 """
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
+from sqlalchemy import Float, cast
 from sqlalchemy.orm import Session
 
 from app.features.stocks.models import Stock, StockScore
@@ -65,6 +73,70 @@ _COMPONENT_LABELS = {
 # Each component score is 0-25; scale to 0-100 before weighting.
 _COMPONENT_MAX = 25.0
 
+# Column order of the component matrix and of every weight vector.
+COMPONENTS: Tuple[str, ...] = ("value", "quality", "momentum", "health")
+
+# Upper bound on scenarios evaluated in one request.
+MAX_SCENARIOS = 50
+
+
+@dataclass
+class ComponentMatrix:
+    """Scored universe as columns; components is N x 4 in COMPONENTS order."""
+    tickers: List[str]
+    names: List[str]
+    sectors: List[Optional[str]]
+    signals: List[str]
+    total_scores: np.ndarray
+    components: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+
+def weight_vector(weights: Dict[str, float]) -> np.ndarray:
+    """
+    Validate a weight dict and return it as a vector summing to 1.0.
+
+    Args:
+        weights: Weight per component; all four components are required
+
+    Returns:
+        Normalized weights in COMPONENTS order
+
+    Raises:
+        ValueError: If a component is missing or unknown, a weight is
+                    negative, or all weights are zero
+    """
+    unknown = set(weights) - set(COMPONENTS)
+    missing = set(COMPONENTS) - set(weights)
+    if unknown or missing:
+        raise ValueError(
+            f"Weights must have exactly these keys: {', '.join(COMPONENTS)}"
+        )
+    vector = np.array([float(weights[name]) for name in COMPONENTS])
+    if (vector < 0).any() or not np.isfinite(vector).all():
+        raise ValueError("Weights must be non-negative numbers")
+    total = vector.sum()
+    if total <= 0:
+        raise ValueError("At least one weight must be positive")
+    return vector / total
+
+
+def _top_indices(scores: np.ndarray, limit: int) -> np.ndarray:
+    """Indices of the `limit` highest scores, best first (ties keep universe order)."""
+    n = len(scores)
+    if limit <= 0:
+        return np.array([], dtype=np.int64)
+    if limit < n:
+        # Everything scoring at least the limit-th best score, then an exact ordering of that subset
+        cutoff = np.partition(scores, n - limit)[n - limit]
+        candidates = np.flatnonzero(scores >= cutoff)
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:limit]
+
 
 class RecommendationService:
     """Ranks stocks as top candidates for a given investment horizon."""
@@ -98,44 +170,28 @@ class RecommendationService:
                 f"Unknown horizon '{horizon}'. Must be one of: {', '.join(HORIZON_PROFILES)}"
             )
 
-        query = self.db.query(Stock, StockScore).join(StockScore, Stock.id == StockScore.stock_id)
-        if sector:
-            query = query.filter(Stock.sector == sector)
-
         weights = profile["weights"]
-        candidates: List[Dict[str, Any]] = []
-
-        for stock, score in query.all():
-            components = {
-                "value": float(score.value_score),
-                "quality": float(score.quality_score),
-                "momentum": float(score.momentum_score),
-                "health": float(score.health_score),
-            }
-            horizon_score = sum(
-                weights[name] * (value / _COMPONENT_MAX) * 100.0
-                for name, value in components.items()
-            )
+        matrix = self.load_component_matrix(sector)
+        horizon_scores = self._scenario_scores(matrix, np.array([[weights[name]] for name in COMPONENTS]))[:, 0]
 
+        candidates: List[Dict[str, Any]] = []
+        for rank, i in enumerate(_top_indices(horizon_scores, limit), start=1):
+            components = dict(zip(COMPONENTS, matrix.components[i].tolist()))
             candidates.append({
-                "ticker": stock.ticker,
-                "name": stock.name,
-                "sector": stock.sector,
-                "horizon_score": round(horizon_score, 1),
-                "total_score": float(score.total_score),
-                "signal": score.signal.value,
+                "ticker": matrix.tickers[i],
+                "name": matrix.names[i],
+                "sector": matrix.sectors[i],
+                "horizon_score": round(float(horizon_scores[i]), 1),
+                "total_score": float(matrix.total_scores[i]),
+                "signal": matrix.signals[i],
                 "value_score": components["value"],
                 "quality_score": components["quality"],
                 "momentum_score": components["momentum"],
                 "health_score": components["health"],
                 "why": self._explain(components, weights),
+                "rank": rank,
             })
 
-        candidates.sort(key=lambda c: c["horizon_score"], reverse=True)
-        candidates = candidates[:limit]
-        for rank, candidate in enumerate(candidates, start=1):
-            candidate["rank"] = rank
-
         return {
             "horizon": profile["key"],
             "label": profile["label"],
@@ -146,6 +202,152 @@ class RecommendationService:
             "candidates": candidates,
         }
 
+    def run_scenarios(
+        self,
+        scenarios: Sequence[Dict[str, Any]],
+        limit: int = 10,
+        sector: Optional[str] = None,
+        baseline: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Rank the universe under many weight scenarios at once.
+
+        All scenarios are scored in a single (N x 4) @ (4 x K) matrix product.
+        Ranks are competition ranks (1 + number of stocks scoring strictly
+        higher); rank_change is positive when a stock ranks better in the
+        scenario than in the baseline.
+
+        Args:
+            scenarios: List of {"name": str, "weights": {component: weight}}.
+                       weights may be omitted when name is a horizon key.
+                       Weights are normalized to sum to 1.0.
+            limit: Top candidates returned per scenario
+            sector: Optional sector filter
+            baseline: Scenario name to measure rank movement against
+                      (defaults to the first scenario)
+
+        Returns:
+            Dict with the baseline name, universe size and, per scenario,
+            its normalized weights and top candidates with rank movement.
+
+        Raises:
+            ValueError: If scenarios are empty, too many, duplicated, unknown
+                        horizons, have invalid weights, or baseline is unknown.
+        """
+        if not scenarios:
+            raise ValueError("At least one scenario is required")
+        if len(scenarios) > MAX_SCENARIOS:
+            raise ValueError(f"At most {MAX_SCENARIOS} scenarios can be evaluated at once")
+
+        names: List[str] = []
+        vectors: List[np.ndarray] = []
+        for scenario in scenarios:
+            name = scenario["name"]
+            if name in names:
+                raise ValueError(f"Duplicate scenario name '{name}'")
+            weights = scenario.get("weights")
+            if weights is None:
+                profile = HORIZON_PROFILES.get(name)
+                if profile is None:
+                    raise ValueError(
+                        f"Scenario '{name}' needs weights (or must be one of: {', '.join(HORIZON_PROFILES)})"
+                    )
+                weights = profile["weights"]
+            names.append(name)
+            vectors.append(weight_vector(weights))
+
+        baseline = baseline or names[0]
+        if baseline not in names:
+            raise ValueError(f"Unknown baseline scenario '{baseline}'")
+        baseline_col = names.index(baseline)
+
+        matrix = self.load_component_matrix(sector)
+        weight_matrix = np.column_stack(vectors)  # 4 x K
+        scores = self._scenario_scores(matrix, weight_matrix)  # N x K
+
+        # Sorted once per scenario we need ranks for: the baseline, plus each scenario's own column
+        baseline_sorted = np.sort(scores[:, baseline_col])
+
+        results = []
+        for k, name in enumerate(names):
+            column = scores[:, k]
+            column_sorted = baseline_sorted if k == baseline_col else np.sort(column)
+            top = _top_indices(column, limit)
+
+            candidates = []
+            for i in top:
+                rank = self._competition_rank(column_sorted, column[i])
+                baseline_rank = self._competition_rank(baseline_sorted, scores[i, baseline_col])
+                candidates.append({
+                    "ticker": matrix.tickers[i],
+                    "name": matrix.names[i],
+                    "sector": matrix.sectors[i],
+                    "scenario_score": round(float(column[i]), 1),
+                    "total_score": float(matrix.total_scores[i]),
+                    "signal": matrix.signals[i],
+                    "rank": rank,
+                    "baseline_rank": baseline_rank,
+                    "rank_change": baseline_rank - rank,
+                })
+
+            results.append({
+                "name": name,
+                "weights": dict(zip(COMPONENTS, (round(float(w), 4) for w in weight_matrix[:, k]))),
+                "count": len(candidates),
+                "candidates": candidates,
+            })
+
+        return {
+            "baseline": baseline,
+            "universe_size": len(matrix),
+            "scenarios": results,
+        }
+
+    def load_component_matrix(self, sector: Optional[str] = None) -> ComponentMatrix:
+        """
+        Load all scored stocks as a component matrix with one column query.
+
+        Args:
+            sector: Optional sector filter
+
+        Returns:
+            ComponentMatrix in query order
+        """
+        query = self.db.query(
+            Stock.ticker,
+            Stock.name,
+            Stock.sector,
+            StockScore.signal,
+            cast(StockScore.total_score, Float),
+            cast(StockScore.value_score, Float),
+            cast(StockScore.quality_score, Float),
+            cast(StockScore.momentum_score, Float),
+            cast(StockScore.health_score, Float),
+        ).join(StockScore, Stock.id == StockScore.stock_id)
+        if sector:
+            query = query.filter(Stock.sector == sector)
+        rows = query.all()
+
+        values = np.array([row[4:] for row in rows], dtype=float).reshape(len(rows), 1 + len(COMPONENTS))
+        return ComponentMatrix(
+            tickers=[row[0] for row in rows],
+            names=[row[1] for row in rows],
+            sectors=[row[2] for row in rows],
+            signals=[row[3].value for row in rows],
+            total_scores=values[:, 0],
+            components=values[:, 1:],
+        )
+
+    @staticmethod
+    def _scenario_scores(matrix: ComponentMatrix, weight_matrix: np.ndarray) -> np.ndarray:
+        """(N x 4) components scaled to 0-100, times (4 x K) weights -> N x K scores."""
+        return (matrix.components / _COMPONENT_MAX * 100.0) @ weight_matrix
+
+    @staticmethod
+    def _competition_rank(sorted_scores: np.ndarray, score: float) -> int:
+        """1 + number of scores strictly above score (binary search on an ascending array)."""
+        return int(len(sorted_scores) - np.searchsorted(sorted_scores, score, side="right")) + 1
+
     @staticmethod
     def _explain(components: Dict[str, float], weights: Dict[str, float]) -> str:
         """One-sentence reason naming the two strongest weighted contributors."""
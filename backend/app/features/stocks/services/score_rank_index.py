@@ -0,0 +1,198 @@
+"""
+Sorted total-score index for O(log n) rank and percentile lookups.
+
+The index holds every stored total score in ascending order, globally and
+per sector. It is rebuilt after each score recompute, kept in process
+memory and shared with other processes through Redis, so the API answers
+"what rank/percentile is this stock" with a binary search instead of
+scanning stock_scores.
+
+Freshness: with Redis, readers compare a small token key with their
+in-memory copy and reload the index when a recompute published a new one.
+Without Redis, the in-memory index is rebuilt from the database once it is
+older than CACHE_TTL_SCORES (the same staleness as the cached leaderboards).
+"""
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Float, cast
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.features.stocks.models import Stock, StockScore
+from app.infrastructure.cache import get_cache_service
+
+logger = logging.getLogger(__name__)
+
+RANK_INDEX_KEY = "scores:rank_index"
+RANK_INDEX_TOKEN_KEY = "scores:rank_index:token"
+RANK_INDEX_TTL = 24 * 3600  # Rebuilt from the database if Redis ever drops it
+
+
+@dataclass(frozen=True)
+class RankPosition:
+    """Where a score stands within a population (global or one sector)."""
+    rank: int        # 1 = highest score; ties share the best rank
+    percentile: int  # Share of the population scoring at or below (0-100)
+    total: int       # Population size
+
+
+class ScoreRankIndex:
+    """Ascending total scores, globally and per sector."""
+
+    def __init__(self, scores: np.ndarray, sector_scores: Dict[str, np.ndarray], token: str, built_at: float):
+        self.scores = scores
+        self.sector_scores = sector_scores
+        self.token = token
+        self.built_at = built_at
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Tuple[Optional[str], float]]) -> "ScoreRankIndex":
+        """Build from (sector, total_score) pairs."""
+        scores = np.sort(np.array([total for _, total in rows], dtype=float))
+        by_sector: Dict[str, List[float]] = {}
+        for sector, total in rows:
+            if sector:
+                by_sector.setdefault(sector, []).append(total)
+        return cls(
+            scores=scores,
+            sector_scores={sector: np.sort(np.array(values, dtype=float)) for sector, values in by_sector.items()},
+            token=uuid.uuid4().hex,
+            built_at=time.time(),
+        )
+
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON-serializable form for Redis."""
+        return {
+            "token": self.token,
+            "built_at": self.built_at,
+            "scores": self.scores.tolist(),
+            "sectors": {sector: values.tolist() for sector, values in self.sector_scores.items()},
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "ScoreRankIndex":
+        """Inverse of to_payload()."""
+        return cls(
+            scores=np.array(payload["scores"], dtype=float),
+            sector_scores={
+                sector: np.array(values, dtype=float) for sector, values in payload["sectors"].items()
+            },
+            token=payload["token"],
+            built_at=payload["built_at"],
+        )
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @staticmethod
+    def _position(sorted_scores: np.ndarray, score: float) -> Optional[RankPosition]:
+        total = len(sorted_scores)
+        if total == 0:
+            return None
+        at_or_below = int(np.searchsorted(sorted_scores, score, side="right"))
+        return RankPosition(
+            rank=total - at_or_below + 1,
+            percentile=int(round(100.0 * at_or_below / total)),
+            total=total,
+        )
+
+    def position(self, score: float, sector: Optional[str] = None) -> Optional[RankPosition]:
+        """
+        Rank and percentile of a total score.
+
+        Args:
+            score: Total score (0-100)
+            sector: If set, rank within this sector instead of the whole universe
+
+        Returns:
+            RankPosition, or None if the population is empty
+        """
+        if sector is None:
+            return self._position(self.scores, float(score))
+        return self._position(self.sector_scores.get(sector, np.empty(0)), float(score))
+
+    def ranking(self, score: Optional[float], sector: Optional[str]) -> Dict[str, Optional[int]]:
+        """Global and sector rank/percentile of a score as flat response fields."""
+        overall = self.position(score) if score is not None else None
+        in_sector = self.position(score, sector) if score is not None and sector else None
+        return {
+            "rank": overall.rank if overall else None,
+            "percentile": overall.percentile if overall else None,
+            "ranked_count": overall.total if overall else None,
+            "sector_rank": in_sector.rank if in_sector else None,
+            "sector_percentile": in_sector.percentile if in_sector else None,
+            "sector_count": in_sector.total if in_sector else None,
+        }
+
+
+_current_index: Optional[ScoreRankIndex] = None
+_index_lock = threading.Lock()
+
+
+def _swap(index: ScoreRankIndex) -> ScoreRankIndex:
+    """Atomically replace the in-process index."""
+    global _current_index
+    with _index_lock:
+        _current_index = index
+    return index
+
+
+def build_rank_index(db: Session) -> ScoreRankIndex:
+    """Build the index from stored scores with one two-column query."""
+    rows = (
+        db.query(Stock.sector, cast(StockScore.total_score, Float))
+        .join(StockScore, Stock.id == StockScore.stock_id)
+        .filter(Stock.is_deleted == False)  # noqa: E712
+        .all()
+    )
+    return ScoreRankIndex.from_rows(rows)
+
+
+def publish_rank_index(index: ScoreRankIndex) -> ScoreRankIndex:
+    """Make an index current in this process and, if available, in Redis."""
+    _swap(index)
+    cache = get_cache_service()
+    if cache.set(RANK_INDEX_KEY, index.to_payload(), ttl_seconds=RANK_INDEX_TTL):
+        cache.set(RANK_INDEX_TOKEN_KEY, {"token": index.token}, ttl_seconds=RANK_INDEX_TTL)
+    logger.info(f"Published score rank index ({len(index)} stocks, {len(index.sector_scores)} sectors)")
+    return index
+
+
+def refresh_rank_index(db: Session) -> ScoreRankIndex:
+    """Rebuild and publish the index; call after stored scores changed."""
+    return publish_rank_index(build_rank_index(db))
+
+
+def get_rank_index(db: Session) -> ScoreRankIndex:
+    """
+    Get the current score rank index.
+
+    Args:
+        db: Database session (used only when the index must be rebuilt)
+
+    Returns:
+        The latest ScoreRankIndex
+    """
+    current = _current_index
+    cache = get_cache_service()
+
+    if cache.is_available:
+        stored = cache.get(RANK_INDEX_TOKEN_KEY)
+        if stored is None:
+            return refresh_rank_index(db)
+        if current is not None and current.token == stored["token"]:
+            return current
+        payload = cache.get(RANK_INDEX_KEY)
+        if payload is None:
+            return refresh_rank_index(db)
+        return _swap(ScoreRankIndex.from_payload(payload))
+
+    if current is not None and time.time() - current.built_at < settings.CACHE_TTL_SCORES:
+        return current
+    return refresh_rank_index(db)
@@ -1,18 +1,28 @@
 """Service for tracking stock score changes over time."""
 from datetime import date, datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from uuid import UUID
 from decimal import Decimal
 
-from sqlalchemy import select, and_, desc, func
-from sqlalchemy.orm import Session
+from sqlalchemy import Date, DateTime, select, and_, or_, desc, exists, func, literal
+from sqlalchemy.orm import Session, aliased
+
+from app.config import settings
 
 from app.features.stocks.models import (
     Stock,
     StockScore,
     StockScoreHistory,
+    SignalTransition,
     Signal
 )
+from app.infrastructure.database.bulk import dialect_insert, random_uuid
+
+# StockScore columns copied into each history row
+SNAPSHOT_COLUMNS = ("total_score", "value_score", "quality_score", "momentum_score", "health_score", "signal")
+
+# Rows per read/delete batch when compacting history
+COMPACTION_BATCH_SIZE = 10_000
 
 
 class ScoreTrackingService:
@@ -21,62 +31,136 @@ class ScoreTrackingService:
     def __init__(self, db: Session):
         self.db = db
 
-    def snapshot_all_scores(self, snapshot_date: Optional[date] = None) -> int:
+    def snapshot_all_scores(self, snapshot_date: Optional[date] = None) -> Dict[str, int]:
         """
         Snapshot current scores for all stocks.
 
+        Copies stock_scores into stock_score_history with a single
+        INSERT ... SELECT ... ON CONFLICT (stock_id, snapshot_date) DO UPDATE,
+        so re-running a snapshot for the same date refreshes it in place.
+        With SCORE_HISTORY_CHANGE_ONLY, stocks whose scores and signal equal
+        their previous history row are skipped (readers forward-fill).
+        Signal changes against the previous history row are recorded in
+        signal_transitions.
+
         Args:
             snapshot_date: Date for the snapshot (defaults to today)
 
         Returns:
-            Number of snapshots created
+            Dict with the number of snapshots created and updated
         """
         if snapshot_date is None:
             snapshot_date = date.today()
 
-        # Get all current stock scores
-        stmt = select(StockScore).join(Stock).where(Stock.is_deleted == False)
-        current_scores = self.db.execute(stmt).scalars().all()
-
-        snapshots_created = 0
+        # Rows inserted by this statement get exactly this created_at; updated rows keep theirs
+        now = datetime.utcnow()
+        history = StockScoreHistory.__table__
+        copied = list(SNAPSHOT_COLUMNS)
 
-        for score in current_scores:
-            # Check if snapshot already exists for this date
-            existing = self.db.execute(
-                select(StockScoreHistory).where(
-                    and_(
-                        StockScoreHistory.stock_id == score.stock_id,
-                        StockScoreHistory.snapshot_date == snapshot_date
-                    )
-                )
-            ).scalar_one_or_none()
-
-            if existing:
-                # Update existing snapshot
-                existing.total_score = score.total_score
-                existing.value_score = score.value_score
-                existing.quality_score = score.quality_score
-                existing.momentum_score = score.momentum_score
-                existing.health_score = score.health_score
-                existing.signal = score.signal
-                existing.updated_at = datetime.utcnow()
-            else:
-                # Create new snapshot
-                snapshot = StockScoreHistory(
-                    stock_id=score.stock_id,
-                    snapshot_date=snapshot_date,
-                    total_score=score.total_score,
-                    value_score=score.value_score,
-                    quality_score=score.quality_score,
-                    momentum_score=score.momentum_score,
-                    health_score=score.health_score,
-                    signal=score.signal
-                )
-                self.db.add(snapshot)
-                snapshots_created += 1
+        source = (
+            select(
+                random_uuid(),
+                StockScore.stock_id,
+                literal(snapshot_date, Date),
+                *(getattr(StockScore, name) for name in copied),
+                literal(now, DateTime),
+                literal(now, DateTime),
+                literal(False),
+            )
+            .join(Stock, Stock.id == StockScore.stock_id)
+            .where(Stock.is_deleted == False)
+        )
+        if settings.SCORE_HISTORY_CHANGE_ONLY:
+            source = source.where(self._changed_since_previous_snapshot(snapshot_date))
+        insert = dialect_insert(self.db.get_bind().dialect.name)(history).from_select(
+            ["id", "stock_id", "snapshot_date", *copied, "created_at", "updated_at", "is_deleted"],
+            source,
+        )
+        stmt = insert.on_conflict_do_update(
+            index_elements=["stock_id", "snapshot_date"],
+            set_={name: insert.excluded[name] for name in copied + ["updated_at"]},
+        ).returning(history.c.created_at)
 
+        self._record_signal_transitions(snapshot_date, now)
+        created_at = self.db.execute(stmt).scalars().all()
         self.db.commit()
-        return snapshots_created
+
+        created = sum(1 for timestamp in created_at if timestamp == now)
+        return {"created": created, "updated": len(created_at) - created}
+
+    @staticmethod
+    def _changed_since_previous_snapshot(snapshot_date: date):
+        """
+        Condition on StockScore: its values differ from the stock's last history
+        row before snapshot_date, or a row for snapshot_date already exists.
+        """
+        previous = aliased(StockScoreHistory)
+        earlier = aliased(StockScoreHistory)
+        same_day = aliased(StockScoreHistory)
+
+        previous_date = (
+            select(func.max(earlier.snapshot_date))
+            .where(and_(earlier.stock_id == previous.stock_id, earlier.snapshot_date < snapshot_date))
+            .scalar_subquery()
+        )
+        unchanged = exists().where(
+            and_(
+                previous.stock_id == StockScore.stock_id,
+                previous.snapshot_date == previous_date,
+                *(getattr(previous, name) == getattr(StockScore, name) for name in SNAPSHOT_COLUMNS),
+            )
+        )
+        refreshed = exists().where(
+            and_(same_day.stock_id == StockScore.stock_id, same_day.snapshot_date == snapshot_date)
+        )
+        return or_(~unchanged, refreshed)
+
+    def _record_signal_transitions(self, snapshot_date: date, now: datetime) -> None:
+        """
+        Record, for snapshot_date, every stock whose current signal differs from
+        its last history row before that date (replacing an earlier run's rows).
+        """
+        transitions = SignalTransition.__table__
+        self.db.execute(transitions.delete().where(transitions.c.transition_date == snapshot_date))
+
+        previous_dates = (
+            select(
+                StockScoreHistory.stock_id,
+                func.max(StockScoreHistory.snapshot_date).label("max_date"),
+            )
+            .where(StockScoreHistory.snapshot_date < snapshot_date)
+            .group_by(StockScoreHistory.stock_id)
+            .subquery()
+        )
+        source = (
+            select(
+                random_uuid(),
+                StockScore.stock_id,
+                literal(snapshot_date, Date),
+                StockScoreHistory.signal,
+                StockScore.signal,
+                StockScoreHistory.total_score,
+                StockScore.total_score,
+                literal(now, DateTime),
+                literal(now, DateTime),
+                literal(False),
+            )
+            .join(Stock, Stock.id == StockScore.stock_id)
+            .join(previous_dates, previous_dates.c.stock_id == StockScore.stock_id)
+            .join(
+                StockScoreHistory,
+                and_(
+                    StockScoreHistory.stock_id == previous_dates.c.stock_id,
+                    StockScoreHistory.snapshot_date == previous_dates.c.max_date,
+                ),
+            )
+            .where(and_(Stock.is_deleted == False, StockScore.signal != StockScoreHistory.signal))
+        )
+        self.db.execute(transitions.insert().from_select(
+            ["id", "stock_id", "transition_date", "previous_signal", "new_signal",
+             "previous_score", "new_score", "created_at", "updated_at", "is_deleted"],
+            source,
+        ))
 
     def get_score_history(
         self,
@@ -86,6 +170,11 @@ class ScoreTrackingService:
         """
         Get score history for a stock.
 
+        History may be stored sparsely (change-only rows, weekly/monthly
+        tiers), so rows are forward-filled: one record per weekday from the
+        start of the period (or the stock's first snapshot) to the latest
+        snapshot date, each carrying the last stored values on or before it.
+
         Args:
             ticker: Stock ticker symbol
             days: Number of days of history to retrieve
@@ -95,24 +184,36 @@ class ScoreTrackingService:
         """
         cutoff_date = date.today() - timedelta(days=days)
 
-        stmt = (
+        stock_filter = and_(
+            StockScoreHistory.stock_id == Stock.id,
+            Stock.ticker == ticker,
+            Stock.is_deleted == False,
+        )
+        in_period = self.db.execute(
             select(StockScoreHistory)
-            .join(Stock, Stock.id == StockScoreHistory.stock_id)
-            .where(
-                and_(
-                    Stock.ticker == ticker,
-                    Stock.is_deleted == False,
-                    StockScoreHistory.snapshot_date >= cutoff_date
-                )
-            )
+            .join(Stock, stock_filter)
+            .where(StockScoreHistory.snapshot_date >= cutoff_date)
             .order_by(StockScoreHistory.snapshot_date.asc())
-        )
+        ).scalars().all()
 
-        history = self.db.execute(stmt).scalars().all()
+        # The row in effect at the start of the period
+        carried_in = self.db.execute(
+            select(StockScoreHistory)
+            .join(Stock, stock_filter)
+            .where(StockScoreHistory.snapshot_date < cutoff_date)
+            .order_by(desc(StockScoreHistory.snapshot_date))
+            .limit(1)
+        ).scalar_one_or_none()
+
+        latest_snapshot = self.db.execute(select(func.max(StockScoreHistory.snapshot_date))).scalar()
+
+        records = ([carried_in] if carried_in else []) + list(in_period)
+        if not records or latest_snapshot is None:
+            return []
 
         return [
             {
-                "date": h.snapshot_date.isoformat(),
+                "date": day.isoformat(),
                 "total_score": float(h.total_score),
                 "value_score": float(h.value_score),
                 "quality_score": float(h.quality_score),
@@ -120,9 +221,98 @@ class ScoreTrackingService:
                 "health_score": float(h.health_score),
                 "signal": h.signal.value
             }
-            for h in history
+            for day, h in forward_fill(records, max(cutoff_date, records[0].snapshot_date), latest_snapshot)
         ]
 
+    def get_score_history_batch(
+        self,
+        tickers: Sequence[str],
+        start_date: date,
+        end_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Get forward-filled score history for many stocks in columnar form.
+
+        One query loads every requested stock's rows in the range plus the
+        row in effect at its start, and the latest snapshot date. All series
+        share one date axis (weekdays, plus any date with a stored row);
+        values are None before a stock's first snapshot.
+
+        Args:
+            tickers: Stock ticker symbols
+            start_date: First date of the range
+            end_date: Last date of the range (defaults to the latest snapshot)
+
+        Returns:
+            Dict with the date axis, per-ticker series of every score column
+            and signal, and the requested tickers without history
+        """
+        earlier = aliased(StockScoreHistory)
+        carried_in_date = (
+            select(func.max(earlier.snapshot_date))
+            .where(and_(earlier.stock_id == StockScoreHistory.stock_id, earlier.snapshot_date < start_date))
+            .correlate(StockScoreHistory)
+            .scalar_subquery()
+        )
+        newest = aliased(StockScoreHistory)
+        latest_snapshot = select(func.max(newest.snapshot_date)).scalar_subquery()
+
+        stmt = (
+            select(
+                Stock.ticker,
+                StockScoreHistory.snapshot_date,
+                *(getattr(StockScoreHistory, name) for name in SNAPSHOT_COLUMNS),
+                latest_snapshot.label("latest_snapshot"),
+            )
+            .join(Stock, Stock.id == StockScoreHistory.stock_id)
+            .where(
+                and_(
+                    Stock.ticker.in_(set(tickers)),
+                    Stock.is_deleted == False,
+                    or_(
+                        StockScoreHistory.snapshot_date >= start_date,
+                        StockScoreHistory.snapshot_date == carried_in_date,
+                    ),
+                )
+            )
+            .order_by(Stock.ticker, StockScoreHistory.snapshot_date)
+        )
+        if end_date is not None:
+            stmt = stmt.where(StockScoreHistory.snapshot_date <= end_date)
+
+        by_ticker: Dict[str, List[Any]] = {}
+        latest = None
+        for row in self.db.execute(stmt):
+            by_ticker.setdefault(row.ticker, []).append(row)
+            latest = row.latest_snapshot
+        end = end_date if end_date is not None else latest
+
+        axis: List[date] = []
+        if by_ticker and end is not None:
+            first = max(start_date, min(records[0].snapshot_date for records in by_ticker.values()))
+            stored = {row.snapshot_date for records in by_ticker.values() for row in records}
+            day = first
+            while day <= end:
+                if day.weekday() < 5 or day in stored:
+                    axis.append(day)
+                day += timedelta(days=1)
+
+        series = {}
+        for ticker, records in by_ticker.items():
+            in_effect = forward_fill_on(records, axis)
+            columns = {
+                name: [float(getattr(row, name)) if row else None for row in in_effect]
+                for name in SNAPSHOT_COLUMNS if name != "signal"
+            }
+            columns["signal"] = [row.signal.value if row else None for row in in_effect]
+            series[ticker] = columns
+
+        return {
+            "dates": [day.isoformat() for day in axis],
+            "series": series,
+            "missing": sorted(set(tickers) - set(by_ticker)),
+        }
+
     def get_score_change(
         self,
         ticker: str,
@@ -230,155 +420,268 @@ class ScoreTrackingService:
         """
         past_date = date.today() - timedelta(days=days)
 
-        # Subquery to get the latest historical snapshot for each stock
-        subq = (
+        # Latest historical snapshot per stock on or before past_date
+        ranked = (
             select(
                 StockScoreHistory.stock_id,
-                func.max(StockScoreHistory.snapshot_date).label('max_date')
+                StockScoreHistory.total_score,
+                StockScoreHistory.signal,
+                func.row_number().over(
+                    partition_by=StockScoreHistory.stock_id,
+                    order_by=desc(StockScoreHistory.snapshot_date),
+                ).label("row_number"),
             )
             .where(StockScoreHistory.snapshot_date <= past_date)
-            .group_by(StockScoreHistory.stock_id)
             .subquery()
         )
 
-        # Join current scores with historical scores
+        # Delta, ordering and LIMIT in the database; only `limit` rows come back
+        change = (StockScore.total_score - ranked.c.total_score).label("score_change")
         stmt = (
             select(
-                Stock,
-                StockScore,
-                StockScoreHistory
+                Stock.ticker,
+                Stock.name,
+                Stock.sector,
+                StockScore.total_score,
+                StockScore.signal,
+                ranked.c.total_score.label("historical_score"),
+                ranked.c.signal.label("historical_signal"),
+                change,
             )
             .join(StockScore, Stock.id == StockScore.stock_id)
-            .join(subq, Stock.id == subq.c.stock_id)
-            .join(
-                StockScoreHistory,
-                and_(
-                    StockScoreHistory.stock_id == subq.c.stock_id,
-                    StockScoreHistory.snapshot_date == subq.c.max_date
-                )
-            )
+            .join(ranked, and_(ranked.c.stock_id == Stock.id, ranked.c.row_number == 1))
             .where(Stock.is_deleted == False)
+            .order_by(desc(change) if direction == "up" else change, Stock.ticker)
+            .limit(limit)
         )
 
-        results = self.db.execute(stmt).all()
-
-        # Calculate changes and filter
         movers = []
-        for stock, current_score, historical_score in results:
-            change = float(current_score.total_score - historical_score.total_score)
-
+        for row in self.db.execute(stmt):
+            change = float(row.score_change)
             movers.append({
-                "ticker": stock.ticker,
-                "name": stock.name,
-                "sector": stock.sector,
-                "current_score": float(current_score.total_score),
-                "historical_score": float(historical_score.total_score),
+                "ticker": row.ticker,
+                "name": row.name,
+                "sector": row.sector,
+                "current_score": float(row.total_score),
+                "historical_score": float(row.historical_score),
                 "score_change": change,
-                "percent_change": round((change / float(historical_score.total_score) * 100), 2) if historical_score.total_score else 0,
-                "current_signal": current_score.signal.value,
-                "historical_signal": historical_score.signal.value,
-                "signal_changed": current_score.signal != historical_score.signal
+                "percent_change": round((change / float(row.historical_score) * 100), 2) if row.historical_score else 0,
+                "current_signal": row.signal.value,
+                "historical_signal": row.historical_signal.value,
+                "signal_changed": row.signal != row.historical_signal
             })
 
-        # Sort by score change
-        movers.sort(key=lambda x: x["score_change"], reverse=(direction == "up"))
-
-        return movers[:limit]
+        return movers
 
     def get_signal_changes(
         self,
-        days: int = 7
+        days: int = 7,
+        limit: int = 100,
+        offset: int = 0
     ) -> List[Dict[str, Any]]:
         """
-        Get stocks that had signal changes (e.g., HOLD -> BUY).
+        Get signal changes (e.g., HOLD -> BUY) recorded in the last N days.
+
+        Reads signal_transitions with a range scan on transition_date, newest
+        first; limit/offset page through longer periods.
 
         Args:
             days: Number of days to look back
+            limit: Maximum number of transitions to return
+            offset: Number of transitions to skip
 
         Returns:
-            List of stocks with signal changes
+            List of signal transitions
         """
         past_date = date.today() - timedelta(days=days)
 
-        # Subquery to get the latest historical snapshot for each stock
-        subq = (
-            select(
-                StockScoreHistory.stock_id,
-                func.max(StockScoreHistory.snapshot_date).label('max_date')
-            )
-            .where(StockScoreHistory.snapshot_date <= past_date)
-            .group_by(StockScoreHistory.stock_id)
-            .subquery()
-        )
-
-        # Find stocks where signal changed
         stmt = (
             select(
-                Stock,
-                StockScore,
-                StockScoreHistory
-            )
-            .join(StockScore, Stock.id == StockScore.stock_id)
-            .join(subq, Stock.id == subq.c.stock_id)
-            .join(
-                StockScoreHistory,
-                and_(
-                    StockScoreHistory.stock_id == subq.c.stock_id,
-                    StockScoreHistory.snapshot_date == subq.c.max_date
-                )
+                Stock.ticker,
+                Stock.name,
+                Stock.sector,
+                SignalTransition.transition_date,
+                SignalTransition.previous_signal,
+                SignalTransition.new_signal,
+                SignalTransition.previous_score,
+                SignalTransition.new_score,
             )
+            .join(Stock, Stock.id == SignalTransition.stock_id)
             .where(
                 and_(
-                    Stock.is_deleted == False,
-                    StockScore.signal != StockScoreHistory.signal
+                    SignalTransition.transition_date >= past_date,
+                    Stock.is_deleted == False
                 )
             )
+            .order_by(desc(SignalTransition.transition_date), Stock.ticker)
+            .limit(limit)
+            .offset(offset)
         )
 
-        results = self.db.execute(stmt).all()
-
-        changes = []
-        for stock, current_score, historical_score in results:
-            score_change = float(current_score.total_score - historical_score.total_score)
-
-            changes.append({
-                "ticker": stock.ticker,
-                "name": stock.name,
-                "sector": stock.sector,
-                "previous_signal": historical_score.signal.value,
-                "current_signal": current_score.signal.value,
-                "score_change": score_change,
-                "current_score": float(current_score.total_score),
-                "historical_score": float(historical_score.total_score),
-                "change_date": historical_score.snapshot_date.isoformat()
-            })
-
-        return changes
+        return [
+            {
+                "ticker": row.ticker,
+                "name": row.name,
+                "sector": row.sector,
+                "previous_signal": row.previous_signal.value,
+                "current_signal": row.new_signal.value,
+                "score_change": float(row.new_score - row.previous_score),
+                "current_score": float(row.new_score),
+                "historical_score": float(row.previous_score),
+                "change_date": row.transition_date.isoformat()
+            }
+            for row in self.db.execute(stmt)
+        ]
 
-    def cleanup_old_snapshots(self, keep_days: int = 90) -> int:
+    def compact_history(self, today: Optional[date] = None) -> Dict[str, int]:
         """
-        Remove snapshots older than specified days.
+        Compact score history into retention tiers.
+
+        - With SCORE_HISTORY_CHANGE_ONLY, drops rows identical to the stock's
+          previous row (converting existing daily history to change-only).
+        - Rolls complete weeks older than SCORE_HISTORY_DAILY_DAYS up to the
+          last row per stock and week ("weekly").
+        - Rolls complete months older than SCORE_HISTORY_WEEKLY_DAYS up to the
+          last row per stock and month ("monthly").
+
+        Forward-filled reads (get_score_history) stay valid at each tier's
+        resolution.
 
         Args:
-            keep_days: Number of days to keep
+            today: Reference date (defaults to today)
 
         Returns:
-            Number of snapshots deleted
+            Dict with rows removed as unchanged and rows removed by each rollup
         """
-        cutoff_date = date.today() - timedelta(days=keep_days)
+        if today is None:
+            today = date.today()
 
-        result = self.db.execute(
-            select(func.count(StockScoreHistory.id))
-            .where(StockScoreHistory.snapshot_date < cutoff_date)
-        )
-        count = result.scalar()
+        unchanged = self._delete_unchanged_rows() if settings.SCORE_HISTORY_CHANGE_ONLY else 0
+
+        weekly_before = _week_start(today - timedelta(days=settings.SCORE_HISTORY_DAILY_DAYS))
+        weekly = self._roll_up(weekly_before, ("daily", "weekly"), "weekly", _week_start)
 
-        # Delete old snapshots
-        self.db.execute(
-            StockScoreHistory.__table__.delete().where(
-                StockScoreHistory.snapshot_date < cutoff_date
+        monthly_before = _month_start(today - timedelta(days=settings.SCORE_HISTORY_WEEKLY_DAYS))
+        monthly = self._roll_up(monthly_before, ("daily", "weekly", "monthly"), "monthly", _month_start)
+
+        self.db.commit()
+        return {"unchanged_removed": unchanged, "weekly_removed": weekly, "monthly_removed": monthly}
+
+    def _delete_unchanged_rows(self) -> int:
+        """Delete history rows whose values equal the stock's previous row (one statement)."""
+        history = StockScoreHistory.__table__
+        previous = history.alias("previous")
+        earlier = history.alias("earlier")
+
+        previous_date = (
+            select(func.max(earlier.c.snapshot_date))
+            .where(and_(earlier.c.stock_id == history.c.stock_id, earlier.c.snapshot_date < history.c.snapshot_date))
+            .correlate_except(earlier)
+            .scalar_subquery()
+        )
+        same_as_previous = exists().where(
+            and_(
+                previous.c.stock_id == history.c.stock_id,
+                previous.c.snapshot_date == previous_date,
+                *(previous.c[name] == history.c[name] for name in SNAPSHOT_COLUMNS),
             )
         )
-        self.db.commit()
+        return self.db.execute(history.delete().where(same_as_previous)).rowcount
+
+    def _roll_up(self, before: date, tiers, resolution: str, period_start) -> int:
+        """
+        Keep only the last row per stock and period among rows dated before `before`.
+
+        Args:
+            before: Only rows dated before this (a period boundary)
+            tiers: Resolutions of the rows to roll up
+            resolution: Resolution of the kept rows
+            period_start: Function mapping a date to the start of its period
+
+        Returns:
+            Number of rows removed
+        """
+        rows = self.db.execute(
+            select(StockScoreHistory.id, StockScoreHistory.stock_id,
+                   StockScoreHistory.snapshot_date, StockScoreHistory.resolution)
+            .where(and_(StockScoreHistory.snapshot_date < before, StockScoreHistory.resolution.in_(tiers)))
+            .order_by(StockScoreHistory.stock_id, StockScoreHistory.snapshot_date)
+            .execution_options(yield_per=COMPACTION_BATCH_SIZE)
+        )
 
-        return count or 0
+        removed, relabelled = [], []
+        last_key, last = None, None
+        for row in rows:
+            key = (row.stock_id, period_start(row.snapshot_date))
+            if last is not None:
+                if key == last_key:
+                    removed.append(last.id)
+                elif last.resolution != resolution:
+                    relabelled.append(last.id)
+            last_key, last = key, row
+        if last is not None and last.resolution != resolution:
+            relabelled.append(last.id)
+
+        history = StockScoreHistory.__table__
+        for start in range(0, len(removed), COMPACTION_BATCH_SIZE):
+            batch = removed[start:start + COMPACTION_BATCH_SIZE]
+            self.db.execute(history.delete().where(history.c.id.in_(batch)))
+        for start in range(0, len(relabelled), COMPACTION_BATCH_SIZE):
+            batch = relabelled[start:start + COMPACTION_BATCH_SIZE]
+            self.db.execute(history.update().where(history.c.id.in_(batch)).values(resolution=resolution))
+        return len(removed)
+
+
+def _week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def forward_fill(records: Sequence[StockScoreHistory], start: date, end: date) -> Iterator[Tuple[date, StockScoreHistory]]:
+    """
+    Expand sparse history rows to one (date, row in effect) pair per weekday.
+
+    Args:
+        records: One stock's history rows in ascending date order
+        start: First date to emit
+        end: Last date to emit
+
+    Yields:
+        (date, latest row dated on or before it); weekend dates only when a
+        row was stored on that date
+    """
+    index = 0
+    current = None
+    day = start
+    while day <= end:
+        while index < len(records) and records[index].snapshot_date <= day:
+            current = records[index]
+            index += 1
+        if current is not None and (day.weekday() < 5 or current.snapshot_date == day):
+            yield day, current
+        day += timedelta(days=1)
+
+
+def forward_fill_on(records: Sequence[Any], days: Sequence[date]) -> List[Optional[Any]]:
+    """
+    Row in effect on each of the given dates.
+
+    Args:
+        records: One stock's history rows in ascending date order
+        days: Dates in ascending order
+
+    Returns:
+        For each date, the latest row dated on or before it (None if none)
+    """
+    index = 0
+    current = None
+    in_effect = []
+    for day in days:
+        while index < len(records) and records[index].snapshot_date <= day:
+            current = records[index]
+            index += 1
+        in_effect.append(current)
+    return in_effect
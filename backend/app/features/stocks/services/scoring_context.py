@@ -0,0 +1,259 @@
+"""
+Versioned scoring context shared by the bulk recompute and single-stock scoring.
+
+A scoring context holds everything ScoringService needs besides the stock's
+own fundamentals: the global ROIC percentile thresholds and the sector
+benchmarks. It is built once per recompute, stored in the
+scoring_context_snapshots table and cached in process memory, so a
+single-stock score breakdown no longer loads the whole universe.
+
+Readers check the latest version id with one indexed query and only reload
+the snapshot when another process (e.g. the Celery worker) has published a
+newer one. Swapping the in-memory context is a single reference assignment,
+so concurrent readers always see one complete version.
+"""
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.features.stocks.models import Stock, StockFundamental, ScoringContextSnapshot
+from app.features.stocks.services.scoring_service import ScoringService, SectorBenchmarks
+
+logger = logging.getLogger(__name__)
+
+# Older snapshots beyond this many versions are pruned when a new one is published.
+KEEP_CONTEXT_VERSIONS = 10
+
+
+@dataclass(frozen=True)
+class ScoringContext:
+    """Immutable scoring inputs for one recompute."""
+    id: UUID
+    version: int
+    roic_percentiles: Tuple[float, float, float, float]  # (p90, p75, p50, p25)
+    sector_benchmarks: Dict[str, SectorBenchmarks] = field(default_factory=dict)
+    stock_count: int = 0
+    created_at: Optional[datetime] = None
+
+    def scoring_service(self) -> ScoringService:
+        """ScoringService using this context's thresholds and benchmarks."""
+        return ScoringService.from_percentiles(self.roic_percentiles, self.sector_benchmarks)
+
+
+# Sector benchmark fields compared when checking for drift
+_BENCHMARK_FIELDS = (
+    "avg_pe",
+    "avg_ev_ebitda",
+    "avg_roic",
+    "avg_roe",
+    "avg_debt_equity",
+    "avg_gross_margin",
+    "avg_operating_margin",
+    "avg_net_margin",
+)
+
+_current_context: Optional[ScoringContext] = None
+_context_lock = threading.Lock()
+
+
+def _from_record(record: ScoringContextSnapshot) -> ScoringContext:
+    """Convert a stored snapshot to a ScoringContext."""
+    return ScoringContext(
+        id=record.id,
+        version=record.version,
+        roic_percentiles=(record.roic_p90, record.roic_p75, record.roic_p50, record.roic_p25),
+        sector_benchmarks={
+            sector: SectorBenchmarks(**values)
+            for sector, values in (record.sector_benchmarks or {}).items()
+        },
+        stock_count=record.stock_count,
+        created_at=record.created_at,
+    )
+
+
+def _swap(context: ScoringContext) -> ScoringContext:
+    """Atomically replace the in-process context."""
+    global _current_context
+    with _context_lock:
+        _current_context = context
+    return context
+
+
+def stage_scoring_context(
+    db: Session,
+    roic_percentiles: Tuple[float, float, float, float],
+    sector_benchmarks: Dict[str, SectorBenchmarks],
+    stock_count: int,
+    fundamentals_watermark: Optional[datetime] = None,
+) -> ScoringContextSnapshot:
+    """
+    Add a new context version to the session without committing.
+
+    The caller commits it together with the scores computed from it, so the
+    stored scores and the published context always change in one transaction.
+    Call publish_scoring_context() after the commit.
+
+    Args:
+        db: Database session
+        roic_percentiles: (p90, p75, p50, p25) ROIC thresholds
+        sector_benchmarks: Sector benchmarks used for scoring
+        stock_count: Number of stocks in the universe
+        fundamentals_watermark: Latest fundamentals, sector or indicator-state
+                                update covered by this recompute (used by
+                                incremental rescoring)
+
+    Returns:
+        The staged ScoringContextSnapshot row
+    """
+    latest = db.query(func.max(ScoringContextSnapshot.version)).scalar() or 0
+    record = ScoringContextSnapshot(
+        version=latest + 1,
+        roic_p90=roic_percentiles[0],
+        roic_p75=roic_percentiles[1],
+        roic_p50=roic_percentiles[2],
+        roic_p25=roic_percentiles[3],
+        sector_benchmarks={sector: asdict(bench) for sector, bench in sector_benchmarks.items()},
+        stock_count=stock_count,
+        fundamentals_watermark=fundamentals_watermark,
+    )
+    db.add(record)
+
+    stale = latest + 1 - KEEP_CONTEXT_VERSIONS
+    if stale > 0:
+        db.query(ScoringContextSnapshot).filter(
+            ScoringContextSnapshot.version <= stale
+        ).delete(synchronize_session=False)
+
+    return record
+
+
+def publish_scoring_context(record: ScoringContextSnapshot) -> ScoringContext:
+    """
+    Make a committed snapshot the current in-process context.
+
+    Args:
+        record: Committed ScoringContextSnapshot
+
+    Returns:
+        The published ScoringContext
+    """
+    context = _swap(_from_record(record))
+    logger.info(f"Published scoring context v{context.version} ({context.stock_count} stocks)")
+    return context
+
+
+def build_scoring_context(db: Session) -> ScoringContext:
+    """
+    Build, store and publish a context from the current universe.
+
+    Uses the cached sector benchmarks and a single-column ROIC query.
+
+    Args:
+        db: Database session
+
+    Returns:
+        The new ScoringContext
+    """
+    from app.features.stocks.services.sector_service import SectorService
+
+    sector_benchmarks = SectorService(db).get_cached_sector_benchmarks()
+    roic_values: List[float] = [
+        float(roic)
+        for (roic,) in db.query(StockFundamental.roic)
+        .join(Stock, Stock.id == StockFundamental.stock_id)
+        .filter(StockFundamental.roic > 0)
+        .all()
+    ]
+    stock_count = (
+        db.query(func.count(StockFundamental.id))
+        .join(Stock, Stock.id == StockFundamental.stock_id)
+        .scalar()
+    )
+
+    percentiles = ScoringService.from_roic_values(roic_values, sector_benchmarks).roic_percentiles
+    record = stage_scoring_context(db, percentiles, sector_benchmarks, stock_count)
+    db.commit()
+    return publish_scoring_context(record)
+
+
+def get_scoring_context(db: Session) -> ScoringContext:
+    """
+    Get the current scoring context.
+
+    O(1) in universe size: one indexed lookup of the latest version id, plus
+    one row load when another process published a newer version. If no
+    context has ever been stored, one is built from the current universe.
+
+    Args:
+        db: Database session
+
+    Returns:
+        The latest ScoringContext
+    """
+    latest = (
+        db.query(ScoringContextSnapshot.id)
+        .order_by(ScoringContextSnapshot.version.desc())
+        .limit(1)
+        .scalar()
+    )
+    if latest is None:
+        return build_scoring_context(db)
+
+    current = _current_context
+    if current is not None and current.id == latest:
+        return current
+
+    record = db.query(ScoringContextSnapshot).filter(ScoringContextSnapshot.id == latest).one()
+    return _swap(_from_record(record))
+
+
+def _drifted(old: Optional[float], new: Optional[float], tolerance: float) -> bool:
+    """True if new differs from old by more than tolerance (relative to old)."""
+    if old is None or new is None:
+        return old is not new
+    return abs(new - old) > tolerance * max(abs(old), 1e-9)
+
+
+def find_context_drift(
+    context: ScoringContext,
+    roic_percentiles: Tuple[float, float, float, float],
+    sector_benchmarks: Dict[str, SectorBenchmarks],
+    tolerance: float,
+) -> Optional[str]:
+    """
+    Check whether fresh scoring inputs drifted away from a stored context.
+
+    Args:
+        context: Context the current scores were computed with
+        roic_percentiles: Freshly computed (p90, p75, p50, p25) ROIC thresholds
+        sector_benchmarks: Freshly computed sector benchmarks
+        tolerance: Allowed relative change (0.05 = 5%)
+
+    Returns:
+        Human-readable reason for the first drift found, or None if within tolerance
+    """
+    labels = ("p90", "p75", "p50", "p25")
+    for label, old, new in zip(labels, context.roic_percentiles, roic_percentiles):
+        if _drifted(old, new, tolerance):
+            return f"ROIC {label} moved from {old:.2f} to {new:.2f}"
+
+    old_sectors = set(context.sector_benchmarks)
+    new_sectors = set(sector_benchmarks)
+    if old_sectors != new_sectors:
+        changed = sorted(old_sectors ^ new_sectors)
+        return f"sector set changed ({', '.join(changed)})"
+
+    for sector, new_bench in sector_benchmarks.items():
+        old_bench = context.sector_benchmarks[sector]
+        for name in _BENCHMARK_FIELDS:
+            old, new = getattr(old_bench, name), getattr(new_bench, name)
+            if _drifted(old, new, tolerance):
+                return f"{sector} {name} drifted beyond {tolerance:.0%}"
+
+    return None
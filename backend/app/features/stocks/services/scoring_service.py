@@ -12,27 +12,85 @@ See /backend/SCORING_METHODOLOGY.md for detailed methodology and validation.
 IMPORTANT: This is for educational/research purposes only. Not financial advice.
 """
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from functools import cached_property
 import statistics
 
+import numpy as np
+
 from app.features.stocks.models import StockFundamental, Signal
 from app.features.stocks.services.momentum_service import get_momentum_service
+from app.features.stocks.services.scoring_tables import (
+    CURRENT_RATIO,
+    CURRENT_RATIO_FINANCIAL,
+    DEBT_EQUITY_FINANCIAL,
+    DEBT_EQUITY_MISSING,
+    DEBT_EQUITY_STANDARD,
+    DEBT_EQUITY_UTILITY,
+    EV_EBITDA_MISSING,
+    EV_EBITDA_VS_SECTOR,
+    FCF_YIELD_HEALTH,
+    FCF_YIELD_QUALITY,
+    INTEREST_COVERAGE,
+    MOMENTUM_NEUTRAL,
+    NET_MARGIN,
+    PB,
+    PE_VS_SECTOR,
+    PEG,
+    PEG_HIGH_PE_CAP,
+    PEG_HIGH_PE_THRESHOLD,
+    ROE_MISSING,
+    ROE_VS_SECTOR,
+    ThresholdTable,
+    ladder,
+    roic_percentile_table,
+)
+
+
+@dataclass
+class ScoreExplanation:
+    """Human-readable explanation of a score."""
+    strengths: List[str]
+    weaknesses: List[str]
+    reasoning: str
 
 
 @dataclass
 class ScoreBreakdown:
-    """Detailed breakdown of a stock's score."""
+    """
+    Detailed breakdown of a stock's score.
+
+    strengths, weaknesses and reasoning are generated on first access, so
+    callers that only need the numbers never build the explanation text.
+    """
     total_score: float
     value_score: float
     quality_score: float
     momentum_score: float
     health_score: float
     signal: Signal
-    strengths: List[str]
-    weaknesses: List[str]
-    reasoning: str
     percentile: Optional[int] = None  # Percentile vs all stocks (0-100)
+    explain: Optional[Callable[[], ScoreExplanation]] = field(default=None, repr=False, compare=False)
+
+    @cached_property
+    def explanation(self) -> ScoreExplanation:
+        """Explanation text, generated once on first access."""
+        if self.explain is None:
+            return ScoreExplanation(strengths=[], weaknesses=[], reasoning="")
+        return self.explain()
+
+    @property
+    def strengths(self) -> List[str]:
+        return self.explanation.strengths
+
+    @property
+    def weaknesses(self) -> List[str]:
+        return self.explanation.weaknesses
+
+    @property
+    def reasoning(self) -> str:
+        return self.explanation.reasoning
 
 
 @dataclass
@@ -50,6 +108,97 @@ class SectorBenchmarks:
     stock_count: int
 
 
+# Fundamental metrics read by the scoring engine; one column each in score_batch().
+SCORING_METRICS: Tuple[str, ...] = (
+    "pe_ratio",
+    "ev_ebitda",
+    "peg_ratio",
+    "pb_ratio",
+    "roic",
+    "roe",
+    "net_margin",
+    "fcf_yield",
+    "debt_equity",
+    "current_ratio",
+    "interest_coverage",
+)
+
+FINANCIAL_SECTORS = ("Financial Services", "Banks")
+UTILITY_SECTORS = ("Utilities",)
+
+# Signal order used for the integer codes returned by score_batch().
+SIGNAL_ORDER: Tuple[Signal, ...] = (
+    Signal.STRONG_BUY,
+    Signal.BUY,
+    Signal.HOLD,
+    Signal.SELL,
+    Signal.STRONG_SELL,
+)
+
+
+@dataclass
+class BatchScores:
+    """Component scores and signals for a whole universe, one array entry per stock."""
+    total_score: np.ndarray
+    value_score: np.ndarray
+    quality_score: np.ndarray
+    momentum_score: np.ndarray
+    health_score: np.ndarray
+    signal_codes: np.ndarray  # Index into SIGNAL_ORDER
+
+    def __len__(self) -> int:
+        return len(self.total_score)
+
+    def signal(self, i: int) -> Signal:
+        """Signal for row i."""
+        return SIGNAL_ORDER[self.signal_codes[i]]
+
+
+def fundamentals_to_columns(fundamentals: Sequence[StockFundamental]) -> Dict[str, np.ndarray]:
+    """
+    Convert fundamentals rows to float64 columns (NaN for missing) for score_batch().
+
+    Args:
+        fundamentals: StockFundamental rows (or any objects with the metric attributes)
+
+    Returns:
+        Dictionary mapping each SCORING_METRICS name to a float64 array
+    """
+    return {
+        metric: np.array([getattr(f, metric) for f in fundamentals], dtype=float)
+        for metric in SCORING_METRICS
+    }
+
+
+def _as_float(value: Optional[Decimal]) -> Optional[float]:
+    """Convert a Decimal metric to float, keeping None for missing."""
+    return float(value) if value is not None else None
+
+
+def encode_sectors(sectors: Sequence[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Encode sector names as integer codes for score_batch().
+
+    Args:
+        sectors: Sector name per stock (None if unknown)
+
+    Returns:
+        Tuple of (codes, names) where codes[i] indexes names, or is -1 for no sector
+    """
+    names: List[str] = []
+    index: Dict[str, int] = {}
+    codes = np.full(len(sectors), -1, dtype=np.int64)
+    for i, sector in enumerate(sectors):
+        if not sector:
+            continue
+        code = index.get(sector)
+        if code is None:
+            code = index[sector] = len(names)
+            names.append(sector)
+        codes[i] = code
+    return codes, names
+
+
 class ScoringService:
     """Service for calculating stock scores based on fundamental metrics."""
 
@@ -65,6 +214,13 @@ class ScoringService:
     SIGNAL_HOLD_THRESHOLD = 50.0
     SIGNAL_SELL_THRESHOLD = 25.0
 
+    # Total score -> index into SIGNAL_ORDER
+    SIGNAL_TABLE: ThresholdTable = ladder(
+        "Signal",
+        [SIGNAL_SELL_THRESHOLD, SIGNAL_HOLD_THRESHOLD, SIGNAL_BUY_THRESHOLD, SIGNAL_STRONG_BUY_THRESHOLD],
+        [4, 3, 2, 1, 0],
+    )
+
     def __init__(self, all_stocks_fundamentals: List[StockFundamental], sector_benchmarks: Dict[str, SectorBenchmarks]):
         """
         Initialize scoring service.
@@ -77,21 +233,90 @@ class ScoringService:
         self.sector_benchmarks = sector_benchmarks
         self._calculate_global_percentiles()
 
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Dict[str, np.ndarray],
+        sector_benchmarks: Dict[str, SectorBenchmarks],
+    ) -> "ScoringService":
+        """
+        Build a scoring service from columnar fundamentals instead of ORM rows.
+
+        Args:
+            columns: Metric columns as produced by fundamentals_to_columns()
+            sector_benchmarks: Sector average metrics for comparison
+
+        Returns:
+            ScoringService with the same ROIC percentiles as the row-based constructor
+        """
+        roic = columns["roic"]
+        return cls.from_roic_values(roic[roic > 0].tolist(), sector_benchmarks)
+
+    @classmethod
+    def from_roic_values(
+        cls,
+        roic_values: List[float],
+        sector_benchmarks: Dict[str, SectorBenchmarks],
+    ) -> "ScoringService":
+        """
+        Build a scoring service from the positive ROIC values of the universe.
+
+        Args:
+            roic_values: Positive ROIC values of all stocks (any order)
+            sector_benchmarks: Sector average metrics for comparison
+        """
+        service = cls.__new__(cls)
+        service.all_stocks = []
+        service.sector_benchmarks = sector_benchmarks
+        service._set_roic_percentiles(roic_values)
+        return service
+
+    @classmethod
+    def from_percentiles(
+        cls,
+        roic_percentiles: Tuple[float, float, float, float],
+        sector_benchmarks: Dict[str, SectorBenchmarks],
+    ) -> "ScoringService":
+        """
+        Build a scoring service from precomputed ROIC thresholds.
+
+        Args:
+            roic_percentiles: (p90, p75, p50, p25) ROIC thresholds
+            sector_benchmarks: Sector average metrics for comparison
+        """
+        service = cls.__new__(cls)
+        service.all_stocks = []
+        service.sector_benchmarks = sector_benchmarks
+        service._set_roic_thresholds(*roic_percentiles)
+        return service
+
+    @property
+    def roic_percentiles(self) -> Tuple[float, float, float, float]:
+        """ROIC thresholds as (p90, p75, p50, p25)."""
+        return (self.roic_p90, self.roic_p75, self.roic_p50, self.roic_p25)
+
     def _calculate_global_percentiles(self):
         """Calculate percentile thresholds for ROIC across all stocks."""
         roic_values = [float(s.roic) for s in self.all_stocks if s.roic is not None and s.roic > 0]
+        self._set_roic_percentiles(roic_values)
 
+    def _set_roic_percentiles(self, roic_values: List[float]):
+        """Set ROIC percentile thresholds from the positive ROIC values of the universe."""
         if not roic_values:
             # Fallback if no data
-            self.roic_p90 = 25.0
-            self.roic_p75 = 18.0
-            self.roic_p50 = 12.0
-            self.roic_p25 = 6.0
+            self._set_roic_thresholds(25.0, 18.0, 12.0, 6.0)
         else:
-            self.roic_p90 = statistics.quantiles(roic_values, n=10)[8] if len(roic_values) >= 10 else max(roic_values)
-            self.roic_p75 = statistics.quantiles(roic_values, n=4)[2] if len(roic_values) >= 4 else statistics.median(roic_values)
-            self.roic_p50 = statistics.median(roic_values)
-            self.roic_p25 = statistics.quantiles(roic_values, n=4)[0] if len(roic_values) >= 4 else min(roic_values)
+            self._set_roic_thresholds(
+                statistics.quantiles(roic_values, n=10)[8] if len(roic_values) >= 10 else max(roic_values),
+                statistics.quantiles(roic_values, n=4)[2] if len(roic_values) >= 4 else statistics.median(roic_values),
+                statistics.median(roic_values),
+                statistics.quantiles(roic_values, n=4)[0] if len(roic_values) >= 4 else min(roic_values),
+            )
+
+    def _set_roic_thresholds(self, p90: float, p75: float, p50: float, p25: float):
+        """Set ROIC thresholds and compile the matching percentile table."""
+        self.roic_p90, self.roic_p75, self.roic_p50, self.roic_p25 = p90, p75, p50, p25
+        self.roic_table = roic_percentile_table(p25, p50, p75, p90)
 
     def calculate_score(
         self,
@@ -109,15 +334,16 @@ class ScoringService:
                                 If None, defaults to neutral momentum score.
 
         Returns:
-            ScoreBreakdown with total score, component scores, and explanations
+            ScoreBreakdown with total score, component scores, and explanations.
+            The explanation text is only generated when first accessed.
         """
         # Get sector benchmarks if available
         sector_bench = self.sector_benchmarks.get(sector) if sector else None
 
-        # Calculate component scores
-        value_score, value_details = self._calculate_value_score(fundamentals, sector_bench)
-        quality_score, quality_details = self._calculate_quality_score(fundamentals, sector_bench)
-        health_score, health_details = self._calculate_health_score(fundamentals, sector)
+        # Calculate component scores (numbers only)
+        value_score = self._value_points(fundamentals, sector_bench)
+        quality_score = self._quality_points(fundamentals, sector_bench)
+        health_score = self._health_points(fundamentals, sector)
 
         # Momentum score - use real calculation if indicators available, otherwise neutral
         if technical_indicators:
@@ -130,7 +356,7 @@ class ScoringService:
             }
         else:
             # Default to neutral if no price data available yet
-            momentum_score = 12.5
+            momentum_score = MOMENTUM_NEUTRAL
             momentum_details = {
                 "score": momentum_score,
                 "components": [],
@@ -143,6 +369,39 @@ class ScoringService:
         # Determine signal
         signal = self._calculate_signal(total_score)
 
+        def explain() -> ScoreExplanation:
+            return self._explain_score(
+                fundamentals, sector, sector_bench, momentum_details,
+                total_score, signal, value_score, quality_score, health_score,
+            )
+
+        return ScoreBreakdown(
+            total_score=round(total_score, 2),
+            value_score=round(value_score, 2),
+            quality_score=round(quality_score, 2),
+            momentum_score=round(momentum_score, 2),
+            health_score=round(health_score, 2),
+            signal=signal,
+            explain=explain,
+        )
+
+    def _explain_score(
+        self,
+        fundamentals: StockFundamental,
+        sector: Optional[str],
+        sector_bench: Optional[SectorBenchmarks],
+        momentum_details: Dict,
+        total_score: float,
+        signal: Signal,
+        value_score: float,
+        quality_score: float,
+        health_score: float,
+    ) -> ScoreExplanation:
+        """Build strengths, weaknesses and reasoning for a scored stock."""
+        _, value_details = self._calculate_value_score(fundamentals, sector_bench)
+        _, quality_details = self._calculate_quality_score(fundamentals, sector_bench)
+        _, health_details = self._calculate_health_score(fundamentals, sector)
+
         # Generate strengths and weaknesses
         strengths, weaknesses = self._analyze_strengths_weaknesses(
             value_details, quality_details, health_details, momentum_details
@@ -153,18 +412,176 @@ class ScoringService:
             total_score, signal, value_score, quality_score, health_score, strengths, weaknesses
         )
 
-        return ScoreBreakdown(
-            total_score=round(total_score, 2),
-            value_score=round(value_score, 2),
-            quality_score=round(quality_score, 2),
-            momentum_score=round(momentum_score, 2),
-            health_score=round(health_score, 2),
-            signal=signal,
-            strengths=strengths,
-            weaknesses=weaknesses,
-            reasoning=reasoning,
+        return ScoreExplanation(strengths=strengths, weaknesses=weaknesses, reasoning=reasoning)
+
+    def _value_points(self, f: StockFundamental, sector_bench: Optional[SectorBenchmarks]) -> float:
+        """Value Score (0-25) without the component details."""
+        return (
+            0.0
+            + self._score_pe_ratio(f.pe_ratio, sector_bench)
+            + self._score_ev_ebitda(f.ev_ebitda, sector_bench)
+            + self._score_peg_ratio(f.peg_ratio, f.pe_ratio)
+            + self._score_pb_ratio(f.pb_ratio, sector_bench)
+        )
+
+    def _quality_points(self, f: StockFundamental, sector_bench: Optional[SectorBenchmarks]) -> float:
+        """Quality Score (0-25) without the component details."""
+        return (
+            0.0
+            + self._score_roic_percentile(f.roic)
+            + self._score_roe(f.roe, sector_bench)
+            + self._score_margins(f.net_margin)
+            + self._score_fcf_yield(f.fcf_yield)
         )
 
+    def _health_points(self, f: StockFundamental, sector: Optional[str]) -> float:
+        """Financial Health Score (0-25) without the component details."""
+        return (
+            0.0
+            + self._score_debt_equity(f.debt_equity, sector)
+            + self._score_current_ratio(f.current_ratio, sector)
+            + self._score_interest_coverage(f.interest_coverage)
+            + self._score_fcf_for_health(f.fcf_yield)
+        )
+
+    def score_batch(
+        self,
+        columns: Dict[str, np.ndarray],
+        sector_codes: np.ndarray,
+        sectors: Sequence[str],
+        momentum_scores: Optional[np.ndarray] = None,
+    ) -> BatchScores:
+        """
+        Score a whole universe in one vectorized pass.
+
+        Produces exactly the same component scores and signals as calling
+        calculate_score() once per stock, without the per-stock branching and
+        explanation text.
+
+        Args:
+            columns: Metric columns as produced by fundamentals_to_columns()
+            sector_codes: Sector code per stock as produced by encode_sectors() (-1 = none)
+            sectors: Sector names indexed by sector_codes
+            momentum_scores: Momentum score per stock. If None, every stock gets
+                             the neutral 12.5 used when no price data is available.
+
+        Returns:
+            BatchScores with one entry per stock
+        """
+        sector_codes = np.asarray(sector_codes, dtype=np.int64)
+        n = len(sector_codes)
+
+        pe = columns["pe_ratio"]
+        ev = columns["ev_ebitda"]
+        peg = columns["peg_ratio"]
+        pb = columns["pb_ratio"]
+        roic = columns["roic"]
+        roe = columns["roe"]
+        margin = columns["net_margin"]
+        fcf = columns["fcf_yield"]
+        de = columns["debt_equity"]
+        cr = columns["current_ratio"]
+        cov = columns["interest_coverage"]
+
+        avg_pe = self._sector_lookup(sector_codes, sectors, "avg_pe", 20.0)
+        avg_ev = self._sector_lookup(sector_codes, sectors, "avg_ev_ebitda", 15.0)
+        avg_roe = self._sector_lookup(sector_codes, sectors, "avg_roe", 15.0)
+
+        is_financial = self._sector_mask(sector_codes, sectors, FINANCIAL_SECTORS)
+        is_utility = self._sector_mask(sector_codes, sectors, UTILITY_SECTORS)
+
+        with np.errstate(invalid="ignore"):
+            # Value (0-25)
+            pe_score = np.where(
+                np.isnan(pe) | (pe <= 0),
+                0.0,
+                PE_VS_SECTOR.lookup_array(np.minimum(pe, 100.0) / avg_pe),
+            )
+            ev_score = np.where(
+                np.isnan(ev) | (ev <= 0),
+                EV_EBITDA_MISSING,
+                EV_EBITDA_VS_SECTOR.lookup_array(np.minimum(ev, 100.0) / avg_ev),
+            )
+            peg_score = PEG.lookup_array(peg)
+            peg_score = np.where(
+                ~np.isnan(peg) & (pe > PEG_HIGH_PE_THRESHOLD),
+                np.minimum(PEG_HIGH_PE_CAP, peg_score),
+                peg_score,
+            )
+            pb_score = PB.lookup_array(pb)
+            value_score = 0.0 + pe_score + ev_score + peg_score + pb_score
+
+            # Quality (0-25)
+            roic_score = np.where(
+                np.isnan(roic) | (roic <= 0),
+                0.0,
+                self.roic_table.lookup_array(np.minimum(roic, 200.0)),
+            )
+            roe_score = np.select(
+                [np.isnan(roe), roe <= 0],
+                [ROE_MISSING, 0.0],
+                default=ROE_VS_SECTOR.lookup_array(np.minimum(roe, 200.0) / avg_roe),
+            )
+            margin_score = NET_MARGIN.lookup_array(margin)
+            fcf_score = FCF_YIELD_QUALITY.lookup_array(fcf)
+            quality_score = 0.0 + roic_score + roe_score + margin_score + fcf_score
+
+            # Financial health (0-25)
+            de_score = np.select(
+                [np.isnan(de), de < 0, is_financial, is_utility],
+                [DEBT_EQUITY_MISSING, 0.0, DEBT_EQUITY_FINANCIAL, DEBT_EQUITY_UTILITY.lookup_array(de)],
+                default=DEBT_EQUITY_STANDARD.lookup_array(de),
+            )
+            cr_score = np.where(is_financial, CURRENT_RATIO_FINANCIAL, CURRENT_RATIO.lookup_array(cr))
+            cov_score = INTEREST_COVERAGE.lookup_array(cov)
+            fcf_health_score = FCF_YIELD_HEALTH.lookup_array(fcf)
+            health_score = 0.0 + de_score + cr_score + cov_score + fcf_health_score
+
+        if momentum_scores is None:
+            momentum_scores = np.full(n, MOMENTUM_NEUTRAL)
+        else:
+            momentum_scores = np.asarray(momentum_scores, dtype=float)
+
+        total_score = value_score + quality_score + momentum_scores + health_score
+
+        signal_codes = self.SIGNAL_TABLE.lookup_array(total_score).astype(np.int64)
+
+        return BatchScores(
+            total_score=np.round(total_score, 2),
+            value_score=np.round(value_score, 2),
+            quality_score=np.round(quality_score, 2),
+            momentum_score=np.round(momentum_scores, 2),
+            health_score=np.round(health_score, 2),
+            signal_codes=signal_codes,
+        )
+
+    def _sector_lookup(
+        self,
+        sector_codes: np.ndarray,
+        sectors: Sequence[str],
+        attr: str,
+        default: float,
+    ) -> np.ndarray:
+        """Per-stock sector benchmark value, falling back to default like the per-stock path."""
+        table = np.full(len(sectors) + 1, default)
+        for code, sector in enumerate(sectors):
+            bench = self.sector_benchmarks.get(sector)
+            value = getattr(bench, attr) if bench else None
+            if value:
+                table[code] = float(value)
+        # Code -1 (no sector) picks the trailing default entry
+        return table[sector_codes]
+
+    @staticmethod
+    def _sector_mask(
+        sector_codes: np.ndarray,
+        sectors: Sequence[str],
+        members: Sequence[str],
+    ) -> np.ndarray:
+        """Boolean mask of stocks whose sector is one of members."""
+        table = np.array([sector in members for sector in sectors] + [False], dtype=bool)
+        return table[sector_codes]
+
     def _calculate_value_score(
         self,
         f: StockFundamental,
@@ -210,103 +627,45 @@ class ScoringService:
         if pe is None or pe <= 0:
             return 0.0  # Negative P/E = losses
 
-        pe_val = float(pe)
-
         # Cap outliers
-        if pe_val > 100:
-            pe_val = 100
+        pe_val = min(float(pe), 100.0)
 
         # Get sector average or use reasonable default
         sector_avg = float(sector_bench.avg_pe) if sector_bench and sector_bench.avg_pe else 20.0
 
-        ratio = pe_val / sector_avg
-
-        if ratio < 0.5:  # <50% of sector avg
-            return 8.0
-        elif ratio < 0.75:  # <75% of sector avg
-            return 6.0
-        elif ratio <= 1.25:  # 75-125% of sector avg (fairly valued)
-            return 4.0
-        elif ratio <= 2.0:  # 125-200% of sector avg
-            return 2.0
-        else:  # >200% of sector avg
-            return 0.0
+        return PE_VS_SECTOR.lookup(pe_val / sector_avg)
 
     def _score_ev_ebitda(self, ev_ebitda: Optional[Decimal], sector_bench: Optional[SectorBenchmarks]) -> float:
         """Score EV/EBITDA ratio vs sector average (0-6 points)."""
         if ev_ebitda is None or ev_ebitda <= 0:
-            return 3.0  # Neutral if missing
-
-        ev_val = float(ev_ebitda)
+            return EV_EBITDA_MISSING
 
         # Cap outliers
-        if ev_val > 100:
-            ev_val = 100
+        ev_val = min(float(ev_ebitda), 100.0)
 
         # Get sector average or use reasonable default
         sector_avg = float(sector_bench.avg_ev_ebitda) if sector_bench and sector_bench.avg_ev_ebitda else 15.0
 
-        ratio = ev_val / sector_avg
-
-        if ratio < 0.6:  # <60% of sector avg
-            return 6.0
-        elif ratio < 0.85:  # <85% of sector avg
-            return 4.0
-        elif ratio <= 1.15:  # 85-115% of sector avg
-            return 3.0
-        elif ratio <= 2.0:
-            return 1.0
-        else:
-            return 0.0
+        return EV_EBITDA_VS_SECTOR.lookup(ev_val / sector_avg)
 
     def _score_peg_ratio(self, peg: Optional[Decimal], pe: Optional[Decimal]) -> float:
         """Score PEG ratio (0-6 points). Peter Lynch's favorite metric."""
         if peg is None:
-            return 3.0  # Neutral if missing
+            return PEG.missing
 
-        peg_val = float(peg)
-
-        # Negative growth makes PEG meaningless
-        if peg_val < 0:
-            return 0.0
+        score = PEG.lookup(float(peg))
 
         # Very high P/E even with growth is risky
-        if pe and float(pe) > 50:
-            return min(2.0, self._peg_score_helper(peg_val))
-
-        return self._peg_score_helper(peg_val)
-
-    def _peg_score_helper(self, peg_val: float) -> float:
-        """Helper for PEG scoring."""
-        if peg_val < 0.5:
-            return 6.0  # Steal!
-        elif peg_val < 1.0:
-            return 5.0  # Excellent
-        elif peg_val < 1.5:
-            return 4.0  # Good
-        elif peg_val < 2.0:
-            return 2.0  # Fair
-        else:
-            return 0.0  # Expensive
+        if pe and float(pe) > PEG_HIGH_PE_THRESHOLD:
+            return min(PEG_HIGH_PE_CAP, score)
+
+        return score
 
     def _score_pb_ratio(self, pb: Optional[Decimal], sector_bench: Optional[SectorBenchmarks]) -> float:
         """Score P/B ratio (0-5 points). Context-dependent by sector."""
-        if pb is None:
-            return 2.5  # Neutral if missing
-
-        pb_val = float(pb)
-
-        if pb_val < 0:
-            return 0.0  # Negative book value = problem
-
         # Sector-specific scoring (simplified - could be more granular)
         # For now, use general tech/service scoring
-        if pb_val < 2.0:
-            return 5.0
-        elif pb_val < 5.0:
-            return 3.0
-        else:
-            return 1.0
+        return PB.lookup(_as_float(pb))
 
     def _calculate_quality_score(
         self,
@@ -353,28 +712,13 @@ class ScoringService:
         if roic is None or roic <= 0:
             return 0.0
 
-        roic_val = float(roic)
-
         # Cap outliers
-        if roic_val > 200:
-            roic_val = 200
-
-        # Score based on percentiles
-        if roic_val >= self.roic_p90:  # Top 10%
-            return 10.0
-        elif roic_val >= self.roic_p75:  # Top 25%
-            return 8.0
-        elif roic_val >= self.roic_p50:  # Top 50%
-            return 5.0
-        elif roic_val >= self.roic_p25:  # Bottom 50%
-            return 3.0
-        else:  # Bottom 25%
-            return 0.0
+        return self.roic_table.lookup(min(float(roic), 200.0))
 
     def _score_roe(self, roe: Optional[Decimal], sector_bench: Optional[SectorBenchmarks]) -> float:
         """Score ROE vs sector average (0-7 points)."""
         if roe is None:
-            return 3.5  # Neutral if missing
+            return ROE_MISSING
 
         roe_val = float(roe)
 
@@ -382,63 +726,20 @@ class ScoringService:
             return 0.0  # Losing money
 
         # Cap outliers
-        if roe_val > 200:
-            roe_val = 200
+        roe_val = min(roe_val, 200.0)
 
         # Get sector average or use reasonable default
         sector_avg = float(sector_bench.avg_roe) if sector_bench and sector_bench.avg_roe else 15.0
 
-        ratio = roe_val / sector_avg
-
-        if ratio > 1.5:  # >150% of sector avg
-            return 7.0
-        elif ratio > 1.25:  # >125% of sector avg
-            return 5.0
-        elif ratio >= 0.75:  # 75-125% of sector avg
-            return 3.0
-        elif ratio >= 0.5:
-            return 1.0
-        else:
-            return 0.0
+        return ROE_VS_SECTOR.lookup(roe_val / sector_avg)
 
     def _score_margins(self, net_margin: Optional[Decimal]) -> float:
         """Score net margin level (0-5 points)."""
-        if net_margin is None:
-            return 2.5  # Neutral if missing
-
-        margin_val = float(net_margin)
-
-        if margin_val < 0:
-            return 0.0  # Losing money
-        elif margin_val >= 20:
-            return 5.0  # Excellent
-        elif margin_val >= 15:
-            return 4.0  # Good
-        elif margin_val >= 10:
-            return 3.0  # Decent
-        elif margin_val >= 5:
-            return 2.0  # Thin
-        else:
-            return 1.0  # Concerning
+        return NET_MARGIN.lookup(_as_float(net_margin))
 
     def _score_fcf_yield(self, fcf_yield: Optional[Decimal]) -> float:
         """Score FCF yield (0-3 points). Cash is king."""
-        if fcf_yield is None:
-            return 1.5  # Neutral if missing
-
-        fcf_val = float(fcf_yield)
-
-        if fcf_val < 0:
-            return 0.0  # Burning cash
-
-        if fcf_val >= 8:
-            return 3.0  # Excellent
-        elif fcf_val >= 5:
-            return 2.0  # Good
-        elif fcf_val >= 2:
-            return 1.0  # Okay
-        else:
-            return 0.0  # Weak
+        return FCF_YIELD_QUALITY.lookup(_as_float(fcf_yield))
 
     def _calculate_health_score(
         self,
@@ -483,7 +784,7 @@ class ScoringService:
     def _score_debt_equity(self, de: Optional[Decimal], sector: Optional[str]) -> float:
         """Score Debt/Equity ratio (0-10 points). Lower is better (usually)."""
         if de is None:
-            return 5.0  # Neutral if missing
+            return DEBT_EQUITY_MISSING
 
         de_val = float(de)
 
@@ -491,118 +792,33 @@ class ScoringService:
             return 0.0  # Negative equity = big problem
 
         # Sector adjustments
-        is_financial = sector in ["Financial Services", "Banks"]
-        is_utility = sector in ["Utilities"]
-
-        if is_financial:
+        if sector in FINANCIAL_SECTORS:
             # Banks use debt as product - different scoring
             # Focus more on capital ratios (not implemented in MVP)
-            return 5.0  # Neutral for now
-
-        if is_utility:
-            # Utilities are capital intensive, higher D/E is normal
-            if de_val < 0.5:
-                return 10.0
-            elif de_val < 1.0:
-                return 8.0
-            elif de_val < 2.0:
-                return 5.0
-            elif de_val < 3.0:
-                return 2.0
-            else:
-                return 0.0
-        else:
-            # Standard companies
-            if de_val < 0.3:
-                return 10.0  # Fortress balance sheet
-            elif de_val < 0.5:
-                return 8.0  # Conservative
-            elif de_val < 1.0:
-                return 5.0  # Moderate
-            elif de_val < 2.0:
-                return 2.0  # Concerning
-            else:
-                return 0.0  # Dangerous
+            return DEBT_EQUITY_FINANCIAL
+
+        table = DEBT_EQUITY_UTILITY if sector in UTILITY_SECTORS else DEBT_EQUITY_STANDARD
+        return table.lookup(de_val)
 
     def _score_current_ratio(self, cr: Optional[Decimal], sector: Optional[str]) -> float:
         """Score current ratio (0-6 points). Can they pay short-term bills?"""
         # Banks don't use current ratio
-        if sector in ["Financial Services", "Banks"]:
-            return 3.0  # Neutral for banks
+        if sector in FINANCIAL_SECTORS:
+            return CURRENT_RATIO_FINANCIAL
 
-        if cr is None:
-            return 3.0  # Neutral if missing
-
-        cr_val = float(cr)
-
-        if cr_val < 0:
-            return 0.0  # Problem
-
-        if cr_val >= 2.5:
-            return 6.0  # Very safe
-        elif cr_val >= 2.0:
-            return 5.0  # Safe
-        elif cr_val >= 1.5:
-            return 4.0  # Adequate
-        elif cr_val >= 1.0:
-            return 2.0  # Tight
-        else:
-            return 0.0  # Liquidity crisis
+        return CURRENT_RATIO.lookup(_as_float(cr))
 
     def _score_interest_coverage(self, coverage: Optional[Decimal]) -> float:
         """Score interest coverage (0-5 points). Can they afford debt service?"""
-        if coverage is None:
-            return 2.5  # Neutral if missing
-
-        cov_val = float(coverage)
-
-        if cov_val < 0:
-            return 0.0  # Losing money
-
-        if cov_val >= 10:
-            return 5.0  # No problem
-        elif cov_val >= 5:
-            return 4.0  # Comfortable
-        elif cov_val >= 3:
-            return 3.0  # Okay
-        elif cov_val >= 1.5:
-            return 1.0  # Risky
-        else:
-            return 0.0  # In trouble
+        return INTEREST_COVERAGE.lookup(_as_float(coverage))
 
     def _score_fcf_for_health(self, fcf_yield: Optional[Decimal]) -> float:
         """Score FCF yield for health assessment (0-4 points)."""
-        if fcf_yield is None:
-            return 2.0  # Neutral if missing
-
-        fcf_val = float(fcf_yield)
-
-        if fcf_val < 0:
-            return 0.0  # Burning cash
-
-        if fcf_val >= 8:
-            return 4.0
-        elif fcf_val >= 5:
-            return 3.0
-        elif fcf_val >= 3:
-            return 2.0
-        elif fcf_val >= 1:
-            return 1.0
-        else:
-            return 0.0
+        return FCF_YIELD_HEALTH.lookup(_as_float(fcf_yield))
 
     def _calculate_signal(self, total_score: float) -> Signal:
         """Determine buy/sell signal from total score."""
-        if total_score >= self.SIGNAL_STRONG_BUY_THRESHOLD:
-            return Signal.STRONG_BUY
-        elif total_score >= self.SIGNAL_BUY_THRESHOLD:
-            return Signal.BUY
-        elif total_score >= self.SIGNAL_HOLD_THRESHOLD:
-            return Signal.HOLD
-        elif total_score >= self.SIGNAL_SELL_THRESHOLD:
-            return Signal.SELL
-        else:
-            return Signal.STRONG_SELL
+        return SIGNAL_ORDER[int(self.SIGNAL_TABLE.lookup(total_score))]
 
     def _analyze_strengths_weaknesses(
         self,
@@ -0,0 +1,331 @@
+"""
+Declarative threshold tables for the scoring methodology.
+
+Each score component maps a metric (or a metric-vs-sector ratio) to points
+through an ascending ladder of bands. Tables are compiled once into sorted
+bound arrays and evaluated with a binary search: bisect for a single value
+(per-stock path) and numpy.searchsorted for whole columns (bulk path), so
+both paths share exactly the same rules.
+
+Changing the methodology is a data change here; see SCORING_METHODOLOGY.md
+for the rationale behind each ladder.
+"""
+import math
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Band:
+    """Points for values below `upper` (or up to and including it if inclusive)."""
+    upper: float
+    score: float
+    inclusive: bool = False
+
+
+@dataclass(frozen=True)
+class ThresholdTable:
+    """
+    Ascending ladder of bands compiled for binary-search lookup.
+
+    A value falls in the first band whose upper bound it is below (or equal
+    to, for inclusive bands). Values beyond the last band score `above`;
+    missing values (None/NaN) score `missing`.
+    """
+    name: str
+    bands: Tuple[Band, ...]
+    above: float
+    missing: Optional[float] = None
+    _bounds: List[float] = field(init=False, repr=False, compare=False)
+    _scores: List[float] = field(init=False, repr=False, compare=False)
+    _bounds_array: np.ndarray = field(init=False, repr=False, compare=False)
+    _scores_array: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # "x <= upper" is compiled to "x < nextafter(upper)", so every band is
+        # half-open [previous bound, bound) and one bisect_right finds it.
+        bounds = [
+            math.nextafter(band.upper, math.inf) if band.inclusive else float(band.upper)
+            for band in self.bands
+        ]
+        if any(later < earlier for earlier, later in zip(bounds, bounds[1:])):
+            raise ValueError(f"Threshold table '{self.name}' bounds must be ascending: {bounds}")
+        scores = [float(band.score) for band in self.bands] + [float(self.above)]
+
+        object.__setattr__(self, "_bounds", bounds)
+        object.__setattr__(self, "_scores", scores)
+        object.__setattr__(self, "_bounds_array", np.array(bounds, dtype=float))
+        object.__setattr__(self, "_scores_array", np.array(scores, dtype=float))
+
+    def lookup(self, value: Optional[float]) -> float:
+        """Points for a single value."""
+        if value is None or value != value:  # None or NaN
+            if self.missing is None:
+                raise ValueError(f"Threshold table '{self.name}' has no score for missing values")
+            return self.missing
+        return self._scores[bisect_right(self._bounds, value)]
+
+    def lookup_array(self, values: np.ndarray) -> np.ndarray:
+        """Points for every value of a float array (NaN = missing)."""
+        values = np.asarray(values, dtype=float)
+        scores = self._scores_array[np.searchsorted(self._bounds_array, values, side="right")]
+        if self.missing is not None:
+            scores = np.where(np.isnan(values), self.missing, scores)
+        return scores
+
+
+def ladder(name: str, bounds: Sequence[float], scores: Sequence[float]) -> ThresholdTable:
+    """
+    Build a table of strict "below bound" bands, e.g. ladder("x", [1, 2], [0, 1, 2]).
+
+    Args:
+        name: Table name (for error messages)
+        bounds: Ascending upper bounds
+        scores: One score per band plus the score above the last bound
+    """
+    if len(scores) != len(bounds) + 1:
+        raise ValueError(f"Threshold table '{name}' needs len(bounds) + 1 scores")
+    return ThresholdTable(
+        name=name,
+        bands=tuple(Band(upper, score) for upper, score in zip(bounds, scores)),
+        above=scores[-1],
+    )
+
+
+# ----------------------------------------------------------------------------
+# Value (0-25)
+# ----------------------------------------------------------------------------
+
+# P/E as a ratio of the sector average (P/E capped at 100 first)
+PE_VS_SECTOR = ThresholdTable(
+    name="P/E vs sector",
+    bands=(
+        Band(0.5, 8.0),                   # <50% of sector avg
+        Band(0.75, 6.0),                  # <75% of sector avg
+        Band(1.25, 4.0, inclusive=True),  # 75-125% (fairly valued)
+        Band(2.0, 2.0, inclusive=True),   # 125-200%
+    ),
+    above=0.0,                            # >200% of sector avg
+)
+
+# EV/EBITDA as a ratio of the sector average (EV/EBITDA capped at 100 first)
+EV_EBITDA_VS_SECTOR = ThresholdTable(
+    name="EV/EBITDA vs sector",
+    bands=(
+        Band(0.6, 6.0),
+        Band(0.85, 4.0),
+        Band(1.15, 3.0, inclusive=True),
+        Band(2.0, 1.0, inclusive=True),
+    ),
+    above=0.0,
+)
+EV_EBITDA_MISSING = 3.0  # Neutral if missing or negative
+
+# PEG ratio (Peter Lynch's favorite); negative growth makes it meaningless
+PEG = ThresholdTable(
+    name="PEG",
+    bands=(
+        Band(0.0, 0.0),   # Negative growth
+        Band(0.5, 6.0),   # Steal!
+        Band(1.0, 5.0),   # Excellent
+        Band(1.5, 4.0),   # Good
+        Band(2.0, 2.0),   # Fair
+    ),
+    above=0.0,            # Expensive
+    missing=3.0,
+)
+PEG_HIGH_PE_THRESHOLD = 50.0  # Above this P/E the PEG score is capped...
+PEG_HIGH_PE_CAP = 2.0         # ...at this many points
+
+PB = ThresholdTable(
+    name="P/B",
+    bands=(
+        Band(0.0, 0.0),   # Negative book value = problem
+        Band(2.0, 5.0),
+        Band(5.0, 3.0),
+    ),
+    above=1.0,
+    missing=2.5,
+)
+
+# ----------------------------------------------------------------------------
+# Quality (0-25)
+# ----------------------------------------------------------------------------
+
+ROIC_PERCENTILE_SCORES = (0.0, 3.0, 5.0, 8.0, 10.0)  # Bottom 25% ... top 10%
+
+
+def roic_percentile_table(p25: float, p50: float, p75: float, p90: float) -> ThresholdTable:
+    """ROIC table for the universe's percentile thresholds (ROIC capped at 200 first)."""
+    return ladder("ROIC percentile", [p25, p50, p75, p90], ROIC_PERCENTILE_SCORES)
+
+
+# ROE as a ratio of the sector average (ROE capped at 200 first)
+ROE_VS_SECTOR = ThresholdTable(
+    name="ROE vs sector",
+    bands=(
+        Band(0.5, 0.0),
+        Band(0.75, 1.0),
+        Band(1.25, 3.0, inclusive=True),  # 75-125% of sector avg
+        Band(1.5, 5.0, inclusive=True),   # >125% of sector avg
+    ),
+    above=7.0,                            # >150% of sector avg
+)
+ROE_MISSING = 3.5  # Neutral if missing
+
+NET_MARGIN = ThresholdTable(
+    name="Net margin",
+    bands=(
+        Band(0.0, 0.0),    # Losing money
+        Band(5.0, 1.0),    # Concerning
+        Band(10.0, 2.0),   # Thin
+        Band(15.0, 3.0),   # Decent
+        Band(20.0, 4.0),   # Good
+    ),
+    above=5.0,             # Excellent
+    missing=2.5,
+)
+
+FCF_YIELD_QUALITY = ThresholdTable(
+    name="FCF yield (quality)",
+    bands=(
+        Band(0.0, 0.0),    # Burning cash
+        Band(2.0, 0.0),    # Weak
+        Band(5.0, 1.0),    # Okay
+        Band(8.0, 2.0),    # Good
+    ),
+    above=3.0,             # Excellent
+    missing=1.5,
+)
+
+# ----------------------------------------------------------------------------
+# Financial health (0-25)
+# ----------------------------------------------------------------------------
+
+DEBT_EQUITY_MISSING = 5.0
+DEBT_EQUITY_FINANCIAL = 5.0  # Banks use debt as product - neutral for now
+
+DEBT_EQUITY_STANDARD = ladder(
+    "Debt/Equity",
+    [0.3, 0.5, 1.0, 2.0],
+    [10.0, 8.0, 5.0, 2.0, 0.0],  # Fortress, conservative, moderate, concerning, dangerous
+)
+
+# Utilities are capital intensive, higher D/E is normal
+DEBT_EQUITY_UTILITY = ladder(
+    "Debt/Equity (utilities)",
+    [0.5, 1.0, 2.0, 3.0],
+    [10.0, 8.0, 5.0, 2.0, 0.0],
+)
+
+CURRENT_RATIO_FINANCIAL = 3.0  # Banks don't use current ratio
+
+CURRENT_RATIO = ThresholdTable(
+    name="Current ratio",
+    bands=(
+        Band(0.0, 0.0),    # Problem
+        Band(1.0, 0.0),    # Liquidity crisis
+        Band(1.5, 2.0),    # Tight
+        Band(2.0, 4.0),    # Adequate
+        Band(2.5, 5.0),    # Safe
+    ),
+    above=6.0,             # Very safe
+    missing=3.0,
+)
+
+INTEREST_COVERAGE = ThresholdTable(
+    name="Interest coverage",
+    bands=(
+        Band(0.0, 0.0),    # Losing money
+        Band(1.5, 0.0),    # In trouble
+        Band(3.0, 1.0),    # Risky
+        Band(5.0, 3.0),    # Okay
+        Band(10.0, 4.0),   # Comfortable
+    ),
+    above=5.0,             # No problem
+    missing=2.5,
+)
+
+FCF_YIELD_HEALTH = ThresholdTable(
+    name="FCF yield (health)",
+    bands=(
+        Band(0.0, 0.0),    # Burning cash
+        Band(1.0, 0.0),
+        Band(3.0, 1.0),
+        Band(5.0, 2.0),
+        Band(8.0, 3.0),
+    ),
+    above=4.0,
+    missing=2.0,
+)
+
+# ----------------------------------------------------------------------------
+# Momentum (0-25)
+# ----------------------------------------------------------------------------
+
+MOMENTUM_NEUTRAL = 12.5  # Momentum score when no price data is available
+
+# Price vs 50-day MA in % (don't chase extremes: >10% above is overbought)
+PRICE_VS_SMA50 = ThresholdTable(
+    name="Price vs 50-day MA",
+    bands=(
+        Band(-10.0, 0.0),  # >10% below = oversold
+        Band(-5.0, 1.0),   # Strong downtrend
+        Band(-2.0, 2.0),   # Downtrend
+        Band(0.0, 3.0),    # Mild downtrend
+        Band(2.0, 4.5),    # Mild uptrend
+        Band(5.0, 6.0),    # Uptrend
+        Band(10.0, 7.0),   # Strong uptrend
+    ),
+    above=4.0,             # Overbought
+    missing=0.0,
+)
+
+# Price vs 200-day MA in % (the long-term "line in the sand")
+PRICE_VS_SMA200 = ThresholdTable(
+    name="Price vs 200-day MA",
+    bands=(
+        Band(-20.0, 0.0),  # Deep bear
+        Band(-10.0, 1.0),  # Strong bear
+        Band(-5.0, 2.0),   # Bear trend
+        Band(0.0, 3.0),    # Mild bear
+        Band(5.0, 4.5),    # Mild bull
+        Band(10.0, 6.0),   # Bull trend
+        Band(20.0, 7.0),   # Strong bull trend
+    ),
+    above=5.0,             # Extended rally
+    missing=0.0,
+)
+
+# RSI-14: 40-60 is the goldilocks zone, extremes signal reversals
+RSI = ThresholdTable(
+    name="RSI",
+    bands=(
+        Band(20.0, 1.0),   # Severely oversold
+        Band(30.0, 3.0),   # Oversold
+        Band(40.0, 5.0),   # Mild oversold
+        Band(60.0, 6.0),   # Goldilocks zone
+        Band(70.0, 5.0),   # Mild overbought
+        Band(80.0, 3.0),   # Overbought
+    ),
+    above=1.0,             # Severely overbought
+    missing=1.0,
+)
+
+# Volume vs 20-day average in % ("volume confirms price")
+VOLUME_TREND = ThresholdTable(
+    name="Volume trend",
+    bands=(
+        Band(-50.0, 0.0),  # Very low volume
+        Band(-20.0, 1.0),  # Low volume
+        Band(0.0, 2.0),    # Slightly below average
+        Band(20.0, 3.0),   # Normal
+        Band(50.0, 4.0),   # Above average
+        Band(100.0, 5.0),  # Strong volume
+    ),
+    above=4.0,             # Extreme volume (volatility)
+    missing=0.0,
+)
@@ -14,6 +14,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
 from app.features.stocks.models import Stock, StockFundamental, StockScore
+from app.features.stocks.services.sector_distributions import (
+    DISTRIBUTION_METRICS,
+    SectorDistributions,
+    load_sector_distributions,
+)
 from app.features.stocks.schemas import (
     ScreenerCriteria,
     ScreenerResult,
@@ -127,6 +132,11 @@ class ScreenerService:
         # Apply limit
         stocks = query.limit(criteria.limit).all()
 
+        # Sector distribution tables for the matched stocks' sectors (one query)
+        distributions = load_sector_distributions(
+            self.db, {stock.sector for stock in stocks if stock.sector}
+        )
+
         # Convert to ScreenerResult with additional analysis
         results = []
         for stock in stocks:
@@ -135,6 +145,7 @@ class ScreenerService:
                 match_score=100,  # Calculate based on criteria
                 strengths=self._analyze_strengths(stock),
                 weaknesses=self._analyze_weaknesses(stock),
+                sector_percentiles=self._sector_percentiles(stock, distributions),
             )
             results.append(result)
 
@@ -270,6 +281,13 @@ class ScreenerService:
 
         return response
 
+    def _sector_percentiles(self, stock: Stock, distributions: SectorDistributions) -> Dict[str, int]:
+        """Percentile of each fundamental metric among the stock's sector peers."""
+        if not stock.fundamentals or not stock.sector:
+            return {}
+        values = {metric: getattr(stock.fundamentals, metric) for metric in DISTRIBUTION_METRICS}
+        return distributions.sector_percentiles(stock.sector, values)
+
     def _analyze_strengths(self, stock: Stock) -> List[str]:
         """Analyze stock strengths based on fundamentals."""
         strengths = []
@@ -0,0 +1,202 @@
+"""
+Per-sector distributions (quantiles) of fundamental metrics.
+
+Sector means are easily skewed by a single outlier. These tables store, for
+every sector and fundamental metric, the min, p10, p25, median, p75, p90 and
+max, computed from one columnar snapshot of the universe with grouped
+quantiles (one sort per metric, no per-sector loop). They are refreshed
+together with SectorAverage and let scoring and the screener place a value
+within its sector without re-scanning the universe.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.features.stocks.models import SectorDistribution
+
+# Every numeric StockFundamental metric
+DISTRIBUTION_METRICS: Tuple[str, ...] = (
+    "pe_ratio",
+    "ev_ebitda",
+    "peg_ratio",
+    "pb_ratio",
+    "ps_ratio",
+    "roic",
+    "roe",
+    "gross_margin",
+    "operating_margin",
+    "net_margin",
+    "debt_equity",
+    "current_ratio",
+    "fcf_yield",
+    "interest_coverage",
+    "revenue_growth",
+    "earnings_growth",
+    "dividend_yield",
+    "payout_ratio",
+)
+
+# SectorDistribution column -> quantile (linear interpolation, as np.quantile)
+QUANTILES: Tuple[Tuple[str, float], ...] = (
+    ("min_value", 0.0),
+    ("p10", 0.10),
+    ("p25", 0.25),
+    ("median", 0.50),
+    ("p75", 0.75),
+    ("p90", 0.90),
+    ("max_value", 1.0),
+)
+
+_QUANTILE_LEVELS = np.array([q for _, q in QUANTILES])
+_PERCENTILE_KNOTS = _QUANTILE_LEVELS * 100
+
+
+@dataclass(frozen=True)
+class MetricDistribution:
+    """Quantiles of one metric within one sector."""
+    sector: str
+    metric: str
+    sample_count: int
+    quantiles: Tuple[float, ...]  # One value per QUANTILES entry
+
+    @property
+    def median(self) -> float:
+        return self.quantiles[3]
+
+    def percentile_of(self, value: float) -> int:
+        """
+        Approximate sector percentile of a value (0-100).
+
+        Interpolates linearly between the stored quantiles; values outside
+        the sector's range map to 0 or 100.
+        """
+        return int(round(float(np.interp(value, self.quantiles, _PERCENTILE_KNOTS))))
+
+    def to_row(self) -> Dict[str, object]:
+        """Column values for a SectorDistribution row."""
+        row = {"sector": self.sector, "metric": self.metric, "sample_count": self.sample_count}
+        row.update({name: value for (name, _), value in zip(QUANTILES, self.quantiles)})
+        return row
+
+
+def grouped_quantiles(
+    codes: np.ndarray,
+    values: np.ndarray,
+    groups: int,
+    levels: np.ndarray = _QUANTILE_LEVELS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantiles of values within each group, for all groups at once.
+
+    Args:
+        codes: Group code per value (-1 = no group)
+        values: Values (NaN = missing, ignored)
+        groups: Number of groups (codes are 0..groups-1)
+        levels: Quantile levels in [0, 1]
+
+    Returns:
+        Tuple of (counts, quantiles): non-missing values per group and a
+        groups x len(levels) array (NaN rows for groups without values)
+    """
+    keep = (codes >= 0) & ~np.isnan(values)
+    codes = codes[keep]
+    values = values[keep]
+
+    order = np.lexsort((values, codes))
+    values = values[order]
+    counts = np.bincount(codes, minlength=groups)
+    starts = np.cumsum(counts) - counts
+
+    result = np.full((groups, len(levels)), np.nan)
+    present = counts > 0
+    if not present.any():
+        return counts, result
+
+    position = starts[present, None] + levels[None, :] * (counts[present, None] - 1)
+    below = np.floor(position).astype(np.int64)
+    above = np.ceil(position).astype(np.int64)
+    fraction = position - below
+    result[present] = values[below] + (values[above] - values[below]) * fraction
+    return counts, result
+
+
+def compute_sector_distributions(
+    sector_codes: np.ndarray,
+    sector_names: Sequence[str],
+    columns: Mapping[str, np.ndarray],
+) -> List[MetricDistribution]:
+    """
+    Distributions of every metric in columns, per sector.
+
+    Args:
+        sector_codes: Sector code per stock (see encode_sectors)
+        sector_names: Sector name per code
+        columns: Metric name -> float64 values aligned with sector_codes
+
+    Returns:
+        One MetricDistribution per (sector, metric) with at least one value
+    """
+    distributions = []
+    for metric, values in columns.items():
+        counts, quantiles = grouped_quantiles(sector_codes, values, len(sector_names))
+        for code in np.flatnonzero(counts):
+            distributions.append(MetricDistribution(
+                sector=sector_names[code],
+                metric=metric,
+                sample_count=int(counts[code]),
+                quantiles=tuple(round(float(q), 4) for q in quantiles[code]),
+            ))
+    return distributions
+
+
+class SectorDistributions:
+    """Loaded distribution tables, keyed by (sector, metric)."""
+
+    def __init__(self, distributions: Iterable[MetricDistribution]):
+        self._by_key = {(d.sector, d.metric): d for d in distributions}
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def get(self, sector: Optional[str], metric: str) -> Optional[MetricDistribution]:
+        return self._by_key.get((sector, metric))
+
+    def percentile_of(self, sector: Optional[str], metric: str, value) -> Optional[int]:
+        """Sector percentile of a metric value, or None if unknown."""
+        distribution = self.get(sector, metric)
+        if distribution is None or value is None:
+            return None
+        return distribution.percentile_of(float(value))
+
+    def sector_percentiles(self, sector: Optional[str], values: Mapping[str, object]) -> Dict[str, int]:
+        """Sector percentile of every known metric in values."""
+        percentiles = {}
+        for metric, value in values.items():
+            percentile = self.percentile_of(sector, metric, value)
+            if percentile is not None:
+                percentiles[metric] = percentile
+        return percentiles
+
+
+def load_sector_distributions(db: Session, sectors: Optional[Iterable[str]] = None) -> SectorDistributions:
+    """
+    Load stored distribution tables.
+
+    Args:
+        db: Database session
+        sectors: Only these sectors (default: all)
+    """
+    query = db.query(SectorDistribution)
+    if sectors is not None:
+        query = query.filter(SectorDistribution.sector.in_(set(sectors)))
+    return SectorDistributions(
+        MetricDistribution(
+            sector=row.sector,
+            metric=row.metric,
+            sample_count=row.sample_count,
+            quantiles=tuple(float(getattr(row, name)) for name, _ in QUANTILES),
+        )
+        for row in query.all()
+    )
@@ -4,13 +4,44 @@ Sector averages calculation and caching service.
 This module calculates benchmark metrics for each sector to enable
 peer comparison in the scoring system.
 """
-from typing import Dict, List
+import logging
+from dataclasses import asdict, fields
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, cast, or_, and_, case, select, Float
 from decimal import Decimal
 
-from app.features.stocks.models import Stock, StockFundamental, SectorAverage
-from app.features.stocks.services.scoring_service import SectorBenchmarks
+import numpy as np
+
+from app.config import settings
+from app.infrastructure.database.bulk import bulk_upsert
+from app.features.stocks.models import (
+    Stock,
+    StockFundamental,
+    StockIndicatorState,
+    SectorAverage,
+    SectorDistribution,
+)
+from app.features.stocks.services.scoring_service import (
+    BatchScores,
+    SectorBenchmarks,
+    SCORING_METRICS,
+    encode_sectors,
+)
+from app.features.stocks.services.sector_distributions import (
+    DISTRIBUTION_METRICS,
+    compute_sector_distributions,
+)
+from app.features.stocks.services.sector_stats import (
+    BENCHMARK_AVERAGES,
+    benchmarks_from_totals,
+    count_field,
+    sum_field,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class SectorService:
@@ -23,27 +54,71 @@ class SectorService:
         """
         Calculate average metrics for each sector and cache in database.
 
+        Also resets the running sums and counts that keep SectorAverage
+        current between recomputes (see sector_stats) and rebuilds the
+        per-sector metric distributions (see sector_distributions).
+
         Returns:
             Dictionary mapping sector name to SectorBenchmarks
         """
-        # Get all stocks with fundamentals grouped by sector
-        sectors_data = self._get_sector_data()
+        aggregates = self._aggregate_sectors()
+        self._cache_sector_averages(aggregates)
+        self._cache_sector_distributions()
+        self.db.commit()
+        return {
+            sector: benchmarks_from_totals(sector, stock_count, totals)
+            for sector, (stock_count, totals) in aggregates.items()
+        }
 
-        sector_benchmarks = {}
+    def compute_sector_benchmarks(self) -> Dict[str, SectorBenchmarks]:
+        """
+        Calculate average metrics for each sector without caching them.
 
-        for sector, stocks_fundamentals in sectors_data.items():
-            if not stocks_fundamentals:
-                continue
+        Returns:
+            Dictionary mapping sector name to SectorBenchmarks
+        """
+        return {
+            sector: benchmarks_from_totals(sector, stock_count, totals)
+            for sector, (stock_count, totals) in self._aggregate_sectors().items()
+        }
 
-            # Calculate averages
-            benchmarks = self._calculate_sector_benchmarks(sector, stocks_fundamentals)
-            sector_benchmarks[sector] = benchmarks
+    def _aggregate_sectors(self) -> Dict[str, Tuple[int, Dict[str, Tuple[Any, int]]]]:
+        """
+        Sum and count each benchmark metric per sector in one GROUP BY query.
 
-            # Cache in database
-            self._cache_sector_average(benchmarks)
+        Values that are missing, non-positive or above the metric's cap
+        (see BENCHMARK_AVERAGES) are left out.
 
-        self.db.commit()
-        return sector_benchmarks
+        Returns:
+            Dictionary mapping sector name to (stock_count, {field: (sum, count)})
+        """
+        aggregates = []
+        for field, name, cap in BENCHMARK_AVERAGES:
+            column = getattr(StockFundamental, name)
+            # SUM and COUNT skip NULLs, so filtered-out values simply don't count
+            kept = case((and_(column > 0, column <= cap), column))
+            aggregates.append(func.coalesce(func.sum(kept), 0).label(sum_field(field)))
+            aggregates.append(func.count(kept).label(count_field(field)))
+
+        rows = (
+            self.db.query(Stock.sector, func.count(StockFundamental.id).label("stock_count"), *aggregates)
+            .join(StockFundamental, Stock.id == StockFundamental.stock_id)
+            .filter(Stock.sector.isnot(None))
+            .group_by(Stock.sector)
+            .all()
+        )
+
+        return {
+            row.sector: (
+                row.stock_count,
+                {
+                    field: (getattr(row, sum_field(field)), getattr(row, count_field(field)))
+                    for field, _, _ in BENCHMARK_AVERAGES
+                },
+            )
+            for row in rows
+            if row.sector
+        }
 
     def get_cached_sector_benchmarks(self) -> Dict[str, SectorBenchmarks]:
         """
@@ -71,109 +146,110 @@ class SectorService:
 
         return benchmarks
 
-    def _get_sector_data(self) -> Dict[str, List[StockFundamental]]:
-        """Group stocks by sector with their fundamentals."""
-        # Query stocks with their fundamentals
-        stocks = (
-            self.db.query(Stock)
-            .join(StockFundamental, Stock.id == StockFundamental.stock_id)
-            .filter(Stock.sector.isnot(None))
-            .all()
-        )
-
-        # Group by sector
-        sectors = {}
-        for stock in stocks:
-            if stock.sector and stock.fundamentals:
-                if stock.sector not in sectors:
-                    sectors[stock.sector] = []
-                sectors[stock.sector].append(stock.fundamentals)
+    def _cache_sector_averages(self, aggregates: Dict[str, Tuple[int, Dict[str, Tuple[Any, int]]]]):
+        """Cache sector benchmarks and their running sums in database (one bulk upsert)."""
+        rows = []
+        for sector, (stock_count, totals) in aggregates.items():
+            benchmarks = benchmarks_from_totals(sector, stock_count, totals)
+            row = {"sector": sector, "stock_count": stock_count}
+            for field, _, _ in BENCHMARK_AVERAGES:
+                average = getattr(benchmarks, field)
+                total, count = totals[field]
+                row[field] = Decimal(str(average)) if average else None
+                row[sum_field(field)] = Decimal(str(total))
+                row[count_field(field)] = count
+            rows.append(row)
+        bulk_upsert(self.db, SectorAverage, rows, conflict_columns=["sector"])
+
+    def _cache_sector_distributions(self) -> int:
+        """Replace the stored sector distribution tables from one columnar snapshot."""
+        _, sectors, columns = self.load_fundamental_columns(metrics=DISTRIBUTION_METRICS)
+        sector_codes, sector_names = encode_sectors(sectors)
+        rows = [
+            distribution.to_row()
+            for distribution in compute_sector_distributions(sector_codes, sector_names, columns)
+        ]
+
+        self.db.query(SectorDistribution).delete(synchronize_session=False)
+        if rows:
+            self.db.execute(SectorDistribution.__table__.insert(), rows)
+        return len(rows)
+
+    def load_fundamental_columns(
+        self,
+        changed_since: Optional[datetime] = None,
+        metrics: Sequence[str] = SCORING_METRICS,
+        stock_ids: Optional[Sequence[Any]] = None,
+    ) -> Tuple[List, List[Optional[str]], Dict[str, np.ndarray]]:
+        """
+        Load fundamental metrics (by default the scoring metrics) of stocks with fundamentals as columns.
 
-        return sectors
+        Reads plain column tuples instead of hydrating Stock/StockFundamental
+        ORM objects.
 
-    def _calculate_sector_benchmarks(
-        self,
-        sector: str,
-        fundamentals: List[StockFundamental]
-    ) -> SectorBenchmarks:
-        """Calculate average metrics for a sector."""
-
-        # Helper to calculate average, excluding None and outliers
-        def safe_avg(values: List[float], max_val: float = None) -> float:
-            valid = [v for v in values if v is not None and v > 0]
-            if not valid:
-                return None
-
-            # Remove outliers if max_val specified
-            if max_val:
-                valid = [v for v in valid if v <= max_val]
-
-            return sum(valid) / len(valid) if valid else None
-
-        # Extract values
-        pe_values = [float(f.pe_ratio) if f.pe_ratio else None for f in fundamentals]
-        ev_ebitda_values = [float(f.ev_ebitda) if f.ev_ebitda else None for f in fundamentals]
-        roic_values = [float(f.roic) if f.roic else None for f in fundamentals]
-        roe_values = [float(f.roe) if f.roe else None for f in fundamentals]
-        de_values = [float(f.debt_equity) if f.debt_equity else None for f in fundamentals]
-        gross_margin_values = [float(f.gross_margin) if f.gross_margin else None for f in fundamentals]
-        op_margin_values = [float(f.operating_margin) if f.operating_margin else None for f in fundamentals]
-        net_margin_values = [float(f.net_margin) if f.net_margin else None for f in fundamentals]
-
-        # Calculate averages with outlier removal
-        return SectorBenchmarks(
-            sector=sector,
-            avg_pe=safe_avg(pe_values, max_val=100),  # Cap P/E at 100
-            avg_ev_ebitda=safe_avg(ev_ebitda_values, max_val=100),
-            avg_roic=safe_avg(roic_values, max_val=200),  # Cap ROIC at 200%
-            avg_roe=safe_avg(roe_values, max_val=200),
-            avg_debt_equity=safe_avg(de_values, max_val=5),  # Cap D/E at 5
-            avg_gross_margin=safe_avg(gross_margin_values, max_val=100),
-            avg_operating_margin=safe_avg(op_margin_values, max_val=100),
-            avg_net_margin=safe_avg(net_margin_values, max_val=100),
-            stock_count=len(fundamentals),
-        )
+        Args:
+            changed_since: If set, only stocks whose fundamentals, sector or
+                           momentum score changed after this time
+            metrics: StockFundamental columns to load
+            stock_ids: If set, only these stocks
 
-    def _cache_sector_average(self, benchmarks: SectorBenchmarks):
-        """Cache sector benchmarks in database."""
-        # Check if exists
-        existing = (
-            self.db.query(SectorAverage)
-            .filter(SectorAverage.sector == benchmarks.sector)
-            .first()
+        Returns:
+            Tuple of (stock_ids, sectors, columns) where columns maps each
+            metric name to a float64 array aligned with stock_ids
+        """
+        metric_columns = [
+            cast(getattr(StockFundamental, metric), Float) for metric in metrics
+        ]
+        query = (
+            self.db.query(Stock.id, Stock.sector, *metric_columns)
+            .join(StockFundamental, Stock.id == StockFundamental.stock_id)
         )
-
-        if existing:
-            # Update existing
-            existing.avg_pe = Decimal(str(benchmarks.avg_pe)) if benchmarks.avg_pe else None
-            existing.avg_ev_ebitda = Decimal(str(benchmarks.avg_ev_ebitda)) if benchmarks.avg_ev_ebitda else None
-            existing.avg_roic = Decimal(str(benchmarks.avg_roic)) if benchmarks.avg_roic else None
-            existing.avg_roe = Decimal(str(benchmarks.avg_roe)) if benchmarks.avg_roe else None
-            existing.avg_debt_equity = Decimal(str(benchmarks.avg_debt_equity)) if benchmarks.avg_debt_equity else None
-            existing.avg_gross_margin = Decimal(str(benchmarks.avg_gross_margin)) if benchmarks.avg_gross_margin else None
-            existing.avg_operating_margin = Decimal(str(benchmarks.avg_operating_margin)) if benchmarks.avg_operating_margin else None
-            existing.avg_net_margin = Decimal(str(benchmarks.avg_net_margin)) if benchmarks.avg_net_margin else None
-            existing.stock_count = benchmarks.stock_count
-        else:
-            # Create new
-            new_avg = SectorAverage(
-                sector=benchmarks.sector,
-                avg_pe=Decimal(str(benchmarks.avg_pe)) if benchmarks.avg_pe else None,
-                avg_ev_ebitda=Decimal(str(benchmarks.avg_ev_ebitda)) if benchmarks.avg_ev_ebitda else None,
-                avg_roic=Decimal(str(benchmarks.avg_roic)) if benchmarks.avg_roic else None,
-                avg_roe=Decimal(str(benchmarks.avg_roe)) if benchmarks.avg_roe else None,
-                avg_debt_equity=Decimal(str(benchmarks.avg_debt_equity)) if benchmarks.avg_debt_equity else None,
-                avg_gross_margin=Decimal(str(benchmarks.avg_gross_margin)) if benchmarks.avg_gross_margin else None,
-                avg_operating_margin=Decimal(str(benchmarks.avg_operating_margin)) if benchmarks.avg_operating_margin else None,
-                avg_net_margin=Decimal(str(benchmarks.avg_net_margin)) if benchmarks.avg_net_margin else None,
-                stock_count=benchmarks.stock_count,
+        if changed_since is not None:
+            query = query.filter(
+                or_(
+                    StockFundamental.updated_at > changed_since,
+                    Stock.sector_changed_at > changed_since,
+                    Stock.id.in_(
+                        select(StockIndicatorState.stock_id)
+                        .where(StockIndicatorState.momentum_changed_at > changed_since)
+                    ),
+                )
             )
-            self.db.add(new_avg)
+        if stock_ids is not None:
+            query = query.filter(Stock.id.in_(list(stock_ids)))
+        rows = query.all()
+
+        stock_ids = [row[0] for row in rows]
+        sectors = [row[1] for row in rows]
+        values = np.array([row[2:] for row in rows], dtype=float).reshape(len(rows), len(metrics))
+        columns = {metric: values[:, i] for i, metric in enumerate(metrics)}
+        return stock_ids, sectors, columns
+
+    def get_fundamentals_watermark(self) -> Optional[datetime]:
+        """Latest change time of any scored stock's fundamentals, sector or momentum score."""
+        fundamentals_max, stock_max = (
+            self.db.query(func.max(StockFundamental.updated_at), func.max(Stock.sector_changed_at))
+            .join(Stock, Stock.id == StockFundamental.stock_id)
+            .one()
+        )
+        state_max = self.db.query(func.max(StockIndicatorState.momentum_changed_at)).scalar()
+        candidates = [t for t in (fundamentals_max, stock_max, state_max) if t is not None]
+        return max(candidates) if candidates else None
 
-    def calculate_scores_for_all_stocks(self) -> int:
+    def calculate_scores_for_all_stocks(self, workers: int = 1) -> int:
         """
         Calculate scores for all stocks and save to database.
 
+        The whole universe is scored in one vectorized pass
+        (ScoringService.score_batch), or with workers != 1 in one pass per
+        sector spread over a process pool. The ROIC percentiles and sector
+        benchmarks used are stored as a new scoring context version, and the
+        score rank index is rebuilt from the new totals.
+
+        Args:
+            workers: Processes to score sector shards in
+                     (1 = in-process, 0 = one per CPU core)
+
         Returns:
             Number of stocks scored
         """
@@ -182,63 +258,295 @@ class SectorService:
         # Get sector benchmarks
         sector_benchmarks = self.get_cached_sector_benchmarks()
 
-        # Get all fundamentals for percentile calculations
-        all_fundamentals = (
-            self.db.query(StockFundamental)
-            .join(Stock, Stock.id == StockFundamental.stock_id)
-            .all()
+        # Read the watermark first: rows updated while we score are picked up next time
+        watermark = self.get_fundamentals_watermark()
+
+        # Get all fundamentals as columns (also used for percentile calculations)
+        stock_ids, sectors, columns = self.load_fundamental_columns()
+
+        scoring_service = ScoringService.from_columns(columns, sector_benchmarks)
+        scores = self._score(scoring_service, stock_ids, sectors, columns, workers=workers)
+        return self._save_recompute(scoring_service, stock_ids, scores, watermark)
+
+    def plan_sharded_recompute(self) -> Dict[str, Any]:
+        """
+        Prepare a full recompute scored as one Celery task per sector.
+
+        Fixes the ROIC percentiles, sector benchmarks and watermark that the
+        shards (score_shard) and the final write (save_sharded_recompute)
+        use. The plan is JSON-serializable so it can travel as task arguments.
+
+        Returns:
+            Dict with roic_percentiles, sector_benchmarks, watermark (ISO
+            timestamp or None) and shards, one {"sector", "stock_ids"} per sector
+        """
+        from app.features.stocks.services.parallel_scoring import shard_by_sector
+        from app.features.stocks.services.scoring_service import ScoringService
+
+        sector_benchmarks = self.get_cached_sector_benchmarks()
+        watermark = self.get_fundamentals_watermark()
+        stock_ids, sectors, columns = self.load_fundamental_columns()
+        scoring_service = ScoringService.from_columns(columns, sector_benchmarks)
+
+        sector_codes, sector_names = encode_sectors(sectors)
+        shards = []
+        for rows in shard_by_sector(sector_codes):
+            code = int(sector_codes[rows[0]])
+            shards.append({
+                "sector": sector_names[code] if code >= 0 else None,
+                "stock_ids": [str(stock_ids[i]) for i in rows],
+            })
+        return {
+            "roic_percentiles": list(scoring_service.roic_percentiles),
+            "sector_benchmarks": {sector: asdict(bench) for sector, bench in sector_benchmarks.items()},
+            "watermark": watermark.isoformat() if watermark else None,
+            "shards": shards,
+        }
+
+    def score_shard(self, plan: Dict[str, Any], shard: Dict[str, Any]) -> Dict[str, List]:
+        """
+        Score one shard of a plan_sharded_recompute() plan.
+
+        Args:
+            plan: The plan (its shards entry is not needed)
+            shard: One entry of the plan's shards
+
+        Returns:
+            Dict with stock_ids and one list per BatchScores field, JSON-serializable
+        """
+        from app.features.stocks.services.parallel_scoring import score_shard
+
+        sector = shard["sector"]
+        stock_ids, _, columns = self.load_fundamental_columns(stock_ids=[UUID(i) for i in shard["stock_ids"]])
+        bench = plan["sector_benchmarks"].get(sector) if sector else None
+        scores = score_shard(
+            tuple(plan["roic_percentiles"]),
+            {sector: SectorBenchmarks(**bench)} if bench else {},
+            sector,
+            columns,
+            self.load_momentum_scores(stock_ids),
         )
+        return {
+            "stock_ids": [str(stock_id) for stock_id in stock_ids],
+            **{f.name: getattr(scores, f.name).tolist() for f in fields(BatchScores)},
+        }
 
-        # Initialize scoring service
-        scoring_service = ScoringService(all_fundamentals, sector_benchmarks)
+    def save_sharded_recompute(self, plan: Dict[str, Any], results: Sequence[Dict[str, List]]) -> int:
+        """
+        Write the shard scores of a sharded recompute in one bulk write.
 
-        # Get all stocks with fundamentals
-        stocks = (
-            self.db.query(Stock)
-            .join(StockFundamental, Stock.id == StockFundamental.stock_id)
-            .all()
+        Stores the plan's scoring context as a new version and rebuilds the
+        score rank index, as calculate_scores_for_all_stocks() does.
+
+        Args:
+            plan: The plan the shards were scored with
+            results: score_shard() output of every shard
+
+        Returns:
+            Number of stocks scored
+        """
+        from app.features.stocks.services.scoring_service import ScoringService
+
+        stock_ids = [UUID(stock_id) for result in results for stock_id in result["stock_ids"]]
+        scores = BatchScores(**{
+            f.name: np.array([value for result in results for value in result[f.name]],
+                             dtype=np.int64 if f.name == "signal_codes" else float)
+            for f in fields(BatchScores)
+        })
+        scoring_service = ScoringService.from_percentiles(
+            tuple(plan["roic_percentiles"]),
+            {sector: SectorBenchmarks(**values) for sector, values in plan["sector_benchmarks"].items()},
         )
+        watermark = datetime.fromisoformat(plan["watermark"]) if plan["watermark"] else None
+        return self._save_recompute(scoring_service, stock_ids, scores, watermark)
 
-        scored_count = 0
+    def _save_recompute(
+        self,
+        scoring_service,
+        stock_ids: List,
+        scores: BatchScores,
+        watermark: Optional[datetime],
+    ) -> int:
+        """Store a full recompute's scores with its scoring context, then rebuild the rank index."""
+        from app.features.stocks.services.scoring_context import (
+            stage_scoring_context,
+            publish_scoring_context,
+        )
+        from app.features.stocks.services.score_rank_index import refresh_rank_index
+
+        # New scoring context version, committed together with the scores
+        context_record = stage_scoring_context(
+            self.db,
+            scoring_service.roic_percentiles,
+            scoring_service.sector_benchmarks,
+            len(stock_ids),
+            fundamentals_watermark=watermark,
+        )
+        self._save_scores(stock_ids, scores)
 
-        for stock in stocks:
-            # Calculate score
-            score_breakdown = scoring_service.calculate_score(
-                stock.fundamentals,
-                stock.sector
-            )
+        self.db.commit()
+        publish_scoring_context(context_record)
+        refresh_rank_index(self.db)
+        return len(stock_ids)
 
-            # Save or update score
-            from app.features.stocks.models import StockScore
+    def calculate_scores_incremental(
+        self,
+        tolerance: Optional[float] = None,
+        workers: int = 1,
+        full_recompute: Optional[Callable[[], int]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Rescore only stocks whose fundamentals, sector or momentum score changed since the last recompute.
 
-            existing_score = (
-                self.db.query(StockScore)
-                .filter(StockScore.stock_id == stock.id)
-                .first()
-            )
+        Momentum changes are read from StockIndicatorState.momentum_changed_at,
+        stamped when new price bars (daily, and hourly from intraday quotes)
+        move a stock's momentum score.
 
-            if existing_score:
-                # Update existing
-                existing_score.total_score = Decimal(str(score_breakdown.total_score))
-                existing_score.value_score = Decimal(str(score_breakdown.value_score))
-                existing_score.quality_score = Decimal(str(score_breakdown.quality_score))
-                existing_score.momentum_score = Decimal(str(score_breakdown.momentum_score))
-                existing_score.health_score = Decimal(str(score_breakdown.health_score))
-                existing_score.signal = score_breakdown.signal
-            else:
-                # Create new
-                new_score = StockScore(
-                    stock_id=stock.id,
-                    total_score=Decimal(str(score_breakdown.total_score)),
-                    value_score=Decimal(str(score_breakdown.value_score)),
-                    quality_score=Decimal(str(score_breakdown.quality_score)),
-                    momentum_score=Decimal(str(score_breakdown.momentum_score)),
-                    health_score=Decimal(str(score_breakdown.health_score)),
-                    signal=score_breakdown.signal,
-                )
-                self.db.add(new_score)
+        Compares freshly computed ROIC percentiles and sector benchmarks with
+        the current scoring context. If any of them drifted by more than
+        tolerance (relative), falls back to a full recompute so that every
+        stock is scored against the same thresholds.
 
-            scored_count += 1
+        Args:
+            tolerance: Relative drift that forces a full recompute
+                       (defaults to settings.SCORING_DRIFT_TOLERANCE)
+            workers: Processes for a full recompute (see calculate_scores_for_all_stocks)
+            full_recompute: Runs the full recompute instead of calculate_scores_for_all_stocks
+                            and returns the number of stocks (e.g. dispatching sector shards)
 
+        Returns:
+            Dict with mode ("incremental" or "full"), scored_count,
+            sectors_analyzed and, for a full recompute, the drift reason
+        """
+        from app.features.stocks.models import ScoringContextSnapshot
+        from app.features.stocks.services.scoring_service import ScoringService
+        from app.features.stocks.services.scoring_context import (
+            find_context_drift,
+            get_scoring_context,
+        )
+        from app.features.stocks.services.score_rank_index import refresh_rank_index
+
+        if tolerance is None:
+            tolerance = settings.SCORING_DRIFT_TOLERANCE
+
+        context = get_scoring_context(self.db)
+        record = (
+            self.db.query(ScoringContextSnapshot)
+            .filter(ScoringContextSnapshot.id == context.id)
+            .one()
+        )
+
+        watermark = self.get_fundamentals_watermark()
+        sector_benchmarks = self.compute_sector_benchmarks()
+        roic_values = [
+            float(roic)
+            for (roic,) in self.db.query(StockFundamental.roic)
+            .join(Stock, Stock.id == StockFundamental.stock_id)
+            .filter(StockFundamental.roic > 0)
+            .all()
+        ]
+        roic_percentiles = ScoringService.from_roic_values(roic_values, sector_benchmarks).roic_percentiles
+
+        reason = None
+        if record.fundamentals_watermark is None:
+            reason = "no watermark stored for the current scoring context"
+        else:
+            reason = find_context_drift(context, roic_percentiles, sector_benchmarks, tolerance)
+
+        if reason:
+            logger.info(f"Full score recompute: {reason}")
+            benchmarks = self.calculate_and_cache_sector_averages()
+            if full_recompute is not None:
+                scored_count = full_recompute()
+            else:
+                scored_count = self.calculate_scores_for_all_stocks(workers=workers)
+            return {
+                "mode": "full",
+                "reason": reason,
+                "scored_count": scored_count,
+                "sectors_analyzed": len(benchmarks),
+            }
+
+        stock_ids, sectors, columns = self.load_fundamental_columns(
+            changed_since=record.fundamentals_watermark
+        )
+        self._score_and_save(context.scoring_service(), stock_ids, sectors, columns)
+        if watermark is not None:
+            record.fundamentals_watermark = watermark
         self.db.commit()
-        return scored_count
+        if stock_ids:
+            refresh_rank_index(self.db)
+
+        logger.info(f"Incremental score recompute: rescored {len(stock_ids)} changed stocks")
+        return {
+            "mode": "incremental",
+            "scored_count": len(stock_ids),
+            "sectors_analyzed": len(sector_benchmarks),
+        }
+
+    def load_momentum_scores(self, stock_ids: List) -> np.ndarray:
+        """
+        Momentum score per stock from the stored indicator states.
+
+        The latest indicators of all the stocks are read in one query (stocks
+        without a state get one built from their stored prices) and scored
+        column-wise; stocks without price data get the neutral score.
+
+        Args:
+            stock_ids: Stocks to score
+
+        Returns:
+            Momentum score (0-25) per stock, aligned with stock_ids
+        """
+        from app.features.stocks.services.indicator_state import IndicatorStateStore
+        from app.features.stocks.services.momentum_service import get_momentum_service
+
+        indicators = IndicatorStateStore(self.db).latest_columns(stock_ids)
+        return get_momentum_service().score_batch(indicators)
+
+    def _score_and_save(
+        self,
+        scoring_service,
+        stock_ids: List,
+        sectors: List[Optional[str]],
+        columns: Dict[str, np.ndarray],
+        workers: int = 1,
+    ) -> None:
+        """Score the given stocks (vectorized, optionally sharded by sector) and stage one bulk StockScore upsert."""
+        self._save_scores(stock_ids, self._score(scoring_service, stock_ids, sectors, columns, workers=workers))
+
+    def _score(
+        self,
+        scoring_service,
+        stock_ids: List,
+        sectors: List[Optional[str]],
+        columns: Dict[str, np.ndarray],
+        workers: int = 1,
+    ) -> BatchScores:
+        """Score the given stocks (vectorized, optionally sharded by sector over processes)."""
+        from app.features.stocks.services.parallel_scoring import score_batch_by_sector
+
+        sector_codes, sector_names = encode_sectors(sectors)
+        return score_batch_by_sector(
+            scoring_service, columns, sector_codes, sector_names,
+            momentum_scores=self.load_momentum_scores(stock_ids),
+            workers=workers,
+        )
+
+    def _save_scores(self, stock_ids: List, scores: BatchScores) -> None:
+        """Stage one bulk StockScore upsert (the caller commits)."""
+        from app.features.stocks.models import StockScore
+
+        rows = [
+            {
+                "stock_id": stock_id,
+                "total_score": Decimal(str(float(scores.total_score[i]))),
+                "value_score": Decimal(str(float(scores.value_score[i]))),
+                "quality_score": Decimal(str(float(scores.quality_score[i]))),
+                "momentum_score": Decimal(str(float(scores.momentum_score[i]))),
+                "health_score": Decimal(str(float(scores.health_score[i]))),
+                "signal": scores.signal(i),
+            }
+            for i, stock_id in enumerate(stock_ids)
+        ]
+        bulk_upsert(self.db, StockScore, rows, conflict_columns=["stock_id"])
@@ -0,0 +1,221 @@
+"""
+Running sector statistics behind SectorAverage.
+
+Each sector_averages row keeps, per benchmark metric, the sum and count of
+its stocks' values that pass the outlier filter (> 0 and <= cap). Mapper
+listeners apply the difference a StockFundamental insert, update or delete
+(or a stock changing sector) makes to those sums within the same flush, and
+recompute the affected averages, so benchmarks stay current between full
+recomputes without rescanning the sector.
+
+Core bulk writes (e.g. benchmark universe loading) bypass the listeners;
+SectorService.calculate_and_cache_sector_averages() resets the sums from a
+full scan.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Mapping, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import Float, case, cast, event, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.features.stocks.models import SectorAverage, Stock, StockFundamental
+from app.features.stocks.services.scoring_service import SectorBenchmarks
+from app.infrastructure.database.bulk import dialect_insert
+
+# SectorBenchmarks field -> (StockFundamental column, outlier cap)
+BENCHMARK_AVERAGES: Tuple[Tuple[str, str, float], ...] = (
+    ("avg_pe", "pe_ratio", 100),  # Cap P/E at 100
+    ("avg_ev_ebitda", "ev_ebitda", 100),
+    ("avg_roic", "roic", 200),  # Cap ROIC at 200%
+    ("avg_roe", "roe", 200),
+    ("avg_debt_equity", "debt_equity", 5),  # Cap D/E at 5
+    ("avg_gross_margin", "gross_margin", 100),
+    ("avg_operating_margin", "operating_margin", 100),
+    ("avg_net_margin", "net_margin", 100),
+)
+
+BENCHMARK_COLUMNS: Tuple[str, ...] = tuple(name for _, name, _ in BENCHMARK_AVERAGES)
+
+
+def sum_field(field: str) -> str:
+    """SectorAverage running-sum column of an average ("avg_pe" -> "sum_pe")."""
+    return "sum_" + field[len("avg_"):]
+
+
+def count_field(field: str) -> str:
+    """SectorAverage running-count column of an average ("avg_pe" -> "count_pe")."""
+    return "count_" + field[len("avg_"):]
+
+
+def benchmarks_from_totals(
+    sector: str,
+    stock_count: int,
+    totals: Mapping[str, Tuple[Any, int]],
+) -> SectorBenchmarks:
+    """
+    SectorBenchmarks from running sums and counts.
+
+    Args:
+        sector: Sector name
+        stock_count: Stocks with fundamentals in the sector
+        totals: SectorBenchmarks field -> (sum, count)
+    """
+    averages = {}
+    for field, _, _ in BENCHMARK_AVERAGES:
+        total, count = totals[field]
+        averages[field] = float(total) / count if count else None
+    return SectorBenchmarks(sector=sector, stock_count=stock_count, **averages)
+
+
+def contribution(values: Mapping[str, Any]) -> Dict[str, Tuple[Decimal, int]]:
+    """
+    What one stock's fundamentals add to its sector's sums and counts.
+
+    Args:
+        values: StockFundamental column -> value
+
+    Returns:
+        SectorBenchmarks field -> (sum, count); (0, 0) for a filtered-out value
+    """
+    result = {}
+    for field, name, cap in BENCHMARK_AVERAGES:
+        value = values.get(name)
+        if value is not None and 0 < value <= cap:
+            result[field] = (Decimal(str(value)), 1)
+        else:
+            result[field] = (Decimal(0), 0)
+    return result
+
+
+def apply_sector_delta(
+    connection: Connection,
+    sector: Optional[str],
+    values: Mapping[str, Any],
+    sign: int,
+) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) one stock's fundamentals from a sector.
+
+    Updates the running sums and counts, stock_count and the averages of
+    the sector's SectorAverage row in one statement. Adding to a sector
+    without a row creates it; removing from one is a no-op.
+    """
+    if not sector:
+        return
+
+    table = SectorAverage.__table__
+    delta = contribution(values)
+    now = datetime.utcnow()
+
+    if sign < 0:
+        new_values = {"stock_count": table.c.stock_count - 1, "updated_at": now}
+        for field, (total, count) in delta.items():
+            new_sum = table.c[sum_field(field)] - total
+            new_count = table.c[count_field(field)] - count
+            new_values[sum_field(field)] = new_sum
+            new_values[count_field(field)] = new_count
+            new_values[field] = case((new_count > 0, cast(new_sum, Float) / new_count), else_=None)
+        connection.execute(update(table).where(table.c.sector == sector).values(**new_values))
+        return
+
+    row = {
+        "id": uuid4(),
+        "sector": sector,
+        "stock_count": 1,
+        "created_at": now,
+        "updated_at": now,
+        "is_deleted": False,
+    }
+    for field, (total, count) in delta.items():
+        row[sum_field(field)] = total
+        row[count_field(field)] = count
+        row[field] = total if count else None
+
+    stmt = dialect_insert(connection.dialect.name)(table).values(**row)
+    set_ = {"stock_count": table.c.stock_count + 1, "updated_at": now}
+    for field in delta:
+        new_sum = table.c[sum_field(field)] + stmt.excluded[sum_field(field)]
+        new_count = table.c[count_field(field)] + stmt.excluded[count_field(field)]
+        set_[sum_field(field)] = new_sum
+        set_[count_field(field)] = new_count
+        set_[field] = case((new_count > 0, cast(new_sum, Float) / new_count), else_=None)
+    connection.execute(stmt.on_conflict_do_update(index_elements=["sector"], set_=set_))
+
+
+def _sector_of(connection: Connection, stock_id) -> Optional[str]:
+    return connection.execute(select(Stock.sector).where(Stock.id == stock_id)).scalar()
+
+
+def _previous(target, names) -> Dict[str, Any]:
+    """Attribute values before the changes being flushed."""
+    state = inspect(target)
+    previous = {}
+    for name in names:
+        history = state.attrs[name].history
+        if history.deleted:
+            previous[name] = history.deleted[0]
+        elif history.added:
+            previous[name] = None
+        else:
+            previous[name] = getattr(target, name)
+    return previous
+
+
+def _current(target, names) -> Dict[str, Any]:
+    return {name: getattr(target, name) for name in names}
+
+
+@event.listens_for(StockFundamental, "after_insert")
+def _fundamental_inserted(mapper, connection, target):
+    apply_sector_delta(connection, _sector_of(connection, target.stock_id), _current(target, BENCHMARK_COLUMNS), 1)
+
+
+@event.listens_for(StockFundamental, "after_update")
+def _fundamental_updated(mapper, connection, target):
+    names = BENCHMARK_COLUMNS + ("stock_id",)
+    before = _previous(target, names)
+    after = _current(target, names)
+    if before == after:
+        return
+    apply_sector_delta(connection, _sector_of(connection, before["stock_id"]), before, -1)
+    apply_sector_delta(connection, _sector_of(connection, after["stock_id"]), after, 1)
+
+
+@event.listens_for(StockFundamental, "before_delete")
+def _fundamental_deleted(mapper, connection, target):
+    before = _previous(target, BENCHMARK_COLUMNS + ("stock_id",))
+    apply_sector_delta(connection, _sector_of(connection, before["stock_id"]), before, -1)
+
+
+@event.listens_for(Stock, "after_update")
+def _stock_updated(mapper, connection, target):
+    old_sector = _previous(target, ("sector",))["sector"]
+    if old_sector == target.sector:
+        return
+    # Incremental rescoring picks the stock up by this (Stock.updated_at also moves on e.g. market_cap)
+    changed_at = datetime.utcnow()
+    connection.execute(
+        update(Stock.__table__).where(Stock.__table__.c.id == target.id).values(sector_changed_at=changed_at)
+    )
+    set_committed_value(target, "sector_changed_at", changed_at)
+    values = connection.execute(
+        select(*(StockFundamental.__table__.c[name] for name in BENCHMARK_COLUMNS))
+        .where(StockFundamental.stock_id == target.id)
+    ).mappings().first()
+    if values is None:
+        return
+    apply_sector_delta(connection, old_sector, values, -1)
+    apply_sector_delta(connection, target.sector, values, 1)
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    """No-op "set" listener; registered with active_history=True so that
+    assigning to an expired attribute still loads the value it replaces."""
+
+
+for _name in BENCHMARK_COLUMNS + ("stock_id",):
+    event.listen(getattr(StockFundamental, _name), "set", _keep_previous_value, active_history=True)
+event.listen(Stock.sector, "set", _keep_previous_value, active_history=True)
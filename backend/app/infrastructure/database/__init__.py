@@ -1,4 +1,5 @@
 """Database infrastructure package."""
 from app.infrastructure.database.session import Base, get_db, engine
+from app.infrastructure.database.bulk import bulk_upsert, copy_upsert
 
-__all__ = ["Base", "get_db", "engine"]
+__all__ = ["Base", "get_db", "engine", "bulk_upsert", "copy_upsert"]
@@ -0,0 +1,248 @@
+"""Bulk write helpers."""
+import io
+from typing import Any, Dict, List, Sequence, Tuple
+from uuid import uuid4
+
+import pandas as pd
+from sqlalchemy import column, literal, select, table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import Uuid
+
+# Rows per executemany batch
+UPSERT_BATCH_SIZE = 5000
+
+# Rows per COPY chunk (PostgreSQL) in copy_upsert
+COPY_BATCH_SIZE = 100_000
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def dialect_insert(dialect: str):
+    """
+    The insert() construct of a dialect that supports ON CONFLICT.
+
+    Raises:
+        NotImplementedError: If the database is neither PostgreSQL nor SQLite
+    """
+    insert = _INSERTS.get(dialect)
+    if insert is None:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert
+
+
+def bulk_upsert(
+    db: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    batch_size: int = UPSERT_BATCH_SIZE,
+) -> int:
+    """
+    Insert rows, updating the existing row on a unique-key conflict.
+
+    Sends INSERT ... ON CONFLICT (conflict_columns) DO UPDATE as one
+    executemany per batch within the session's transaction (the caller
+    commits). Column defaults fill keys missing from the rows on insert;
+    on conflict every provided column is overwritten, as are columns with
+    an onupdate (e.g. updated_at), while id and created_at are kept.
+
+    Args:
+        db: Database session
+        model: ORM model class
+        rows: Column values per row; every row must have the same keys
+        conflict_columns: Columns of the unique constraint to upsert on
+        batch_size: Rows per executemany batch
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        NotImplementedError: If the database is neither PostgreSQL nor SQLite
+    """
+    if not rows:
+        return 0
+
+    table = model.__table__
+    stmt = dialect_insert(db.get_bind().dialect.name)(table)
+    updated = [name for name in rows[0] if name not in conflict_columns]
+    updated += [
+        column.name for column in table.columns
+        if column.onupdate is not None and column.name not in updated
+    ]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={name: stmt.excluded[name] for name in updated},
+    )
+
+    for start in range(0, len(rows), batch_size):
+        db.execute(stmt, rows[start:start + batch_size])
+    return len(rows)
+
+
+class random_uuid(FunctionElement):
+    """
+    A new random (version 4) UUID per row, generated by the database.
+
+    For set-based INSERT ... SELECT statements, where the Python-side
+    uuid4 default of BaseEntity.id cannot run per row.
+    """
+    type = Uuid()
+    inherit_cache = True
+
+
+@compiles(random_uuid, "postgresql")
+def _random_uuid_postgresql(element, compiler, **kw):
+    return "gen_random_uuid()"
+
+
+@compiles(random_uuid, "sqlite")
+def _random_uuid_sqlite(element, compiler, **kw):
+    # 32 hex digits (how UUID columns are stored on SQLite) with v4 version/variant bits
+    return (
+        "lower(hex(randomblob(6)) || '4' || substr(hex(randomblob(2)), 2) || "
+        "substr('89ab', 1 + (abs(random()) % 4), 1) || substr(hex(randomblob(2)), 2) || "
+        "hex(randomblob(6)))"
+    )
+
+
+def _missing_defaults(model, provided: Sequence[str]) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    How a columnar upsert fills the columns the frame does not provide.
+
+    Returns:
+        Tuple of (primary key columns, generated per row with random_uuid(),
+        and column -> Python default, evaluated once for the whole write,
+        e.g. created_at/updated_at = now)
+    """
+    generated, constants = [], {}
+    for col in model.__table__.columns:
+        if col.name in provided or col.default is None:
+            continue
+        if col.primary_key:
+            generated.append(col.name)
+        elif col.default.is_callable:
+            constants[col.name] = col.default.arg(None)
+        else:
+            constants[col.name] = col.default.arg
+    return generated, constants
+
+
+def _on_conflict_update(stmt, model, provided: Sequence[str], conflict_columns: Sequence[str]):
+    """ON CONFLICT DO UPDATE of the provided columns plus onupdate columns (as bulk_upsert)."""
+    updated = [name for name in provided if name not in conflict_columns]
+    updated += [
+        col.name for col in model.__table__.columns
+        if col.onupdate is not None and col.name not in updated
+    ]
+    return stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={name: stmt.excluded[name] for name in updated},
+    )
+
+
+def _dbapi_column(values: pd.Series, type_, dialect) -> List[Any]:
+    """
+    A column of frame values as DB-API parameters (NaN/NA -> None).
+
+    The type's bind processor runs once per distinct value rather than once
+    per row, which keeps repeated keys (stock ids, dates) cheap.
+    """
+    values = values.astype(object).where(values.notna(), None)
+    processor = type_.dialect_impl(dialect).bind_processor(dialect)
+    if processor is not None:
+        processed = {value: processor(value) for value in values.unique() if value is not None}
+        processed[None] = None
+        values = values.map(processed.__getitem__)
+    return values.tolist()
+
+
+def copy_upsert(
+    db: Session,
+    model,
+    frame: pd.DataFrame,
+    conflict_columns: Sequence[str],
+    batch_size: int = COPY_BATCH_SIZE,
+) -> int:
+    """
+    Upsert a DataFrame of column values in one pass.
+
+    On PostgreSQL the frame is streamed with COPY (CSV, in chunks) into a
+    temporary table and merged with a single INSERT ... SELECT ... ON
+    CONFLICT DO UPDATE. On SQLite, one INSERT ... ON CONFLICT DO UPDATE is
+    sent with DB-API executemany over rows zipped from whole columns.
+
+    Columns missing from the frame are filled as in _missing_defaults();
+    on conflict the frame's columns and onupdate columns are overwritten.
+    Within the frame, the last row per conflict key wins. Runs in the
+    session's transaction (the caller commits).
+
+    Args:
+        db: Database session
+        model: ORM model class
+        frame: One column per table column to write; NaN/NA are written as NULL
+        conflict_columns: Columns of the unique constraint to upsert on
+        batch_size: Rows per COPY chunk (PostgreSQL) or executemany batch (SQLite)
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        NotImplementedError: If the database is neither PostgreSQL nor SQLite
+    """
+    if frame.empty:
+        return 0
+
+    frame = frame.drop_duplicates(subset=list(conflict_columns), keep="last")
+    provided = list(frame.columns)
+    dialect = db.get_bind().dialect
+    insert = dialect_insert(dialect.name)
+    generated, constants = _missing_defaults(model, provided)
+    target = model.__table__
+    cursor = db.connection().connection.cursor()
+
+    try:
+        if dialect.name == "postgresql":
+            staging = f"copy_staging_{uuid4().hex[:12]}"
+            names = ", ".join(provided)
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT {names} FROM {target.name} WITH NO DATA"
+            )
+            for start in range(0, len(frame), batch_size):
+                buffer = io.StringIO()
+                frame.iloc[start:start + batch_size].to_csv(buffer, header=False, index=False)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {staging} ({names}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+            source = select(
+                *(column(name) for name in provided),
+                *(random_uuid() for _ in generated),
+                *(literal(value, target.c[name].type) for name, value in constants.items()),
+            ).select_from(table(staging))
+            stmt = insert(target).from_select(provided + generated + list(constants), source)
+            db.execute(_on_conflict_update(stmt, model, provided, conflict_columns))
+            cursor.execute(f"DROP TABLE {staging}")
+        else:
+            stmt = _on_conflict_update(
+                insert(target).values({name: random_uuid() for name in generated}),
+                model, provided, conflict_columns,
+            )
+            compiled = stmt.compile(dialect=dialect, column_keys=provided + list(constants))
+            columns = {name: _dbapi_column(frame[name], target.c[name].type, dialect) for name in provided}
+            for name, value in constants.items():
+                columns[name] = _dbapi_column(pd.Series([value]), target.c[name].type, dialect) * len(frame)
+            ordered = [columns[name] for name in compiled.positiontup]
+            for start in range(0, len(frame), batch_size):
+                cursor.executemany(
+                    compiled.string,
+                    list(zip(*(values[start:start + batch_size] for values in ordered))),
+                )
+    finally:
+        cursor.close()
+    return len(frame)
@@ -33,6 +33,12 @@ celery_app.conf.update(
 
 # Beat schedule for periodic tasks
 celery_app.conf.beat_schedule = {
+    # Store the last closed session's prices and advance indicator states (6:00 AM ET, Tue-Sat)
+    "update-indicator-states-daily": {
+        "task": "app.tasks.stock_tasks.update_indicator_states",
+        "schedule": crontab(minute=0, hour=6, day_of_week="2-6"),
+        "options": {"queue": "default"},
+    },
     # Refresh stock data hourly during market hours (9:30 AM - 4:00 PM ET, Mon-Fri)
     # Runs at minute 0 of each hour from 10-16 (covers 9:30-16:00)
     "refresh-stock-data-hourly": {
@@ -40,10 +46,23 @@ celery_app.conf.beat_schedule = {
         "schedule": crontab(minute=0, hour="10-16", day_of_week="1-5"),
         "options": {"queue": "default"},
     },
+    # Rescore stocks whose fundamentals changed, after each hourly refresh
+    "rescore-changed-stocks-hourly": {
+        "task": "app.tasks.score_tasks.recalculate_all_scores",
+        "schedule": crontab(minute=15, hour="10-16", day_of_week="1-5"),
+        "kwargs": {"incremental": True},
+        "options": {"queue": "default"},
+    },
     # Snapshot daily scores after market close (4:30 PM ET, Mon-Fri)
     "snapshot-scores-daily": {
         "task": "app.tasks.score_tasks.snapshot_daily_scores",
         "schedule": crontab(minute=30, hour=16, day_of_week="1-5"),
         "options": {"queue": "default"},
     },
+    # Roll old score history up into weekly/monthly tiers (Sunday 3:00 AM ET)
+    "compact-score-history-weekly": {
+        "task": "app.tasks.score_tasks.compact_score_history",
+        "schedule": crontab(minute=0, hour=3, day_of_week=0),
+        "options": {"queue": "default"},
+    },
 }
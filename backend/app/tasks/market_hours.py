@@ -1,5 +1,5 @@
 """Market hours utility for US stock markets."""
-from datetime import datetime
+from datetime import date, datetime
 import pytz
 
 
@@ -27,6 +27,16 @@ def is_market_hours() -> bool:
     return market_open <= now <= market_close
 
 
+def market_today() -> date:
+    """Current trading date (US/Eastern)."""
+    return datetime.now(pytz.timezone("US/Eastern")).date()
+
+
+def market_date(timestamp: float) -> date:
+    """Trading date (US/Eastern) of a Unix timestamp, e.g. a quote's regularMarketTime."""
+    return datetime.fromtimestamp(timestamp, pytz.timezone("US/Eastern")).date()
+
+
 def get_market_status() -> dict:
     """Get detailed market status information.
 
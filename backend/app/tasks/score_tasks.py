@@ -1,5 +1,6 @@
 """Score-related Celery tasks."""
 import logging
+from celery import chord
 from .celery_app import celery_app
 from .market_hours import get_market_status
 
@@ -18,6 +19,35 @@ def _invalidate_ai_insight_cache() -> None:
         logger.warning(f"AI insight cache invalidation skipped: {e}")
 
 
+def _invalidate_score_caches() -> None:
+    """Drop the caches that embed scores after a recompute."""
+    from .stock_tasks import invalidate_cache
+    invalidate_cache.delay("leaderboard:*")
+    invalidate_cache.delay("stocks:top:*")
+
+    # Invalidate AI insight cache after score recomputation
+    _invalidate_ai_insight_cache()
+
+
+def _dispatch_sharded_recompute(sector_service) -> int:
+    """Start a full recompute as a chord of one score_sector_shard task per sector.
+
+    save_sector_scores writes the merged scores once every shard is done.
+    Falls back to an in-process recompute when there is nothing to shard.
+
+    Returns:
+        Number of stocks being scored
+    """
+    plan = sector_service.plan_sharded_recompute()
+    shards = plan.pop("shards")
+    if not shards:
+        return sector_service.calculate_scores_for_all_stocks()
+
+    chord(score_sector_shard.s(plan, shard) for shard in shards)(save_sector_scores.s(plan))
+    logger.info(f"Dispatched {len(shards)} sector shard tasks")
+    return sum(len(shard["stock_ids"]) for shard in shards)
+
+
 @celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
 def snapshot_daily_scores(self):
     """Create daily snapshot of all stock scores.
@@ -42,13 +72,16 @@ def snapshot_daily_scores(self):
         db = SessionLocal()
         try:
             tracking_service = ScoreTrackingService(db)
-            count = tracking_service.snapshot_all_scores()
+            counts = tracking_service.snapshot_all_scores()
 
-            logger.info(f"Successfully created {count} score snapshots")
+            logger.info(
+                f"Score snapshot: created {counts['created']}, updated {counts['updated']}"
+            )
 
             return {
                 "status": "completed",
-                "snapshots_created": count,
+                "snapshots_created": counts["created"],
+                "snapshots_updated": counts["updated"],
                 "time": market_status["current_time_et"],
             }
 
@@ -61,7 +94,37 @@ def snapshot_daily_scores(self):
 
 
 @celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
-def recalculate_all_scores(self):
+def compact_score_history(self):
+    """Compact score history into weekly and monthly retention tiers.
+
+    Rolls old daily snapshots up instead of deleting them, so long-range
+    score history stays available (see ScoreTrackingService.compact_history).
+
+    Scheduled weekly (Sunday 3:00 AM ET).
+    """
+    logger.info("Starting compact_score_history task")
+
+    try:
+        from app.infrastructure.database.session import SessionLocal
+        from app.features.stocks.services.score_tracking_service import ScoreTrackingService
+
+        db = SessionLocal()
+        try:
+            removed = ScoreTrackingService(db).compact_history()
+            logger.info(f"Compacted score history: {removed}")
+
+            return {"status": "completed", **removed}
+
+        finally:
+            db.close()
+
+    except Exception as exc:
+        logger.error(f"Error compacting score history: {exc}", exc_info=True)
+        raise self.retry(exc=exc)
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+def recalculate_all_scores(self, incremental: bool = False, parallel: bool = False):
     """Recalculate scores for all stocks.
 
     This task:
@@ -69,9 +132,19 @@ def recalculate_all_scores(self):
     2. Recalculates scores for all stocks
     3. Updates score table
 
+    With incremental=True only stocks whose fundamentals, sector or
+    momentum score changed since the last recompute are rescored; it
+    escalates to a full recompute when ROIC percentiles or sector
+    benchmarks drift past SCORING_DRIFT_TOLERANCE.
+
+    With parallel=True a full recompute (including an escalated one) is
+    fanned out as a chord: one score_sector_shard task per sector, then
+    save_sector_scores writes all scores in one bulk write. The task
+    returns once the shards are dispatched (status "dispatched").
+
     Can be triggered manually or scheduled for weekly recalculation.
     """
-    logger.info("Starting recalculate_all_scores task")
+    logger.info(f"Starting recalculate_all_scores task (incremental={incremental}, parallel={parallel})")
 
     try:
         from app.infrastructure.database.session import SessionLocal
@@ -80,32 +153,108 @@ def recalculate_all_scores(self):
         db = SessionLocal()
         try:
             sector_service = SectorService(db)
+            full_recompute = None
+            if parallel:
+                def full_recompute():
+                    return _dispatch_sharded_recompute(sector_service)
 
-            # Calculate sector averages
-            sector_benchmarks = sector_service.calculate_and_cache_sector_averages()
-            logger.info(f"Calculated benchmarks for {len(sector_benchmarks)} sectors")
+            if incremental:
+                result = sector_service.calculate_scores_incremental(full_recompute=full_recompute)
+                scored_count = result["scored_count"]
+                sectors_analyzed = result["sectors_analyzed"]
+                mode = result["mode"]
+            else:
+                # Calculate sector averages
+                sector_benchmarks = sector_service.calculate_and_cache_sector_averages()
+                sectors_analyzed = len(sector_benchmarks)
+                logger.info(f"Calculated benchmarks for {sectors_analyzed} sectors")
 
-            # Calculate scores for all stocks
-            scored_count = sector_service.calculate_scores_for_all_stocks()
-            logger.info(f"Recalculated scores for {scored_count} stocks")
+                # Calculate scores for all stocks
+                if full_recompute is not None:
+                    scored_count = full_recompute()
+                else:
+                    scored_count = sector_service.calculate_scores_for_all_stocks()
+                mode = "full"
 
-            # Invalidate leaderboard cache
-            from .stock_tasks import invalidate_cache
-            invalidate_cache.delay("leaderboard:*")
-            invalidate_cache.delay("stocks:top:*")
+            # A dispatched chord writes the scores (and invalidates caches) later
+            dispatched = parallel and mode == "full"
+            if dispatched:
+                logger.info(f"Dispatched sharded recompute of {scored_count} stocks")
+            else:
+                logger.info(f"Recalculated scores for {scored_count} stocks ({mode})")
+                if scored_count:
+                    _invalidate_score_caches()
 
-            # Invalidate AI insight cache after score recomputation
-            _invalidate_ai_insight_cache()
+            return {
+                "status": "dispatched" if dispatched else "completed",
+                "mode": mode,
+                "scored_count": scored_count,
+                "sectors_analyzed": sectors_analyzed,
+            }
+
+        finally:
+            db.close()
+
+    except Exception as exc:
+        logger.error(f"Error recalculating scores: {exc}", exc_info=True)
+        raise self.retry(exc=exc)
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+def score_sector_shard(self, plan: dict, shard: dict):
+    """Score one sector of a sharded recompute (chord header, see recalculate_all_scores).
+
+    Returns the shard's scores; nothing is written here.
+    """
+    logger.info(f"Scoring sector shard {shard['sector']} ({len(shard['stock_ids'])} stocks)")
+
+    try:
+        from app.infrastructure.database.session import SessionLocal
+        from app.features.stocks.services.sector_service import SectorService
+
+        db = SessionLocal()
+        try:
+            return SectorService(db).score_shard(plan, shard)
+
+        finally:
+            db.close()
+
+    except Exception as exc:
+        logger.error(f"Error scoring sector shard {shard['sector']}: {exc}", exc_info=True)
+        raise self.retry(exc=exc)
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+def save_sector_scores(self, results: list, plan: dict):
+    """Write the scores of every sector shard in one bulk write (chord body).
+
+    Stores the plan's scoring context, rebuilds the rank index and
+    invalidates the score caches.
+    """
+    logger.info(f"Saving sharded recompute of {len(results)} sectors")
+
+    try:
+        from app.infrastructure.database.session import SessionLocal
+        from app.features.stocks.services.sector_service import SectorService
+
+        db = SessionLocal()
+        try:
+            scored_count = SectorService(db).save_sharded_recompute(plan, results)
+            logger.info(f"Recalculated scores for {scored_count} stocks (full, sharded)")
+
+            if scored_count:
+                _invalidate_score_caches()
 
             return {
                 "status": "completed",
+                "mode": "full",
                 "scored_count": scored_count,
-                "sectors_analyzed": len(sector_benchmarks),
+                "shards": len(results),
             }
 
         finally:
             db.close()
 
     except Exception as exc:
-        logger.error(f"Error recalculating scores: {exc}", exc_info=True)
+        logger.error(f"Error saving sharded scores: {exc}", exc_info=True)
         raise self.retry(exc=exc)
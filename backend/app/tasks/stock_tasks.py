@@ -1,7 +1,7 @@
 """Stock-related Celery tasks."""
 import logging
 from .celery_app import celery_app
-from .market_hours import is_market_hours, get_market_status
+from .market_hours import is_market_hours, get_market_status, market_date, market_today
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +13,7 @@ def refresh_stock_data(self):
     This task:
     1. Checks if market is open
     2. Fetches latest quotes for all stocks
-    3. Updates database
+    3. Updates database, advancing indicator states with today's price
     4. Invalidates cache
 
     Scheduled to run hourly during market hours.
@@ -40,6 +40,7 @@ def refresh_stock_data(self):
         from app.infrastructure.database.session import SessionLocal
         from app.infrastructure.repositories import get_stock_repository
         from app.features.integrations.yahoo_finance_client import get_yahoo_finance_client
+        from app.features.stocks.services.indicator_state import IndicatorStateStore
 
         db = SessionLocal()
         try:
@@ -60,6 +61,8 @@ def refresh_stock_data(self):
             quotes = yahoo_client.get_multiple_quotes(tickers)
 
             updated_count = 0
+            today = market_today()
+            today_bars = {}
             for quote in quotes:
                 if quote and quote.get("symbol"):
                     ticker = quote["symbol"]
@@ -69,8 +72,20 @@ def refresh_stock_data(self):
                         stock.market_cap = quote.get("marketCap")
                         db.commit()
                         updated_count += 1
+                        # On a holiday, or for a halted ticker, the quote is an earlier session's close
+                        quote_time = quote.get("regularMarketTime")
+                        if quote.get("regularMarketPrice") and quote_time and market_date(quote_time) == today:
+                            today_bars[stock.id] = (
+                                today,
+                                float(quote["regularMarketPrice"]),
+                                int(quote.get("regularMarketVolume") or 0),
+                            )
 
-            logger.info(f"Successfully refreshed {updated_count} stocks")
+            # Today's bar so far, applied in O(1) per stock
+            states_updated = IndicatorStateStore(db).apply_bars(today_bars)
+            db.commit()
+
+            logger.info(f"Successfully refreshed {updated_count} stocks ({states_updated} indicator states)")
 
             # Invalidate cache after refresh
             invalidate_cache.delay("stocks:*")
@@ -78,6 +93,7 @@ def refresh_stock_data(self):
             return {
                 "status": "completed",
                 "refreshed": updated_count,
+                "indicator_states": states_updated,
                 "total": len(tickers),
                 "time": market_status["current_time_et"],
             }
@@ -131,3 +147,87 @@ def invalidate_cache(self, pattern: str = "*"):
     except Exception as exc:
         logger.error(f"Error invalidating cache: {exc}", exc_info=True)
         raise self.retry(exc=exc)
+
+
+@celery_app.task(bind=True, max_retries=1, default_retry_delay=300)
+def backfill_price_history(self, period: str = None):
+    """Load full price history for every stock into stock_prices.
+
+    Run on demand (e.g. after importing a universe); afterwards the
+    read-through price store only fetches trailing days.
+
+    Args:
+        period: History to load (default: PRICE_STORE_HISTORY_PERIOD)
+
+    Returns:
+        Dict with the number of stocks loaded and price rows written
+    """
+    logger.info("Starting backfill_price_history task")
+
+    try:
+        from app.infrastructure.database.session import SessionLocal
+        from app.features.stocks.models import Stock
+        from app.features.stocks.services.price_data_service import get_price_data_service
+        from app.features.stocks.services.price_store import PriceStore
+        from app.features.stocks.services.indicator_state import IndicatorStateStore
+
+        db = SessionLocal()
+        try:
+            stocks = db.query(Stock).filter(Stock.is_deleted == False).order_by(Stock.ticker).all()  # noqa: E712
+            counts = PriceStore(db, get_price_data_service()).backfill(stocks, period=period)
+            counts["indicator_states"] = IndicatorStateStore(db).sync([stock.id for stock in stocks])
+            db.commit()
+
+            logger.info(f"Price backfill: {counts['stocks']} stocks, {counts['rows']} rows")
+            return {"status": "completed", **counts}
+
+        finally:
+            db.close()
+
+    except Exception as exc:
+        logger.error(f"Error backfilling price history: {exc}", exc_info=True)
+        raise self.retry(exc=exc)
+
+
+@celery_app.task(bind=True, max_retries=1, default_retry_delay=300)
+def update_indicator_states(self):
+    """Bring stored prices up to the last closed session and advance indicator states.
+
+    Trailing prices are fetched concurrently in batches
+    (PriceStore.refresh_many). Each stock's state only consumes bars stored
+    since its as_of date (replacing the intraday bar with the final one), so
+    the update is constant work per stock. Scheduled before the market opens.
+
+    Returns:
+        Dict with the number of stocks refreshed and indicator states updated
+    """
+    logger.info("Starting update_indicator_states task")
+
+    try:
+        from app.infrastructure.database.session import SessionLocal
+        from app.features.stocks.models import Stock
+        from app.features.stocks.services.price_data_service import get_price_data_service
+        from app.features.stocks.services.price_store import PriceStore
+        from app.features.stocks.services.indicator_state import IndicatorStateStore
+
+        db = SessionLocal()
+        try:
+            stocks = db.query(Stock).filter(Stock.is_deleted == False).order_by(Stock.ticker).all()  # noqa: E712
+            refreshed = PriceStore(db, get_price_data_service()).refresh_many(stocks)
+            updated = IndicatorStateStore(db).sync([stock.id for stock in stocks])
+            db.commit()
+
+            logger.info(f"Indicator states: {updated} of {len(stocks)} stocks updated")
+            return {
+                "status": "completed",
+                "stocks": len(stocks),
+                "prices_refreshed": refreshed["stocks"],
+                "indicator_states": updated,
+            }
+
+        finally:
+            db.close()
+
+    except Exception as exc:
+        logger.error(f"Error updating indicator states: {exc}", exc_info=True)
+        raise self.retry(exc=exc)
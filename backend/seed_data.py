@@ -6,6 +6,7 @@ from decimal import Decimal
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+from app.config import settings
 from app.infrastructure.database import Base, engine
 from app.infrastructure.database.session import SessionLocal
 from app.features.stocks.models import (
@@ -106,7 +107,7 @@ def seed_stocks():
 
             # Calculate scores for all stocks
             print("  🎯 Calculating stock scores...")
-            scored_count = sector_service.calculate_scores_for_all_stocks()
+            scored_count = sector_service.calculate_scores_for_all_stocks(workers=settings.SCORING_WORKERS)
             print(f"  ✅ Scored {scored_count} stocks")
 
             # Show sample scores
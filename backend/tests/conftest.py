@@ -5,6 +5,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.features.stocks.services.indicator_cache import get_indicator_cache
 from app.infrastructure.database import Base, get_db
 from main import app
 
@@ -30,6 +31,8 @@ def test_db():
     finally:
         db.close()
         Base.metadata.drop_all(bind=engine)
+        # Cached indicator frames describe this database's prices
+        get_indicator_cache().clear()
 
 
 @pytest.fixture(scope="function")
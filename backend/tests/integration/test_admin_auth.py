@@ -14,6 +14,23 @@ class TestAdminGuardDevOpen:
         response = client.post("/api/stocks/scores/calculate")
         assert response.status_code == status.HTTP_200_OK
 
+    def test_parallel_scores_calculate_dispatches_task(self, client, monkeypatch):
+        from app.tasks import score_tasks
+
+        monkeypatch.setattr(config.settings, "ADMIN_API_KEY", "")
+        monkeypatch.setattr(config.settings, "ENVIRONMENT", "development")
+        calls = []
+
+        def delay(**kwargs):
+            calls.append(kwargs)
+            return type("AsyncResult", (), {"id": "task-1"})()
+        monkeypatch.setattr(score_tasks.recalculate_all_scores, "delay", delay)
+
+        response = client.post("/api/stocks/scores/calculate?parallel=true")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["task_id"] == "task-1"
+        assert calls == [{"incremental": False, "parallel": True}]
+
     def test_cache_invalidate_open_in_dev(self, client, monkeypatch):
         monkeypatch.setattr(config.settings, "ADMIN_API_KEY", "")
         monkeypatch.setattr(config.settings, "ENVIRONMENT", "development")
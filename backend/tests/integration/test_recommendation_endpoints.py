@@ -73,6 +73,32 @@ class TestTopCandidatesEndpoint:
         assert response.json()["candidates"] == []
 
 
+class TestScenariosEndpoint:
+    def test_returns_candidates_per_scenario(self, client, test_db):
+        add_scored_stock(test_db, "MOMO", value=10, quality=10, momentum=24, health=12)
+        add_scored_stock(test_db, "FUND", value=22, quality=22, momentum=6, health=20)
+
+        response = client.post("/api/stocks/recommendations/scenarios", json={
+            "scenarios": [
+                {"name": "long"},
+                {"name": "trend", "weights": {"value": 0, "quality": 0, "momentum": 3, "health": 1}},
+            ],
+            "limit": 1,
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["baseline"] == "long"
+        assert [s["candidates"][0]["ticker"] for s in data["scenarios"]] == ["FUND", "MOMO"]
+        assert data["scenarios"][1]["candidates"][0]["rank_change"] == 1
+
+    def test_invalid_weights_return_400(self, client):
+        response = client.post("/api/stocks/recommendations/scenarios", json={
+            "scenarios": [{"name": "bad", "weights": {"value": 1}}],
+        })
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 class TestTradeSignalsEndpoint:
     def test_returns_signals_and_outlook(self, client, test_db, mock_price_service):
         test_db.add(Stock(ticker="AAPL", name="Apple Inc.", sector="Technology"))
@@ -95,6 +121,44 @@ class TestTradeSignalsEndpoint:
         assert data["outlook"]["stance"] in ("BULLISH", "BEARISH", "NEUTRAL")
         assert "summary" in data["outlook"]
 
+    def test_prices_are_served_from_the_store(self, client, test_db, mock_price_service, monkeypatch):
+        from app.features.stocks.models import StockPrice
+
+        test_db.add(Stock(ticker="AAPL", name="Apple Inc.", sector="Technology"))
+        test_db.commit()
+        first = client.get("/api/stocks/AAPL/trade-signals?period=1y").json()
+
+        def no_fetch(*args, **kwargs):
+            raise AssertionError("provider called for a stored ticker")
+        monkeypatch.setattr(mock_price_service, "fetch_historical_prices", no_fetch)
+        second = client.get("/api/stocks/AAPL/trade-signals?period=1y").json()
+
+        assert test_db.query(StockPrice).count() > 0
+        assert second == first
+
+    def test_detail_endpoints_share_one_indicator_computation(
+        self, client, test_db, mock_price_service, monkeypatch
+    ):
+        test_db.add(Stock(ticker="AAPL", name="Apple Inc.", sector="Technology"))
+        test_db.commit()
+        computations = []
+        calculate = mock_price_service.calculate_technical_indicators
+
+        def counting(df):
+            computations.append(len(df))
+            return calculate(df)
+        monkeypatch.setattr(mock_price_service, "calculate_technical_indicators", counting)
+
+        for path in (
+            "/api/stocks/AAPL/prices/historical?period=1y",
+            "/api/stocks/AAPL/indicators/latest?period=1y",
+            "/api/stocks/AAPL/momentum-score?period=1y",
+            "/api/stocks/AAPL/trade-signals?period=1y",
+        ):
+            assert client.get(path).status_code == status.HTTP_200_OK
+
+        assert len(computations) == 1
+
     def test_unknown_ticker_returns_404(self, client, mock_price_service):
         response = client.get("/api/stocks/NOPE/trade-signals")
         assert response.status_code == status.HTTP_404_NOT_FOUND
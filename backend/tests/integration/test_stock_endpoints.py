@@ -451,3 +451,105 @@ class TestStockEndpointsResponseFormat:
         assert "fundamentals" in data
         assert "created_at" in data
         assert "last_updated" in data
+
+
+class TestScoreRankingEndpoints:
+    """Test rank and percentile fields on detail and leaderboard responses."""
+
+    @pytest.fixture(autouse=True)
+    def reset_rank_index(self):
+        from app.features.stocks.services import score_rank_index
+        score_rank_index._current_index = None
+        yield
+        score_rank_index._current_index = None
+
+    @staticmethod
+    def add_scored_stock(db, ticker, total, sector):
+        stock = Stock(ticker=ticker, name=f"{ticker} Inc.", sector=sector)
+        db.add(stock)
+        db.flush()
+        db.add(StockScore(
+            stock_id=stock.id,
+            total_score=Decimal(str(total)),
+            value_score=Decimal("10"),
+            quality_score=Decimal("10"),
+            momentum_score=Decimal("10"),
+            health_score=Decimal("10"),
+            signal=Signal.BUY,
+        ))
+        db.commit()
+
+    def test_stock_detail_includes_ranking(self, client, test_db):
+        self.add_scored_stock(test_db, "AAA", 80, "Technology")
+        self.add_scored_stock(test_db, "BBB", 60, "Technology")
+        self.add_scored_stock(test_db, "CCC", 70, "Energy")
+
+        data = client.get("/api/stocks/BBB").json()
+
+        assert data["ranking"] == {
+            "rank": 3,
+            "percentile": 33,
+            "ranked_count": 3,
+            "sector_rank": 2,
+            "sector_percentile": 50,
+            "sector_count": 2,
+        }
+
+    def test_leaderboards_include_ranking(self, client, test_db):
+        self.add_scored_stock(test_db, "AAA", 80, "Technology")
+        self.add_scored_stock(test_db, "BBB", 60, "Technology")
+        self.add_scored_stock(test_db, "CCC", 70, "Energy")
+
+        top = client.get("/api/stocks/leaderboard/top").json()
+        by_signal = client.get("/api/stocks/leaderboard/by-signal/BUY").json()
+        sectors = client.get("/api/stocks/leaderboard/sectors").json()
+
+        assert [(s["ticker"], s["rank"], s["percentile"]) for s in top] == [
+            ("AAA", 1, 100), ("CCC", 2, 67), ("BBB", 3, 33)
+        ]
+        assert [s["rank"] for s in by_signal] == [1, 2, 3]
+        assert [(s["ticker"], s["sector_rank"]) for s in sectors["Technology"]] == [("AAA", 1), ("BBB", 2)]
+
+
+class TestScoreHistoryBatchEndpoint:
+    """Test POST /api/stocks/score-history/batch endpoint."""
+
+    def test_returns_columnar_history(self, client, test_db):
+        from datetime import date
+        from app.features.stocks.models import StockScoreHistory
+
+        stock = Stock(ticker="AAA", name="AAA Inc.")
+        test_db.add(stock)
+        test_db.flush()
+        for day, total in [(date(2025, 1, 30), "60"), (date(2025, 1, 31), "62")]:
+            test_db.add(StockScoreHistory(
+                stock_id=stock.id, snapshot_date=day, total_score=Decimal(total),
+                value_score=Decimal("10"), quality_score=Decimal("10"),
+                momentum_score=Decimal("10"), health_score=Decimal("10"), signal=Signal.HOLD,
+            ))
+        test_db.commit()
+
+        response = client.post(
+            "/api/stocks/score-history/batch",
+            json={"tickers": ["aaa", "ZZZ"], "start_date": "2025-01-30", "end_date": "2025-01-31"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["dates"] == ["2025-01-30", "2025-01-31"]
+        assert data["series"]["AAA"]["total_score"] == [60.0, 62.0]
+        assert data["missing"] == ["ZZZ"]
+        assert data["end_date"] == "2025-01-31"
+
+    def test_rejects_inverted_range(self, client):
+        response = client.post(
+            "/api/stocks/score-history/batch",
+            json={"tickers": ["AAA"], "start_date": "2025-02-01", "end_date": "2025-01-01"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_rejects_empty_ticker_list(self, client):
+        response = client.post("/api/stocks/score-history/batch", json={"tickers": []})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
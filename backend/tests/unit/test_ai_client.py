@@ -348,6 +348,45 @@ class TestCompare:
         assert len(result) == 0
 
 
+class TestGetScoreHistory:
+    """Test batch score history functionality."""
+
+    @patch('app.ai_client.client.requests.Session.post')
+    def test_get_score_history_multiple_stocks(self, mock_post):
+        """Test one request returns a date-indexed frame per ticker."""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "dates": ["2025-01-30", "2025-01-31"],
+            "series": {
+                "VOLV-B": {"total_score": [80.0, 82.0], "signal": ["BUY", "BUY"]},
+                "SCVB": {"total_score": [None, 75.0], "signal": [None, "HOLD"]},
+            },
+            "missing": [],
+        }
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        client = AvanzaAIClient()
+        result = client.get_score_history(["VOLV-B", "SCVB"], days=7)
+
+        mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs["json"] == {"tickers": ["VOLV-B", "SCVB"], "days": 7}
+        assert list(result["VOLV-B"]["total_score"]) == [80.0, 82.0]
+        assert result["SCVB"]["signal"].iloc[-1] == "HOLD"
+        assert str(result.index[0].date()) == "2025-01-30"
+
+    @patch('app.ai_client.client.requests.Session.post')
+    def test_get_score_history_request_exception(self, mock_post):
+        """Test score history handles request exceptions."""
+        mock_post.side_effect = requests.exceptions.RequestException("Network error")
+
+        client = AvanzaAIClient()
+        result = client.get_score_history(["VOLV-B"])
+
+        assert isinstance(result, pd.DataFrame)
+        assert len(result) == 0
+
+
 class TestRunCustomScreener:
     """Test custom screener functionality."""
 
@@ -0,0 +1,138 @@
+"""Unit tests for the bulk upsert helpers."""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from app.features.stocks.models import SectorAverage, Signal, Stock, StockPrice, StockScore
+from app.infrastructure.database.bulk import bulk_upsert, copy_upsert
+
+
+def score_row(stock_id, total):
+    return {
+        "stock_id": stock_id,
+        "total_score": Decimal(total),
+        "value_score": Decimal("10"),
+        "quality_score": Decimal("10"),
+        "momentum_score": Decimal("10"),
+        "health_score": Decimal("10"),
+        "signal": Signal.HOLD,
+    }
+
+
+def add_stocks(db, count):
+    stocks = [Stock(ticker=f"UP{i}", name=f"Upsert {i}") for i in range(count)]
+    db.add_all(stocks)
+    db.commit()
+    return [stock.id for stock in stocks]
+
+
+class TestBulkUpsert:
+    def test_inserts_new_rows(self, test_db):
+        stock_ids = add_stocks(test_db, 3)
+
+        written = bulk_upsert(test_db, StockScore, [score_row(i, "50") for i in stock_ids], ["stock_id"])
+        test_db.commit()
+
+        assert written == 3
+        rows = test_db.query(StockScore).all()
+        assert len(rows) == 3
+        assert all(row.id is not None and row.created_at is not None for row in rows)
+
+    def test_updates_existing_rows_in_place(self, test_db):
+        stock_ids = add_stocks(test_db, 2)
+        old_time = datetime(2020, 1, 1)
+        existing = StockScore(**score_row(stock_ids[0], "40"), created_at=old_time, updated_at=old_time)
+        test_db.add(existing)
+        test_db.commit()
+        existing_id = existing.id
+
+        bulk_upsert(test_db, StockScore, [score_row(i, "75.5") for i in stock_ids], ["stock_id"])
+        test_db.commit()
+        test_db.expire_all()
+
+        updated = test_db.query(StockScore).filter(StockScore.stock_id == stock_ids[0]).one()
+        assert updated.id == existing_id
+        assert updated.total_score == Decimal("75.5")
+        assert updated.created_at == old_time
+        assert updated.updated_at > old_time
+        assert test_db.query(StockScore).count() == 2
+
+    def test_batches(self, test_db):
+        stock_ids = add_stocks(test_db, 7)
+
+        bulk_upsert(test_db, StockScore, [score_row(i, "60") for i in stock_ids], ["stock_id"], batch_size=3)
+        test_db.commit()
+
+        assert test_db.query(StockScore).count() == 7
+
+    def test_empty_rows(self, test_db):
+        assert bulk_upsert(test_db, SectorAverage, [], ["sector"]) == 0
+
+    def test_sector_average_upsert(self, test_db):
+        bulk_upsert(test_db, SectorAverage, [{"sector": "Energy", "avg_pe": Decimal("12"), "stock_count": 3}], ["sector"])
+        bulk_upsert(test_db, SectorAverage, [{"sector": "Energy", "avg_pe": None, "stock_count": 4}], ["sector"])
+        test_db.commit()
+
+        average = test_db.query(SectorAverage).one()
+        assert average.avg_pe is None
+        assert average.stock_count == 4
+
+
+def price_frame(stock_id, days, close):
+    start = date(2024, 1, 1)
+    return pd.DataFrame({
+        "stock_id": stock_id,
+        "date": [start + timedelta(days=i) for i in range(days)],
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": pd.array([1000] * days, dtype="Int64"),
+        "adjusted_close": np.nan,
+    })
+
+
+class TestCopyUpsert:
+    def test_inserts_with_defaults(self, test_db):
+        stock_id = add_stocks(test_db, 1)[0]
+
+        written = copy_upsert(test_db, StockPrice, price_frame(stock_id, 30, 10.5), ["stock_id", "date"])
+        test_db.commit()
+
+        assert written == 30
+        rows = test_db.query(StockPrice).order_by(StockPrice.date).all()
+        assert len(rows) == 30 and len({row.id for row in rows}) == 30
+        assert all(row.id.version == 4 for row in rows)
+        assert rows[0].created_at is not None and rows[0].is_deleted is False
+        assert rows[0].close == Decimal("10.5") and rows[0].volume == 1000
+        assert rows[0].adjusted_close is None
+
+    def test_updates_on_conflict_and_last_duplicate_wins(self, test_db):
+        stock_id = add_stocks(test_db, 1)[0]
+        copy_upsert(test_db, StockPrice, price_frame(stock_id, 10, 10.0), ["stock_id", "date"])
+        test_db.commit()
+        first_ids = {row.date: row.id for row in test_db.query(StockPrice)}
+
+        update = pd.concat([price_frame(stock_id, 12, 11.0), price_frame(stock_id, 1, 12.0)], ignore_index=True)
+        written = copy_upsert(test_db, StockPrice, update, ["stock_id", "date"])
+        test_db.commit()
+
+        assert written == 12
+        rows = {row.date: row for row in test_db.query(StockPrice)}
+        assert len(rows) == 12
+        assert rows[date(2024, 1, 1)].close == Decimal("12")
+        assert rows[date(2024, 1, 2)].close == Decimal("11")
+        assert all(rows[day].id == first_id for day, first_id in first_ids.items())
+
+    def test_batches(self, test_db):
+        stock_ids = add_stocks(test_db, 3)
+        frame = pd.concat([price_frame(i, 50, 5.0) for i in stock_ids], ignore_index=True)
+
+        assert copy_upsert(test_db, StockPrice, frame, ["stock_id", "date"], batch_size=7) == 150
+        test_db.commit()
+        assert test_db.query(StockPrice).count() == 150
+
+    def test_empty_frame(self, test_db):
+        assert copy_upsert(test_db, StockPrice, pd.DataFrame(), ["stock_id", "date"]) == 0
@@ -0,0 +1,149 @@
+"""Unit tests for watermark-driven incremental rescoring."""
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from app.features.stocks.models import Stock, StockFundamental, StockPrice, StockScore
+from app.features.stocks.services.indicator_state import IndicatorStateStore
+from app.features.stocks.services.price_data_service import PriceDataService
+from app.features.stocks.services import scoring_context
+from app.features.stocks.services.scoring_context import find_context_drift, get_scoring_context
+from app.features.stocks.services.sector_service import SectorService
+
+
+@pytest.fixture(autouse=True)
+def reset_context():
+    scoring_context._current_context = None
+    yield
+    scoring_context._current_context = None
+
+
+@pytest.fixture
+def universe(test_db):
+    for i in range(20):
+        stock = Stock(ticker=f"S{i}", name=f"Stock {i}", sector="Technology" if i % 2 else "Industrials")
+        test_db.add(stock)
+        test_db.flush()
+        test_db.add(StockFundamental(
+            stock_id=stock.id,
+            pe_ratio=Decimal(10 + i),
+            roe=Decimal(12 + i),
+            roic=Decimal(5 + i),
+            current_ratio=Decimal("1.2"),
+        ))
+    test_db.commit()
+    service = SectorService(test_db)
+    service.calculate_and_cache_sector_averages()
+    service.calculate_scores_for_all_stocks()
+    return service
+
+
+def fundamentals_of(db, ticker):
+    return db.query(StockFundamental).join(Stock).filter(Stock.ticker == ticker).one()
+
+
+class TestIncrementalRescoring:
+    def test_nothing_changed_scores_nothing(self, universe):
+        result = universe.calculate_scores_incremental()
+
+        assert result["mode"] == "incremental"
+        assert result["scored_count"] == 0
+
+    def test_only_changed_stock_is_rescored(self, universe, test_db):
+        f = fundamentals_of(test_db, "S3")
+        f.current_ratio = Decimal("3.0")  # Not part of any benchmark or percentile
+        test_db.commit()
+
+        result = universe.calculate_scores_incremental()
+
+        assert result == {"mode": "incremental", "scored_count": 1, "sectors_analyzed": 2}
+        score = test_db.query(StockScore).filter(StockScore.stock_id == f.stock_id).one()
+        expected = get_scoring_context(test_db).scoring_service().calculate_score(f, "Technology")
+        assert float(score.health_score) == expected.health_score
+
+        # The watermark advanced, so a second run has nothing left to do
+        assert universe.calculate_scores_incremental()["scored_count"] == 0
+
+    def test_sector_change_is_picked_up(self, universe, test_db):
+        stock = test_db.query(Stock).filter(Stock.ticker == "S4").one()
+        stock.sector = "Technology"
+        test_db.commit()
+
+        result = universe.calculate_scores_incremental(tolerance=10.0)
+
+        assert result["mode"] == "incremental"
+        assert result["scored_count"] == 1
+        assert universe.calculate_scores_incremental(tolerance=10.0)["scored_count"] == 0
+
+    def test_market_cap_update_does_not_rescore(self, universe, test_db):
+        stock = test_db.query(Stock).filter(Stock.ticker == "S4").one()
+        stock.market_cap = Decimal("1000000000")  # Refreshed hourly by refresh_stock_data
+        test_db.commit()
+
+        result = universe.calculate_scores_incremental()
+
+        assert result["mode"] == "incremental"
+        assert result["scored_count"] == 0
+
+    def test_new_price_bars_rescore_momentum(self, universe, test_db):
+        stock = test_db.query(Stock).filter(Stock.ticker == "S6").one()
+        prices = PriceDataService().generate_mock_historical_prices("S6", days=250, seed=4)
+        for row in prices.itertuples():
+            test_db.add(StockPrice(stock_id=stock.id, date=pd.Timestamp(row.date).date(),
+                                   open=Decimal(str(row.open)), high=Decimal(str(row.high)),
+                                   low=Decimal(str(row.low)), close=Decimal(str(row.close)),
+                                   volume=int(row.volume)))
+        test_db.commit()
+        IndicatorStateStore(test_db).sync([stock.id])  # E.g. update_indicator_states after the close
+        test_db.commit()
+
+        result = universe.calculate_scores_incremental()
+
+        assert result == {"mode": "incremental", "scored_count": 1, "sectors_analyzed": 2}
+        score = test_db.query(StockScore).filter(StockScore.stock_id == stock.id).one()
+        assert float(score.momentum_score) == universe.load_momentum_scores([stock.id])[0]
+        assert universe.calculate_scores_incremental()["scored_count"] == 0
+
+        # An intraday quote that leaves the momentum score where it was is not a change
+        state = IndicatorStateStore(test_db).load([stock.id])[stock.id]
+        bar = (state.as_of, state.closes[-1] * 1.0001, state.volumes[-1])
+        assert IndicatorStateStore(test_db).apply_bars({stock.id: bar}) == 1
+        test_db.commit()
+        assert universe.calculate_scores_incremental()["scored_count"] == 0
+
+    def test_benchmark_drift_escalates_to_full(self, universe, test_db):
+        f = fundamentals_of(test_db, "S1")
+        f.pe_ratio = Decimal("95")  # Moves the Technology P/E average well past 5%
+        test_db.commit()
+
+        result = universe.calculate_scores_incremental()
+
+        assert result["mode"] == "full"
+        assert "avg_pe" in result["reason"]
+        assert result["scored_count"] == 20
+
+    def test_tolerance_is_configurable(self, universe, test_db):
+        f = fundamentals_of(test_db, "S1")
+        f.pe_ratio = Decimal("95")
+        test_db.commit()
+
+        result = universe.calculate_scores_incremental(tolerance=10.0)
+
+        assert result["mode"] == "incremental"
+        assert result["scored_count"] == 1
+
+    def test_without_prior_context_runs_full(self, test_db):
+        result = SectorService(test_db).calculate_scores_incremental()
+
+        assert result["mode"] == "full"
+
+
+class TestFindContextDrift:
+    def test_percentile_drift_reported(self, universe, test_db):
+        context = get_scoring_context(test_db)
+        p90, p75, p50, p25 = context.roic_percentiles
+
+        assert find_context_drift(context, (p90, p75, p50, p25), context.sector_benchmarks, 0.05) is None
+        reason = find_context_drift(context, (p90 * 2, p75, p50, p25), context.sector_benchmarks, 0.05)
+        assert reason.startswith("ROIC p90")
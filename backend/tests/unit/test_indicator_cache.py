@@ -0,0 +1,144 @@
+"""Unit tests for the shared indicator-frame cache."""
+from datetime import date
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from app.features.stocks.models import Stock, StockPrice
+from app.features.stocks.services import indicator_cache as indicator_cache_module
+from app.features.stocks.services.indicator_cache import (
+    IndicatorCache,
+    get_indicator_frame,
+    indicator_cache_key,
+    last_bar_fingerprint,
+)
+from app.features.stocks.services.price_data_service import PriceDataService
+
+
+class FakeRedis:
+    """Dict-backed stand-in for CacheService."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ttl_seconds=300):
+        self.values[key] = value
+        return True
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(indicator_cache_module, "get_cache_service", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def stock(test_db):
+    stock = Stock(ticker="VOLV-B", name="Volvo")
+    test_db.add(stock)
+    test_db.commit()
+    return stock
+
+
+@pytest.fixture
+def provider():
+    """Mock-data provider that records indicator computations."""
+    service = PriceDataService()
+    service.use_real_api = False
+    spy = MagicMock(wraps=service)
+    spy.use_real_api = False
+    return spy
+
+
+def indicator_frame(days=250):
+    service = PriceDataService()
+    df = service.generate_mock_historical_prices("VOLV-B", days=days, seed=7)
+    df["date"] = pd.to_datetime(df["date"]).dt.normalize()
+    return service.calculate_technical_indicators(df)
+
+
+class TestIndicatorCache:
+    def test_redis_round_trip_is_exact(self, redis):
+        frame = indicator_frame()
+        IndicatorCache(max_entries=4).set("k", frame)
+
+        # A fresh process only has the Redis level
+        restored = IndicatorCache(max_entries=4).get("k")
+
+        pd.testing.assert_frame_equal(restored, frame)
+
+    def test_lru_evicts_least_recently_used(self, redis):
+        cache = IndicatorCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.set(key, indicator_frame(days=5))
+        cache.get("a")
+        cache.set("c", indicator_frame(days=5))
+        redis.values.clear()
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_returns_copies(self, redis):
+        cache = IndicatorCache(max_entries=2)
+        cache.set("k", indicator_frame(days=5))
+
+        cache.get("k")["close"] = 0.0
+
+        assert (cache.get("k")["close"] > 0).all()
+
+    def test_empty_results_are_not_cached(self, redis):
+        cache = IndicatorCache(max_entries=2)
+
+        assert cache.get_or_compute("k", lambda: None) is None
+        assert cache.get("k") is None
+        assert redis.values == {}
+
+
+class TestGetIndicatorFrame:
+    def test_computed_once_per_last_bar(self, test_db, stock, provider, redis):
+        first = get_indicator_frame(test_db, provider, stock, period="1y")
+        second = get_indicator_frame(test_db, provider, stock, period="1y")
+
+        assert provider.calculate_technical_indicators.call_count == 1
+        pd.testing.assert_frame_equal(first, second)
+        assert {"sma_50", "sma_200", "rsi", "volume_sma_20"} <= set(first.columns)
+
+        last_bar = first["date"].iloc[-1].date()
+        key = indicator_cache_key("VOLV-B", "1y", last_bar, last_bar_fingerprint(test_db, stock, last_bar))
+        assert key in redis.values
+
+    def test_periods_are_cached_separately(self, test_db, stock, provider, redis):
+        year = get_indicator_frame(test_db, provider, stock, period="1y")
+        month = get_indicator_frame(test_db, provider, stock, period="1mo")
+
+        assert provider.calculate_technical_indicators.call_count == 2
+        assert len(month) < len(year)
+
+    def test_new_bar_changes_the_key(self, test_db, stock, provider, redis):
+        first = get_indicator_frame(test_db, provider, stock, period="1y")
+        last = first["date"].iloc[-1].date()
+        next_day = date.fromordinal(last.toordinal() + 1)
+        test_db.add(StockPrice(stock_id=stock.id, date=next_day, open=1, high=1, low=1, close=1, volume=1))
+        test_db.commit()
+
+        second = get_indicator_frame(test_db, provider, stock, period="1y")
+
+        assert provider.calculate_technical_indicators.call_count == 2
+        assert second["date"].iloc[-1].date() == next_day
+
+    def test_revised_last_bar_changes_the_key(self, test_db, stock, provider, redis):
+        first = get_indicator_frame(test_db, provider, stock, period="1y")
+        last = first["date"].iloc[-1].date()
+        test_db.query(StockPrice).filter(StockPrice.date == last).update({"close": 1, "volume": 1})
+        test_db.commit()
+
+        second = get_indicator_frame(test_db, provider, stock, period="1y")
+
+        assert provider.calculate_technical_indicators.call_count == 2
+        assert second["close"].iloc[-1] == 1
@@ -0,0 +1,179 @@
+"""Unit tests for incremental technical-indicator state."""
+import math
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from app.features.stocks.models import Stock, StockIndicatorState, StockPrice
+from app.features.stocks.services.indicator_state import (
+    IndicatorStateStore,
+    RollingIndicators,
+)
+from app.features.stocks.services.price_data_service import PriceDataService
+from app.features.stocks.services.price_store import last_complete_session
+
+
+def price_frame(days, seed=11):
+    df = PriceDataService().generate_mock_historical_prices("VOLV-B", days=days, seed=seed)
+    df["date"] = pd.to_datetime(df["date"]).dt.normalize()
+    return df
+
+
+def full_recompute(df):
+    service = PriceDataService()
+    return service.get_latest_indicators(service.calculate_technical_indicators(df))
+
+
+def assert_matches(latest, expected):
+    assert set(latest) == set(expected)
+    for name, value in expected.items():
+        if name == "volume_sma_20":
+            value = float(value)  # get_latest_indicators truncates to int
+            assert latest[name] == pytest.approx(value, abs=1)
+        elif math.isnan(value):
+            assert math.isnan(latest[name])
+        else:
+            assert latest[name] == pytest.approx(value, rel=1e-9, abs=1e-9), name
+
+
+@pytest.fixture
+def stock(test_db):
+    stock = Stock(ticker="VOLV-B", name="Volvo")
+    test_db.add(stock)
+    test_db.commit()
+    return stock
+
+
+def store_prices(db, stock, df):
+    for row in df.itertuples():
+        db.add(StockPrice(stock_id=stock.id, date=row.date.date(), open=Decimal(str(row.open)),
+                          high=Decimal(str(row.high)), low=Decimal(str(row.low)),
+                          close=Decimal(str(row.close)), volume=int(row.volume)))
+    db.commit()
+
+
+class TestRollingIndicators:
+    def test_every_bar_matches_full_recompute(self):
+        df = price_frame(260)
+        state = RollingIndicators()
+
+        for end, row in enumerate(df.itertuples(), start=1):
+            state.push(row.date.date(), row.close, row.volume)
+            if end in (1, 2, 14, 15, 20, 50, 51, 200, 201, 260):
+                assert_matches(state.latest(), full_recompute(df.iloc[:end]))
+
+    def test_flat_prices_keep_rsi_exact(self):
+        closes = [10.0] * 5 + [10.5] * 25
+        state = RollingIndicators()
+        for offset, close in enumerate(closes):
+            state.push(date(2025, 1, 1) + timedelta(days=offset), close, 100)
+
+        df = pd.DataFrame({"date": pd.date_range("2025-01-01", periods=30), "close": closes, "volume": 100})
+        assert state.latest()["rsi"] == full_recompute(df)["rsi"] == 0.0
+
+    def test_same_date_replaces_the_last_bar(self):
+        df = price_frame(60)
+        state = RollingIndicators.from_frame(df.iloc[:-1])
+        last = df.iloc[-1]
+
+        state.push(last["date"].date(), last["close"] * 0.9, 5)  # Intraday quote
+        state.push(last["date"].date(), last["close"], last["volume"])  # Final bar
+
+        assert_matches(state.latest(), full_recompute(df))
+
+    def test_rejects_older_bars(self):
+        state = RollingIndicators.from_frame(price_frame(5))
+
+        with pytest.raises(ValueError):
+            state.push(state.as_of - timedelta(days=1), 1.0, 1)
+
+    def test_round_trip_through_buffers(self):
+        df = price_frame(300)
+        state = RollingIndicators.from_frame(df.iloc[:-1])
+
+        restored = RollingIndicators.from_dict(state.as_of, state.to_dict())
+        last = df.iloc[-1]
+        restored.push(last["date"].date(), last["close"], last["volume"])
+
+        assert len(restored.closes) == 200
+        assert_matches(restored.latest(), full_recompute(df))
+
+
+class TestIndicatorStateStore:
+    def test_sync_builds_then_advances(self, test_db, stock):
+        df = price_frame(400)
+        store_prices(test_db, stock, df.iloc[:-3])
+        store = IndicatorStateStore(test_db)
+
+        assert store.sync([stock.id]) == 1
+        test_db.commit()
+        assert test_db.query(StockIndicatorState).one().as_of == df["date"].iloc[-4].date()
+
+        store_prices(test_db, stock, df.iloc[-3:])
+        store.sync([stock.id])
+        test_db.commit()
+
+        state = test_db.query(StockIndicatorState).one()
+        assert state.as_of == df["date"].iloc[-1].date()
+        assert_matches(store.latest()[stock.id], full_recompute(df))
+
+    def test_unchanged_states_are_not_rewritten(self, test_db, stock):
+        df = price_frame(100)
+        df["date"] = pd.date_range(end=last_complete_session(date.today()), periods=100)
+        store_prices(test_db, stock, df)
+        store = IndicatorStateStore(test_db)
+        store.sync([stock.id])
+        test_db.commit()
+        last = df.iloc[-1]
+
+        assert store.sync([stock.id]) == 0
+        assert store.apply_bars({stock.id: (last["date"].date(), float(last["close"]), int(last["volume"]))}) == 0
+
+    def test_apply_bars_updates_todays_bar(self, test_db, stock):
+        today = date.today()
+        previous = last_complete_session(today)
+        df = price_frame(100)
+        df["date"] = pd.date_range(end=previous, periods=100)
+        store_prices(test_db, stock, df)
+        store = IndicatorStateStore(test_db)
+        store.sync([stock.id])
+
+        assert store.apply_bars({stock.id: (today, 123.0, 1000)}) == 1
+        assert store.apply_bars({stock.id: (today, 124.0, 2000)}) == 1
+        test_db.commit()
+
+        expected = pd.concat([df, pd.DataFrame({"date": [pd.Timestamp(today)], "close": [124.0], "volume": [2000]})])
+        assert_matches(store.latest()[stock.id], full_recompute(expected))
+
+    def test_sync_drops_a_bar_that_was_never_stored(self, test_db, stock):
+        today = date.today()
+        df = price_frame(100)
+        df["date"] = pd.date_range(end=last_complete_session(today), periods=100)
+        store_prices(test_db, stock, df)
+        store = IndicatorStateStore(test_db)
+        store.sync([stock.id])
+        # E.g. a holiday: the quote applied intraday never becomes a stored bar
+        store.apply_bars({stock.id: (today, 500.0, 1000)})
+
+        store.sync([stock.id])
+        test_db.commit()
+
+        assert test_db.query(StockIndicatorState).one().as_of == df["date"].iloc[-1].date()
+        assert_matches(store.latest()[stock.id], full_recompute(df))
+
+    def test_apply_bars_skips_stale_or_missing_states(self, test_db, stock):
+        other = Stock(ticker="ERIC-B", name="Ericsson")
+        test_db.add(other)
+        test_db.commit()
+        df = price_frame(30)
+        df["date"] = pd.date_range(end=date.today() - timedelta(days=10), periods=30)
+        store_prices(test_db, stock, df)
+        store = IndicatorStateStore(test_db)
+        store.sync([stock.id, other.id])
+
+        written = store.apply_bars({stock.id: (date.today(), 1.0, 1), other.id: (date.today(), 1.0, 1)})
+
+        assert written == 0
+        assert test_db.query(StockIndicatorState).one().as_of == df["date"].iloc[-1].date()
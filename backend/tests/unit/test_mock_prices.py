@@ -0,0 +1,62 @@
+"""Unit tests for the vectorized mock price generator."""
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from app.features.stocks.services.price_data_service import PriceDataService, mock_seed
+
+
+def test_mock_seed_is_stable():
+    assert mock_seed("VOLV-B") == zlib.crc32(b"VOLV-B")
+    assert mock_seed("VOLV-B") != mock_seed("SCVB")
+
+
+class TestGenerateMockHistoricalPrices:
+    def test_shape_and_ohlc_invariants(self):
+        df = PriceDataService().generate_mock_historical_prices("VOLV-B", days=1825)
+
+        assert list(df.columns) == ["date", "open", "high", "low", "close", "volume"]
+        assert len(df) == 1825
+        assert df["date"].is_monotonic_increasing
+        assert (df["low"] <= df["close"]).all() and (df["close"] <= df["high"]).all()
+        assert (df["low"] <= df["open"]).all() and (df["open"] <= df["high"]).all()
+        assert (df["close"] >= 0.01).all()
+        assert (df["volume"] > 0).all()
+        assert df["close"].iloc[0] == 100.0
+        assert df.attrs["source"] == "mock"
+
+    def test_same_ticker_same_series(self):
+        service = PriceDataService()
+
+        first = service.generate_mock_historical_prices("VOLV-B", days=365)
+        second = service.generate_mock_historical_prices("VOLV-B", days=365)
+        other = service.generate_mock_historical_prices("SCVB", days=365)
+
+        pd.testing.assert_frame_equal(first.drop(columns="date"), second.drop(columns="date"))
+        assert not np.array_equal(first["close"].values, other["close"].values)
+
+    def test_does_not_touch_global_random_state(self):
+        np.random.seed(7)
+        expected = np.random.random()
+        np.random.seed(7)
+
+        PriceDataService().generate_mock_historical_prices("VOLV-B", days=100)
+
+        assert np.random.random() == expected
+
+    def test_concurrent_calls_are_reproducible(self):
+        service = PriceDataService()
+        service.use_real_api = False
+        tickers = [f"T{i}" for i in range(8)] * 4
+
+        expected = {t: service.fetch_historical_prices(t, period="5y")["close"].tolist() for t in set(tickers)}
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda t: service.fetch_historical_prices(t, period="5y"), tickers))
+
+        for ticker, df in zip(tickers, results):
+            assert df["close"].tolist() == expected[ticker]
+
+    def test_zero_days(self):
+        assert PriceDataService().generate_mock_historical_prices("VOLV-B", days=0).empty
@@ -0,0 +1,124 @@
+"""Unit tests for per-stock and universe-wide momentum scoring."""
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.features.stocks.models import Stock, StockFundamental, StockIndicatorState, StockScore
+from app.features.stocks.services import scoring_context
+from app.features.stocks.services.momentum_service import MomentumScoringService
+from app.features.stocks.services.price_data_service import PriceDataService
+from app.features.stocks.services.price_store import PriceStore
+from app.features.stocks.services.sector_service import SectorService
+
+
+@pytest.fixture(autouse=True)
+def reset_context():
+    scoring_context._current_context = None
+    yield
+    scoring_context._current_context = None
+
+
+class TestMomentumLadders:
+    def test_band_edges(self):
+        service = MomentumScoringService()
+
+        # ">= bound" bands: the bound itself belongs to the higher band
+        assert [service._score_price_vs_sma50(v) for v in (-10.01, -10, -5, -2, 0, 2, 5, 10)] == [
+            0.0, 1.0, 2.0, 3.0, 4.5, 6.0, 7.0, 4.0,
+        ]
+        assert [service._score_price_vs_sma200(v) for v in (-20.01, -20, -10, -5, 0, 5, 10, 20)] == [
+            0.0, 1.0, 2.0, 3.0, 4.5, 6.0, 7.0, 5.0,
+        ]
+        assert [service._score_rsi(v) for v in (19.9, 20, 30, 40, 60, 70, 80)] == [1.0, 3.0, 5.0, 6.0, 5.0, 3.0, 1.0]
+        assert [service._score_volume_trend(v) for v in (-50.1, -50, -20, 0, 20, 50, 100)] == [
+            0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 4.0,
+        ]
+
+    def test_batch_matches_per_stock(self):
+        rng = np.random.default_rng(5)
+        n = 500
+        columns = {
+            "price": rng.uniform(10, 100, n),
+            "price_vs_sma50": rng.uniform(-15, 15, n),
+            "price_vs_sma200": rng.uniform(-30, 30, n),
+            "rsi": rng.uniform(0, 100, n),
+            "volume_trend": rng.uniform(-80, 150, n),
+        }
+        columns["rsi"][:5] = np.nan
+        service = MomentumScoringService()
+
+        batch = service.score_batch(columns)
+
+        expected = [
+            service.calculate_momentum_score({name: column[i] for name, column in columns.items()})[0]
+            for i in range(n)
+        ]
+        np.testing.assert_array_equal(batch, expected)
+
+    def test_stocks_without_indicators_are_neutral(self):
+        columns = {name: np.array([np.nan]) for name in
+                   ("price", "price_vs_sma50", "price_vs_sma200", "rsi", "volume_trend")}
+
+        assert MomentumScoringService().score_batch(columns).tolist() == [12.5]
+
+
+class TestRecomputeMomentum:
+    def test_full_recompute_stores_real_momentum(self, test_db):
+        stocks = []
+        for i in range(6):
+            stock = Stock(ticker=f"M{i}", name=f"Momentum {i}", sector="Technology")
+            test_db.add(stock)
+            test_db.flush()
+            test_db.add(StockFundamental(stock_id=stock.id, pe_ratio=Decimal(12 + i), roic=Decimal(8 + i)))
+            stocks.append(stock)
+        test_db.commit()
+        provider = PriceDataService()
+        provider.use_real_api = False
+        PriceStore(test_db, provider).backfill(stocks[:5], period="1y")
+
+        service = SectorService(test_db)
+        service.calculate_and_cache_sector_averages()
+        service.calculate_scores_for_all_stocks()
+
+        momentum = MomentumScoringService()
+        store = PriceStore(test_db, provider)
+        for stock in stocks[:5]:
+            indicators = provider.get_latest_indicators(
+                provider.calculate_technical_indicators(store.load_period(stock, "1y"))
+            )
+            expected, _ = momentum.calculate_momentum_score(indicators)
+            score = test_db.query(StockScore).filter(StockScore.stock_id == stock.id).one()
+            assert float(score.momentum_score) == pytest.approx(expected)
+            assert float(score.total_score) == pytest.approx(float(
+                score.value_score + score.quality_score + score.momentum_score + score.health_score
+            ))
+        # No prices: neutral momentum, no state
+        unpriced = test_db.query(StockScore).filter(StockScore.stock_id == stocks[5].id).one()
+        assert float(unpriced.momentum_score) == 12.5
+        assert test_db.query(StockIndicatorState).count() == 5
+
+    def test_incremental_rescore_uses_momentum(self, test_db):
+        stock = Stock(ticker="INC", name="Incremental", sector="Technology")
+        test_db.add(stock)
+        test_db.flush()
+        test_db.add(StockFundamental(stock_id=stock.id, pe_ratio=Decimal(12), roic=Decimal(8)))
+        test_db.commit()
+        service = SectorService(test_db)
+        service.calculate_and_cache_sector_averages()
+        service.calculate_scores_for_all_stocks()
+
+        provider = PriceDataService()
+        provider.use_real_api = False
+        PriceStore(test_db, provider).backfill([stock], period="1y")
+        fundamentals = test_db.query(StockFundamental).one()
+        fundamentals.pe_ratio = Decimal(13)
+        test_db.commit()
+
+        assert service.calculate_scores_incremental(tolerance=100.0)["mode"] == "incremental"
+
+        indicators = provider.get_latest_indicators(
+            provider.calculate_technical_indicators(PriceStore(test_db, provider).load_period(stock, "1y"))
+        )
+        expected, _ = MomentumScoringService().calculate_momentum_score(indicators)
+        assert float(test_db.query(StockScore).one().momentum_score) == pytest.approx(expected)
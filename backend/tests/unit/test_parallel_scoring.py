@@ -0,0 +1,113 @@
+"""Unit tests for sector-sharded parallel scoring."""
+import json
+import multiprocessing
+import random
+
+import numpy as np
+import pytest
+
+from app.features.stocks.models import Stock, StockFundamental, StockScore
+from app.features.stocks.services.parallel_scoring import score_batch_by_sector, shard_by_sector
+from app.features.stocks.services.scoring_service import (
+    ScoringService,
+    encode_sectors,
+    fundamentals_to_columns,
+)
+from app.features.stocks.services.sector_service import SectorService
+
+from .test_scoring_batch import SECTORS, make_benchmarks, random_fundamentals
+
+
+class TestShardBySector:
+    def test_one_shard_per_code(self):
+        shards = shard_by_sector(np.array([1, -1, 0, 1, 0, -1]))
+
+        assert [list(rows) for rows in shards] == [[1, 5], [2, 4], [0, 3]]
+
+
+class TestScoreBatchBySector:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_matches_single_pass(self, workers):
+        rng = random.Random(11)
+        fundamentals = random_fundamentals(rng, 600)
+        sectors = [rng.choice(SECTORS) for _ in fundamentals]
+        service = ScoringService(fundamentals, make_benchmarks())
+        columns = fundamentals_to_columns(fundamentals)
+        codes, names = encode_sectors(sectors)
+        momentum = np.array([rng.choice([0.0, 12.5, 20.0]) for _ in fundamentals])
+
+        expected = service.score_batch(columns, codes, names, momentum_scores=momentum)
+        sharded = score_batch_by_sector(service, columns, codes, names, momentum_scores=momentum, workers=workers)
+
+        np.testing.assert_array_equal(sharded.total_score, expected.total_score)
+        np.testing.assert_array_equal(sharded.value_score, expected.value_score)
+        np.testing.assert_array_equal(sharded.quality_score, expected.quality_score)
+        np.testing.assert_array_equal(sharded.momentum_score, expected.momentum_score)
+        np.testing.assert_array_equal(sharded.health_score, expected.health_score)
+        np.testing.assert_array_equal(sharded.signal_codes, expected.signal_codes)
+
+    def test_daemonic_process_scores_in_process(self, monkeypatch):
+        from app.features.stocks.services import parallel_scoring
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("worker pool started in a daemonic process")
+        monkeypatch.setattr(multiprocessing.current_process(), "daemon", True)
+        monkeypatch.setattr(parallel_scoring, "ProcessPoolExecutor", no_pool)
+        rng = random.Random(3)
+        fundamentals = random_fundamentals(rng, 50)
+        service = ScoringService(fundamentals, make_benchmarks())
+        codes, names = encode_sectors([rng.choice(SECTORS) for _ in fundamentals])
+        columns = fundamentals_to_columns(fundamentals)
+
+        sharded = score_batch_by_sector(service, columns, codes, names, workers=4)
+
+        expected = service.score_batch(columns, codes, names)
+        np.testing.assert_array_equal(sharded.total_score, expected.total_score)
+
+
+def _seed_universe(test_db, count=30):
+    rng = random.Random(5)
+    for i, f in enumerate(random_fundamentals(rng, count)):
+        stock = Stock(ticker=f"PAR{i}", name=f"Parallel {i}", sector=rng.choice(SECTORS + [None]))
+        test_db.add(stock)
+        test_db.flush()
+        test_db.add(StockFundamental(stock_id=stock.id, **vars(f)))
+    test_db.commit()
+
+
+class TestParallelRecompute:
+    def test_parallel_recompute_matches_sequential(self, test_db):
+        _seed_universe(test_db)
+        sector_service = SectorService(test_db)
+        sector_service.calculate_and_cache_sector_averages()
+        sector_service.calculate_scores_for_all_stocks()
+        sequential = {s.stock_id: (s.total_score, s.signal) for s in test_db.query(StockScore).all()}
+
+        scored = sector_service.calculate_scores_for_all_stocks(workers=2)
+
+        parallel = {s.stock_id: (s.total_score, s.signal) for s in test_db.query(StockScore).all()}
+        assert scored == 30
+        assert parallel == sequential
+
+
+class TestShardedRecompute:
+    def test_sharded_recompute_matches_sequential(self, test_db):
+        _seed_universe(test_db)
+        sector_service = SectorService(test_db)
+        sector_service.calculate_and_cache_sector_averages()
+        sector_service.calculate_scores_for_all_stocks()
+        sequential = {s.stock_id: (s.total_score, s.signal) for s in test_db.query(StockScore).all()}
+
+        # Plan and shard results travel as Celery (JSON) task arguments
+        plan = json.loads(json.dumps(sector_service.plan_sharded_recompute()))
+        shards = plan.pop("shards")
+        results = [
+            json.loads(json.dumps(SectorService(test_db).score_shard(plan, shard)))
+            for shard in shards
+        ]
+        scored = SectorService(test_db).save_sharded_recompute(plan, results)
+
+        sharded = {s.stock_id: (s.total_score, s.signal) for s in test_db.query(StockScore).all()}
+        assert len(shards) == len({stock.sector for stock in test_db.query(Stock).all()})
+        assert scored == 30
+        assert sharded == sequential
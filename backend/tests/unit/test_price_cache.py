@@ -0,0 +1,196 @@
+"""Unit tests for the memory-mapped on-disk price cache."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.config import settings
+from app.features.stocks.models import Stock, StockPrice
+from app.features.stocks.services import price_cache as price_cache_module
+from app.features.stocks.services.price_cache import MAX_SEGMENTS, PriceCache
+from app.features.stocks.services.price_data_service import PriceDataService
+from app.features.stocks.services.price_store import PriceStore
+
+
+def prices(start, days, close=100.0):
+    return pd.DataFrame({
+        "date": pd.date_range(start, periods=days),
+        "open": close, "high": close + 1, "low": close - 1,
+        "close": np.linspace(close, close + days - 1, days),
+        "volume": np.arange(days, dtype=np.int64) * 10,
+    })
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PriceCache(str(tmp_path / "prices"), max_bytes=10 * 1024 * 1024)
+
+
+def segments(cache, ticker):
+    return sorted(path.name for path in (cache.directory / ticker).glob("*.arrow"))
+
+
+class TestPriceCache:
+    def test_round_trip_is_memory_mapped(self, cache):
+        df = prices("2025-01-01", 300)
+        cache.write("VOLV-B", df)
+
+        cached = cache.read("VOLV-B")
+
+        pd.testing.assert_frame_equal(cached, df)
+        # Columns are read-only views of the mapped file, not copies
+        assert not cached["close"].to_numpy().flags.writeable
+        assert cache.read("ERIC-B") is None
+
+    def test_read_from_a_date(self, cache):
+        cache.write("VOLV-B", prices("2025-01-01", 30))
+
+        cached = cache.read("VOLV-B", start=pd.Timestamp("2025-01-21"))
+
+        assert cached["date"].iloc[0] == pd.Timestamp("2025-01-21")
+        assert len(cached) == 10
+        assert list(cached.index) == list(range(10))
+
+    def test_new_bars_are_appended_as_a_segment(self, cache):
+        df = prices("2025-01-01", 40)
+        cache.write("VOLV-B", df.iloc[:30])
+
+        cache.merge("VOLV-B", df.iloc[30:])
+
+        assert segments(cache, "VOLV-B") == ["20250101.arrow", "20250131.arrow"]
+        pd.testing.assert_frame_equal(cache.read("VOLV-B"), df)
+
+    def test_overlapping_bars_rewrite(self, cache):
+        df = prices("2025-01-01", 30)
+        cache.write("VOLV-B", df)
+        revised = df.iloc[-1:].copy()
+        revised["close"] = 1.0
+
+        cache.merge("VOLV-B", revised)
+
+        cached = cache.read("VOLV-B")
+        assert segments(cache, "VOLV-B") == ["20250101.arrow"]
+        assert len(cached) == 30
+        assert cached["close"].iloc[-1] == 1.0
+
+    def test_segments_are_compacted(self, cache):
+        df = prices("2025-01-01", MAX_SEGMENTS + 1)
+        cache.write("VOLV-B", df.iloc[:1])
+        for day in range(1, MAX_SEGMENTS + 1):
+            cache.merge("VOLV-B", df.iloc[day:day + 1])
+
+        assert len(segments(cache, "VOLV-B")) == 1
+        pd.testing.assert_frame_equal(cache.read("VOLV-B"), df)
+
+    def test_least_recently_used_tickers_are_evicted(self, tmp_path):
+        df = prices("2025-01-01", 1000)
+        probe = PriceCache(str(tmp_path / "probe"), max_bytes=1 << 30)
+        probe.write("X", df)
+        cache = PriceCache(str(tmp_path / "prices"), max_bytes=int(probe.size_bytes() * 2.5))
+
+        cache.write("A", df)
+        cache.write("B", df)
+        cache.read("A")  # A is now more recently used than B
+        cache.write("C", df)
+
+        assert cache.read("B") is None
+        assert cache.read("A") is not None and cache.read("C") is not None
+        assert cache.size_bytes() <= cache.max_bytes
+
+
+class TestPriceStoreWithCache:
+    @pytest.fixture
+    def enabled(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "PRICE_CACHE_ENABLED", True)
+        monkeypatch.setattr(settings, "PRICE_CACHE_DIR", str(tmp_path / "prices"))
+        monkeypatch.setattr(price_cache_module, "_price_cache", None)
+        return price_cache_module.get_price_cache
+
+    @pytest.fixture
+    def stock(self, test_db):
+        stock = Stock(ticker="VOLV-B", name="Volvo")
+        test_db.add(stock)
+        test_db.commit()
+        return stock
+
+    @pytest.fixture
+    def provider(self):
+        service = PriceDataService()
+        service.use_real_api = False
+        return service
+
+    def test_served_from_cache_and_kept_current(self, test_db, stock, provider, enabled):
+        store = PriceStore(test_db, provider)
+        first = store.get_prices(stock, period="1y")
+        cache = enabled()
+
+        assert cache.read("VOLV-B") is not None
+        pd.testing.assert_frame_equal(first, store.load(stock, first["date"].iloc[0].date()))
+
+        # A bar stored by another process is appended on the next read
+        next_day = first["date"].iloc[-1].date() + timedelta(days=1)
+        test_db.add(StockPrice(stock_id=stock.id, date=next_day, open=Decimal("1"), high=Decimal("1"),
+                               low=Decimal("1"), close=Decimal("1.5"), volume=7))
+        test_db.commit()
+        second = store.load_period(stock, "1y")
+
+        assert second["date"].iloc[-1].date() == next_day
+        assert second["close"].iloc[-1] == 1.5
+        assert len(segments(cache, "VOLV-B")) == 2
+
+        # A revised last bar is merged in
+        test_db.query(StockPrice).filter(StockPrice.date == next_day).update({"close": Decimal("2.5")})
+        test_db.commit()
+
+        assert store.load_period(stock, "1y")["close"].iloc[-1] == 2.5
+
+    def test_revised_bars_are_merged_into_the_cache(self, test_db, stock, provider, enabled):
+        store = PriceStore(test_db, provider)
+        store.get_prices(stock, period="1y")
+        cache = enabled()
+        revised = store.load(stock, date.min).iloc[-30:].reset_index(drop=True)
+        revised.loc[:9, ["open", "close"]] = [1.0, 2.0]
+
+        store._append(stock, revised)
+
+        pd.testing.assert_frame_equal(cache.read("VOLV-B"), store.load(stock, date.min))
+
+    def test_unchanged_bars_leave_the_cache_alone(self, test_db, stock, provider, enabled, monkeypatch):
+        store = PriceStore(test_db, provider)
+        store.get_prices(stock, period="1y")
+        cache = enabled()
+        stored = store.load(stock, date.min)
+        before = segments(cache, "VOLV-B")
+
+        def unexpected(*args, **kwargs):
+            raise AssertionError("cached bars rewritten")
+        # A trailing refresh: the last stored bar again, unchanged, plus a new one
+        trailing = stored.iloc[-1:]
+        trailing = pd.concat([trailing, trailing.assign(date=trailing["date"] + pd.Timedelta(days=1))])
+        with monkeypatch.context() as patch:
+            patch.setattr(cache, "merge", unexpected)
+            patch.setattr(cache, "invalidate", unexpected)
+            store._append(stock, trailing)
+
+        assert segments(cache, "VOLV-B") == before
+        assert len(store.load_period(stock, "5y")) == len(stored) + 1
+        assert len(segments(cache, "VOLV-B")) == len(before) + 1
+
+    def test_partly_rewritten_range_invalidates_the_cache(self, test_db, stock, provider, enabled):
+        store = PriceStore(test_db, provider)
+        store.get_prices(stock, period="1y")
+        cache = enabled()
+        revised = store.load(stock, date.min).iloc[-30:-20].assign(open=1.0, close=2.0)
+
+        store._append(stock, revised)
+
+        assert cache.read("VOLV-B") is None
+        reloaded = store.load_period(stock, "1y")
+        assert (reloaded.set_index("date").loc[revised["date"], "close"] == 2.0).all()
+
+    def test_disabled_by_default(self):
+        assert price_cache_module.get_price_cache() is None
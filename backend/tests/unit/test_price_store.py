@@ -0,0 +1,169 @@
+"""Unit tests for the read-through price store."""
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.features.stocks.models import Stock, StockPrice
+from app.features.stocks.services.price_data_service import PriceDataService
+from app.features.stocks.services.price_store import PriceStore, last_complete_session
+
+
+@pytest.fixture
+def stock(test_db):
+    stock = Stock(ticker="VOLV-B", name="Volvo")
+    test_db.add(stock)
+    test_db.commit()
+    return stock
+
+
+@pytest.fixture
+def provider():
+    """Mock-data provider that records calls."""
+    service = PriceDataService()
+    service.use_real_api = False
+    spy = MagicMock(wraps=service)
+    spy.use_real_api = False
+    return spy
+
+
+def add_prices(db, stock, days):
+    for day in days:
+        db.add(StockPrice(stock_id=stock.id, date=day, open=Decimal("10"), high=Decimal("11"),
+                          low=Decimal("9"), close=Decimal("10.5"), volume=1000))
+    db.commit()
+
+
+def test_last_complete_session():
+    assert last_complete_session(date(2025, 1, 29)) == date(2025, 1, 28)  # Wednesday
+    assert last_complete_session(date(2025, 1, 27)) == date(2025, 1, 24)  # Monday -> Friday
+    assert last_complete_session(date(2025, 1, 26)) == date(2025, 1, 24)  # Sunday -> Friday
+
+
+class TestPriceStore:
+    def test_new_ticker_is_loaded_once(self, test_db, stock, provider):
+        store = PriceStore(test_db, provider)
+
+        first = store.get_prices(stock, period="1y")
+        second = store.get_prices(stock, period="5y")
+
+        provider.fetch_historical_prices.assert_called_once_with("VOLV-B", period="5y")
+        provider.fetch_prices_since.assert_not_called()
+        assert test_db.query(StockPrice).count() == 1825
+        assert 360 <= len(first) <= 366
+        assert len(second) == 1825
+        assert list(first.columns) == ["date", "open", "high", "low", "close", "volume"]
+        assert first["date"].is_monotonic_increasing
+        assert first["close"].dtype == float
+
+    def test_fetches_only_missing_trailing_days(self, test_db, stock, provider):
+        today = date.today()
+        stored = [today - timedelta(days=offset) for offset in range(30, 5, -1)]
+        add_prices(test_db, stock, stored)
+
+        df = PriceStore(test_db, provider).get_prices(stock, period="1mo")
+
+        provider.fetch_historical_prices.assert_not_called()
+        provider.fetch_prices_since.assert_called_once_with("VOLV-B", stored[-1], start_price=10.5)
+        assert df["date"].iloc[-1].date() == today
+        assert test_db.query(StockPrice).count() == 31
+        # The last stored bar was refreshed in place
+        assert test_db.query(StockPrice).filter(StockPrice.date == stored[-1]).count() == 1
+
+    def test_current_store_needs_no_fetch(self, test_db, stock, provider):
+        add_prices(test_db, stock, [last_complete_session(date.today())])
+
+        df = PriceStore(test_db, provider).get_prices(stock)
+
+        provider.fetch_historical_prices.assert_not_called()
+        provider.fetch_prices_since.assert_not_called()
+        assert len(df) == 1
+
+    def test_trailing_days_are_requested_once_a_day(self, test_db, stock, provider):
+        # E.g. a halted ticker: the provider has nothing newer than the stored bar
+        stale = last_complete_session(date.today()) - timedelta(days=7)
+        add_prices(test_db, stock, [stale])
+        provider.fetch_prices_since.return_value = None
+        store = PriceStore(test_db, provider)
+
+        assert store.refresh(stock) == stale
+        assert store.refresh(stock) == stale
+        assert PriceStore(test_db, provider).refresh(stock) == stale
+
+        provider.fetch_prices_since.assert_called_once()
+        assert stock.prices_checked_on == date.today()
+
+    def test_fallback_mock_data_is_served_but_not_stored(self, test_db, stock):
+        service = PriceDataService()
+        service.use_real_api = True
+        service.fetch_historical_prices_yahoo = MagicMock(return_value=None)
+
+        df = PriceStore(test_db, service).get_prices(stock, period="3mo")
+
+        assert 85 <= len(df) <= 91
+        assert test_db.query(StockPrice).count() == 0
+
+    def test_no_data(self, test_db, stock):
+        service = MagicMock()
+        service.fetch_historical_prices.return_value = pd.DataFrame()
+
+        assert PriceStore(test_db, service).get_prices(stock) is None
+
+
+class TestRefreshMany:
+    def test_fetches_only_stale_stocks_once_a_day(self, test_db, stock, provider):
+        current = Stock(ticker="ERIC-B", name="Ericsson")
+        new = Stock(ticker="SAND", name="Sandvik")
+        test_db.add_all([current, new])
+        test_db.commit()
+        today = date.today()
+        stale = [today - timedelta(days=offset) for offset in range(30, 5, -1)]
+        add_prices(test_db, stock, stale)
+        add_prices(test_db, current, [last_complete_session(today)])
+        store = PriceStore(test_db, provider)
+
+        counts = store.refresh_many([stock, current, new])
+
+        assert counts["stocks"] == 2
+        provider.fetch_prices_since.assert_called_once_with("VOLV-B", stale[-1], start_price=10.5)
+        provider.fetch_historical_prices.assert_called_once_with("SAND", period="5y")
+        assert store.refresh(stock) == today
+        assert test_db.query(StockPrice).filter(StockPrice.stock_id == new.id).count() == 1825
+        assert stock.prices_checked_on == today
+
+        assert store.refresh_many([stock, current, new]) == {"stocks": 0, "rows": 0}
+
+
+class TestBackfill:
+    def test_loads_every_stock(self, test_db, provider):
+        stocks = [Stock(ticker=f"BF{i}", name=f"Backfill {i}") for i in range(3)]
+        test_db.add_all(stocks)
+        test_db.commit()
+
+        counts = PriceStore(test_db, provider).backfill(stocks, period="3mo")
+
+        assert counts == {"stocks": 3, "rows": 270}
+        assert test_db.query(StockPrice).count() == 270
+        provider.fetch_historical_prices.assert_any_call("BF2", period="3mo")
+
+
+def test_prepare_price_frame_keeps_local_trading_date():
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2025-01-30 00:00", "2025-01-31 00:00"]).tz_localize("America/New_York"),
+        "open": [1.123456, 2.0],
+        "high": [1.5, 2.5],
+        "low": [1.0, 1.9],
+        "close": [1.25, 2.25],
+        "volume": [100.0, np.nan],
+    })
+
+    frame = PriceDataService().prepare_price_frame(df, "stock-id")
+
+    assert frame["date"].tolist() == [date(2025, 1, 30), date(2025, 1, 31)]
+    assert frame["open"].tolist() == [1.1235, 2.0]
+    assert frame["adjusted_close"].tolist() == [1.25, 2.25]
+    assert frame["volume"].isna().tolist() == [False, True]
+    assert (frame["stock_id"] == "stock-id").all()
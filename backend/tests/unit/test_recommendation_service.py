@@ -8,6 +8,7 @@ from app.features.stocks.services.recommendation_service import (
     RecommendationService,
     HORIZON_PROFILES,
     get_horizon_profiles,
+    weight_vector,
 )
 
 
@@ -94,3 +95,74 @@ class TestGetTopCandidates:
             assert field in candidate
         # Perfect-score sanity: horizon score is on a 0-100 scale.
         assert 0 <= candidate["horizon_score"] <= 100
+
+
+class TestWeightVector:
+    def test_normalizes_to_one(self):
+        vector = weight_vector({"value": 2, "quality": 1, "momentum": 1, "health": 0})
+
+        assert list(vector) == [0.5, 0.25, 0.25, 0.0]
+
+    @pytest.mark.parametrize("weights", [
+        {"value": 1, "quality": 1, "momentum": 1},
+        {"value": 1, "quality": 1, "momentum": 1, "health": 1, "growth": 1},
+        {"value": -1, "quality": 1, "momentum": 1, "health": 1},
+        {"value": 0, "quality": 0, "momentum": 0, "health": 0},
+    ])
+    def test_invalid_weights_raise(self, weights):
+        with pytest.raises(ValueError):
+            weight_vector(weights)
+
+
+class TestRunScenarios:
+    def test_matches_horizon_rankings(self, test_db):
+        for i in range(8):
+            add_scored_stock(test_db, f"TICK{i}", value=5 + i * 2, quality=20 - i,
+                             momentum=(i * 7) % 25, health=10 + i)
+        service = RecommendationService(test_db)
+
+        result = service.run_scenarios([{"name": "short"}, {"name": "long"}], limit=5)
+
+        for scenario in result["scenarios"]:
+            expected = service.get_top_candidates(scenario["name"], limit=5)["candidates"]
+            assert [c["ticker"] for c in scenario["candidates"]] == [c["ticker"] for c in expected]
+            assert [c["scenario_score"] for c in scenario["candidates"]] == \
+                [c["horizon_score"] for c in expected]
+
+    def test_rank_movement_against_baseline(self, test_db):
+        add_scored_stock(test_db, "MOMO", value=10, quality=10, momentum=24, health=12)
+        add_scored_stock(test_db, "FUND", value=22, quality=22, momentum=6, health=20)
+
+        result = RecommendationService(test_db).run_scenarios(
+            [
+                {"name": "fundamentals", "weights": {"value": 1, "quality": 1, "momentum": 0, "health": 1}},
+                {"name": "momentum_only", "weights": {"value": 0, "quality": 0, "momentum": 1, "health": 0}},
+            ],
+        )
+
+        assert result["baseline"] == "fundamentals"
+        assert result["universe_size"] == 2
+        baseline, momentum = result["scenarios"]
+        assert [c["rank_change"] for c in baseline["candidates"]] == [0, 0]
+        top = momentum["candidates"][0]
+        assert (top["ticker"], top["rank"], top["baseline_rank"], top["rank_change"]) == ("MOMO", 1, 2, 1)
+        assert momentum["weights"] == {"value": 0.0, "quality": 0.0, "momentum": 1.0, "health": 0.0}
+
+    def test_ties_share_competition_rank(self, test_db):
+        add_scored_stock(test_db, "AAA", 20, 20, 20, 20)
+        add_scored_stock(test_db, "BBB", 20, 20, 20, 20)
+        add_scored_stock(test_db, "CCC", 10, 10, 10, 10)
+
+        candidates = RecommendationService(test_db).run_scenarios([{"name": "medium"}])["scenarios"][0]["candidates"]
+
+        assert [c["rank"] for c in candidates] == [1, 1, 3]
+
+    @pytest.mark.parametrize("scenarios, baseline", [
+        ([], None),
+        ([{"name": "custom"}], None),
+        ([{"name": "short"}, {"name": "short"}], None),
+        ([{"name": "short"}], "long"),
+    ])
+    def test_invalid_requests_raise(self, test_db, scenarios, baseline):
+        with pytest.raises(ValueError):
+            RecommendationService(test_db).run_scenarios(scenarios, baseline=baseline)
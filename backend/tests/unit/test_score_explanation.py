@@ -0,0 +1,53 @@
+"""Unit tests for lazily generated score explanations."""
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.features.stocks.services.scoring_service import ScoreBreakdown, ScoringService
+
+
+def fundamentals(**overrides):
+    values = dict(
+        pe_ratio=Decimal("12"), ev_ebitda=Decimal("8"), peg_ratio=Decimal("0.8"),
+        pb_ratio=Decimal("1.5"), roic=Decimal("30"), roe=Decimal("25"),
+        net_margin=Decimal("22"), fcf_yield=Decimal("9"), debt_equity=Decimal("0.2"),
+        current_ratio=Decimal("2.6"), interest_coverage=Decimal("12"),
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestLazyExplanation:
+    def test_numbers_do_not_build_text(self):
+        service = ScoringService([fundamentals()], {})
+
+        with patch.object(service, "_generate_reasoning") as reasoning, \
+                patch.object(service, "_analyze_strengths_weaknesses") as analyze:
+            breakdown = service.calculate_score(fundamentals(), "Technology")
+            assert breakdown.total_score > 0
+            assert breakdown.signal is not None
+
+        analyze.assert_not_called()
+        reasoning.assert_not_called()
+
+    def test_text_generated_once_on_access(self):
+        service = ScoringService([fundamentals()], {})
+        breakdown = service.calculate_score(fundamentals(), "Technology")
+
+        with patch.object(service, "_generate_reasoning", wraps=service._generate_reasoning) as reasoning:
+            assert breakdown.reasoning
+            assert breakdown.strengths
+            assert breakdown.reasoning
+
+        assert reasoning.call_count == 1
+        assert "Momentum score not yet available (Phase 4)" in breakdown.weaknesses
+
+    def test_breakdown_without_explainer_has_empty_text(self):
+        breakdown = ScoreBreakdown(
+            total_score=50.0, value_score=12.5, quality_score=12.5,
+            momentum_score=12.5, health_score=12.5, signal=ScoringService([], {})._calculate_signal(50.0),
+        )
+
+        assert breakdown.strengths == []
+        assert breakdown.weaknesses == []
+        assert breakdown.reasoning == ""
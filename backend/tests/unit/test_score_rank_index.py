@@ -0,0 +1,125 @@
+"""Unit tests for the score rank index."""
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.features.stocks.models import Signal, Stock, StockScore
+from app.features.stocks.services import score_rank_index
+from app.features.stocks.services.score_rank_index import (
+    ScoreRankIndex,
+    build_rank_index,
+    get_rank_index,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_index():
+    score_rank_index._current_index = None
+    yield
+    score_rank_index._current_index = None
+
+
+def add_scored_stock(db, ticker, total, sector="Technology"):
+    stock = Stock(ticker=ticker, name=f"{ticker} Inc.", sector=sector)
+    db.add(stock)
+    db.flush()
+    db.add(StockScore(
+        stock_id=stock.id,
+        total_score=Decimal(str(total)),
+        value_score=Decimal("10"),
+        quality_score=Decimal("10"),
+        momentum_score=Decimal("10"),
+        health_score=Decimal("10"),
+        signal=Signal.HOLD,
+    ))
+    db.commit()
+    return stock
+
+
+class TestScoreRankIndex:
+    def test_rank_and_percentile(self):
+        index = ScoreRankIndex.from_rows([("Tech", 40.0), ("Tech", 80.0), ("Energy", 60.0), (None, 20.0)])
+
+        top = index.position(80.0)
+        bottom = index.position(20.0)
+
+        assert (top.rank, top.percentile, top.total) == (1, 100, 4)
+        assert (bottom.rank, bottom.percentile) == (4, 25)
+
+    def test_ties_share_the_best_rank(self):
+        index = ScoreRankIndex.from_rows([(None, 50.0), (None, 70.0), (None, 70.0), (None, 90.0)])
+
+        assert index.position(70.0).rank == 2
+        assert index.position(90.0).rank == 1
+        assert index.position(50.0).rank == 4
+
+    def test_scores_not_in_the_index(self):
+        index = ScoreRankIndex.from_rows([(None, 30.0), (None, 60.0)])
+
+        assert index.position(99.0).rank == 1
+        assert index.position(10.0).rank == 3
+        assert index.position(10.0).percentile == 0
+
+    def test_matches_linear_scan(self):
+        rng = np.random.default_rng(3)
+        totals = np.round(rng.uniform(0, 100, 500), 1)
+        index = ScoreRankIndex.from_rows([("S", float(t)) for t in totals])
+
+        for score in totals[:50]:
+            position = index.position(float(score))
+            assert position.rank == int((totals > score).sum()) + 1
+            assert position.percentile == round(100 * (totals <= score).sum() / len(totals))
+
+    def test_sector_ranking(self):
+        index = ScoreRankIndex.from_rows([("Tech", 40.0), ("Tech", 80.0), ("Energy", 60.0)])
+
+        ranking = index.ranking(60.0, "Energy")
+
+        assert ranking["rank"] == 2
+        assert (ranking["sector_rank"], ranking["sector_percentile"], ranking["sector_count"]) == (1, 100, 1)
+        assert index.ranking(60.0, "Unknown")["sector_rank"] is None
+        assert index.ranking(None, "Tech")["rank"] is None
+
+    def test_empty_index(self):
+        index = ScoreRankIndex.from_rows([])
+
+        assert index.position(50.0) is None
+
+    def test_payload_roundtrip(self):
+        index = ScoreRankIndex.from_rows([("Tech", 40.0), ("Energy", 60.0)])
+
+        restored = ScoreRankIndex.from_payload(index.to_payload())
+
+        assert restored.token == index.token
+        np.testing.assert_array_equal(restored.scores, index.scores)
+        np.testing.assert_array_equal(restored.sector_scores["Tech"], index.sector_scores["Tech"])
+
+
+class TestGetRankIndex:
+    def test_builds_from_stored_scores(self, test_db):
+        add_scored_stock(test_db, "AAA", 72.5)
+        add_scored_stock(test_db, "BBB", 55.0, sector="Energy")
+
+        index = build_rank_index(test_db)
+
+        assert index.scores.tolist() == [55.0, 72.5]
+        assert index.sector_scores["Energy"].tolist() == [55.0]
+
+    def test_reuses_fresh_index(self, test_db):
+        add_scored_stock(test_db, "AAA", 72.5)
+        first = get_rank_index(test_db)
+        add_scored_stock(test_db, "BBB", 90.0)
+
+        assert get_rank_index(test_db) is first
+
+    def test_rebuilds_stale_index(self, test_db, monkeypatch):
+        add_scored_stock(test_db, "AAA", 72.5)
+        first = get_rank_index(test_db)
+        add_scored_stock(test_db, "BBB", 90.0)
+        monkeypatch.setattr(first, "built_at", first.built_at - 3600 * 24)
+
+        rebuilt = get_rank_index(test_db)
+
+        assert rebuilt is not first
+        assert len(rebuilt) == 2
@@ -0,0 +1,382 @@
+"""Unit tests for score snapshots, signal transitions, forward-filled history, compaction and top movers."""
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.config import settings
+
+from app.features.stocks.models import Signal, SignalTransition, Stock, StockScore, StockScoreHistory
+from app.features.stocks.services.score_tracking_service import ScoreTrackingService
+
+
+def add_scored_stock(db, ticker, total, is_deleted=False):
+    stock = Stock(ticker=ticker, name=f"{ticker} Inc.", is_deleted=is_deleted)
+    db.add(stock)
+    db.flush()
+    score = StockScore(
+        stock_id=stock.id,
+        total_score=Decimal(total),
+        value_score=Decimal("10"),
+        quality_score=Decimal("10"),
+        momentum_score=Decimal("10"),
+        health_score=Decimal("10"),
+        signal=Signal.HOLD,
+    )
+    db.add(score)
+    db.commit()
+    return stock, score
+
+
+class TestSnapshotAllScores:
+    def test_creates_snapshots_for_active_stocks(self, test_db):
+        add_scored_stock(test_db, "AAA", "70")
+        add_scored_stock(test_db, "BBB", "55.5")
+        add_scored_stock(test_db, "OLD", "40", is_deleted=True)
+
+        counts = ScoreTrackingService(test_db).snapshot_all_scores(date(2025, 1, 31))
+
+        assert counts == {"created": 2, "updated": 0}
+        rows = test_db.query(StockScoreHistory).order_by(StockScoreHistory.total_score).all()
+        assert [row.total_score for row in rows] == [Decimal("55.5"), Decimal("70")]
+        assert all(row.snapshot_date == date(2025, 1, 31) for row in rows)
+        assert all(isinstance(row.id, uuid.UUID) and row.id.version == 4 for row in rows)
+        assert len({row.id for row in rows}) == 2
+
+    def test_rerun_updates_same_date(self, test_db):
+        _, score = add_scored_stock(test_db, "AAA", "70")
+        service = ScoreTrackingService(test_db)
+        service.snapshot_all_scores(date(2025, 1, 31))
+        first_id = test_db.query(StockScoreHistory).one().id
+
+        score.total_score = Decimal("82")
+        score.signal = Signal.STRONG_BUY
+        test_db.commit()
+        add_scored_stock(test_db, "BBB", "50")
+        counts = service.snapshot_all_scores(date(2025, 1, 31))
+
+        assert counts == {"created": 1, "updated": 1}
+        test_db.expire_all()
+        snapshot = test_db.query(StockScoreHistory).filter_by(stock_id=score.stock_id).one()
+        assert snapshot.id == first_id
+        assert snapshot.total_score == Decimal("82")
+        assert snapshot.signal == Signal.STRONG_BUY
+
+    def test_new_date_creates_new_rows(self, test_db):
+        add_scored_stock(test_db, "AAA", "70")
+        service = ScoreTrackingService(test_db)
+        service.snapshot_all_scores(date(2025, 1, 30))
+
+        counts = service.snapshot_all_scores(date(2025, 1, 31))
+
+        assert counts == {"created": 1, "updated": 0}
+        assert test_db.query(StockScoreHistory).count() == 2
+
+    def test_set_based_statements(self, test_db):
+        for i in range(25):
+            add_scored_stock(test_db, f"S{i}", str(40 + i))
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        engine = test_db.get_bind()
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            counts = ScoreTrackingService(test_db).snapshot_all_scores(date(2025, 1, 31))
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        # History in one upsert, signal transitions in one delete + one insert
+        assert counts["created"] == 25
+        assert len(statements) == 3
+        assert [s.split()[0] for s in statements] == ["DELETE", "INSERT", "INSERT"]
+        assert "ON CONFLICT" in statements[2]
+
+
+def add_history(db, stock, day, total, signal=Signal.HOLD, resolution="daily"):
+    db.add(StockScoreHistory(
+        stock_id=stock.id,
+        snapshot_date=day,
+        total_score=Decimal(total),
+        value_score=Decimal("10"),
+        quality_score=Decimal("10"),
+        momentum_score=Decimal("10"),
+        health_score=Decimal("10"),
+        signal=signal,
+        resolution=resolution,
+    ))
+    db.commit()
+
+
+class TestChangeOnlySnapshots:
+    @pytest.fixture(autouse=True)
+    def change_only(self, monkeypatch):
+        monkeypatch.setattr(settings, "SCORE_HISTORY_CHANGE_ONLY", True)
+
+    def test_skips_unchanged_stocks(self, test_db):
+        _, changing = add_scored_stock(test_db, "AAA", "70")
+        add_scored_stock(test_db, "BBB", "50")
+        service = ScoreTrackingService(test_db)
+        assert service.snapshot_all_scores(date(2025, 1, 27)) == {"created": 2, "updated": 0}
+
+        changing.total_score = Decimal("75")
+        test_db.commit()
+
+        assert service.snapshot_all_scores(date(2025, 1, 28)) == {"created": 1, "updated": 0}
+        assert service.snapshot_all_scores(date(2025, 1, 29)) == {"created": 0, "updated": 0}
+        assert test_db.query(StockScoreHistory).count() == 3
+
+    def test_signal_change_is_stored(self, test_db):
+        _, score = add_scored_stock(test_db, "AAA", "70")
+        service = ScoreTrackingService(test_db)
+        service.snapshot_all_scores(date(2025, 1, 27))
+
+        score.signal = Signal.BUY
+        test_db.commit()
+
+        assert service.snapshot_all_scores(date(2025, 1, 28))["created"] == 1
+
+    def test_rerun_same_day_refreshes_row(self, test_db):
+        _, score = add_scored_stock(test_db, "AAA", "70")
+        service = ScoreTrackingService(test_db)
+        service.snapshot_all_scores(date(2025, 1, 27))
+        score.total_score = Decimal("75")
+        test_db.commit()
+        service.snapshot_all_scores(date(2025, 1, 28))
+
+        score.total_score = Decimal("70")
+        test_db.commit()
+
+        assert service.snapshot_all_scores(date(2025, 1, 28)) == {"created": 0, "updated": 1}
+
+
+class TestForwardFilledHistory:
+    def test_fills_weekdays_between_changes(self, test_db):
+        stock, _ = add_scored_stock(test_db, "AAA", "70")
+        today = date.today()
+        monday = today - timedelta(days=today.weekday() + 14)
+        add_history(test_db, stock, monday - timedelta(days=7), "60")
+        add_history(test_db, stock, monday + timedelta(days=2), "65")
+        add_history(test_db, stock, monday + timedelta(days=7), "68")
+
+        days = (today - monday).days
+        history = ScoreTrackingService(test_db).get_score_history("AAA", days=days)
+
+        assert [h["date"] for h in history][:3] == [
+            monday.isoformat(), (monday + timedelta(days=1)).isoformat(), (monday + timedelta(days=2)).isoformat()
+        ]
+        assert [h["total_score"] for h in history][:3] == [60.0, 60.0, 65.0]
+        assert len(history) == 6
+        assert history[-1] == {**history[-1], "date": (monday + timedelta(days=7)).isoformat(), "total_score": 68.0}
+
+    def test_no_history(self, test_db):
+        add_scored_stock(test_db, "AAA", "70")
+
+        assert ScoreTrackingService(test_db).get_score_history("AAA") == []
+
+
+class TestCompactHistory:
+    def test_rolls_up_weekly_then_monthly(self, test_db, monkeypatch):
+        monkeypatch.setattr(settings, "SCORE_HISTORY_DAILY_DAYS", 30)
+        monkeypatch.setattr(settings, "SCORE_HISTORY_WEEKLY_DAYS", 90)
+        stock, _ = add_scored_stock(test_db, "AAA", "70")
+        today = date(2025, 6, 30)
+        start = date(2025, 1, 1)
+        for offset in range((today - start).days):
+            day = start + timedelta(days=offset)
+            if day.weekday() < 5:
+                add_history(test_db, stock, day, str(40 + offset % 30))
+        before = test_db.query(StockScoreHistory).count()
+
+        removed = ScoreTrackingService(test_db).compact_history(today)
+
+        rows = test_db.query(StockScoreHistory).order_by(StockScoreHistory.snapshot_date).all()
+        assert removed["weekly_removed"] + removed["monthly_removed"] == before - len(rows)
+        monthly = [row for row in rows if row.resolution == "monthly"]
+        weekly = [row for row in rows if row.resolution == "weekly"]
+        assert [row.snapshot_date for row in monthly] == [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 28)]
+        assert all(row.snapshot_date.weekday() == 4 for row in weekly)
+        assert all(row.snapshot_date >= date(2025, 5, 26) for row in rows if row.resolution == "daily")
+
+        # Idempotent
+        assert ScoreTrackingService(test_db).compact_history(today) == {
+            "unchanged_removed": 0, "weekly_removed": 0, "monthly_removed": 0
+        }
+
+    def test_removes_unchanged_rows_in_change_only_mode(self, test_db, monkeypatch):
+        monkeypatch.setattr(settings, "SCORE_HISTORY_CHANGE_ONLY", True)
+        stock, _ = add_scored_stock(test_db, "AAA", "70")
+        today = date.today()
+        for offset, total in enumerate(["50", "50", "55", "55", "50"]):
+            add_history(test_db, stock, today - timedelta(days=5 - offset), total)
+
+        removed = ScoreTrackingService(test_db).compact_history(today)
+
+        assert removed["unchanged_removed"] == 2
+        totals = [row.total_score for row in test_db.query(StockScoreHistory).order_by(StockScoreHistory.snapshot_date)]
+        assert totals == [Decimal("50"), Decimal("55"), Decimal("50")]
+
+
+class TestTopMovers:
+    @pytest.fixture
+    def movers_db(self, test_db):
+        today = date.today()
+        for ticker, current, past, recent in [
+            ("AAA", "80", "60", "79"),
+            ("BBB", "50", "65", "51"),
+            ("CCC", "70", "68", "40"),
+            ("DDD", "55", "55", "55"),
+        ]:
+            stock, _ = add_scored_stock(test_db, ticker, current)
+            add_history(test_db, stock, today - timedelta(days=20), "10")
+            add_history(test_db, stock, today - timedelta(days=8), past, signal=Signal.SELL)
+            add_history(test_db, stock, today - timedelta(days=2), recent)
+        gone, _ = add_scored_stock(test_db, "OLD", "99", is_deleted=True)
+        add_history(test_db, gone, today - timedelta(days=8), "0")
+        return test_db
+
+    def test_gainers_use_latest_snapshot_before_cutoff(self, movers_db):
+        movers = ScoreTrackingService(movers_db).get_top_movers(days=7, limit=2, direction="up")
+
+        assert [m["ticker"] for m in movers] == ["AAA", "CCC"]
+        assert movers[0]["historical_score"] == 60.0
+        assert movers[0]["score_change"] == 20.0
+        assert movers[0]["percent_change"] == 33.33
+        assert movers[0]["historical_signal"] == Signal.SELL.value
+        assert movers[0]["signal_changed"] is True
+
+    def test_losers(self, movers_db):
+        movers = ScoreTrackingService(movers_db).get_top_movers(days=7, limit=10, direction="down")
+
+        assert [m["ticker"] for m in movers] == ["BBB", "DDD", "CCC", "AAA"]
+        assert movers[0]["score_change"] == -15.0
+
+    def test_limit_is_applied_in_query(self, movers_db):
+        fetched = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "LIMIT" in statement:
+                fetched.append(statement)
+
+        engine = movers_db.get_bind()
+        event.listen(engine, "after_cursor_execute", capture)
+        try:
+            movers = ScoreTrackingService(movers_db).get_top_movers(days=7, limit=1)
+        finally:
+            event.remove(engine, "after_cursor_execute", capture)
+
+        assert [m["ticker"] for m in movers] == ["AAA"]
+        assert len(fetched) == 1 and "row_number() OVER" in fetched[0]
+
+
+class TestSignalTransitions:
+    def test_snapshot_records_signal_changes(self, test_db):
+        _, changing = add_scored_stock(test_db, "AAA", "70")
+        add_scored_stock(test_db, "BBB", "50")
+        service = ScoreTrackingService(test_db)
+        service.snapshot_all_scores(date(2025, 1, 27))
+
+        changing.signal = Signal.BUY
+        changing.total_score = Decimal("76")
+        test_db.commit()
+        service.snapshot_all_scores(date(2025, 1, 28))
+
+        transition = test_db.query(SignalTransition).one()
+        assert transition.transition_date == date(2025, 1, 28)
+        assert (transition.previous_signal, transition.new_signal) == (Signal.HOLD, Signal.BUY)
+        assert (transition.previous_score, transition.new_score) == (Decimal("70"), Decimal("76"))
+
+    def test_rerun_replaces_same_day_transitions(self, test_db):
+        _, score = add_scored_stock(test_db, "AAA", "70")
+        service = ScoreTrackingService(test_db)
+        service.snapshot_all_scores(date(2025, 1, 27))
+        score.signal = Signal.BUY
+        test_db.commit()
+        service.snapshot_all_scores(date(2025, 1, 28))
+        service.snapshot_all_scores(date(2025, 1, 28))
+        assert test_db.query(SignalTransition).count() == 1
+
+        score.signal = Signal.HOLD
+        test_db.commit()
+        service.snapshot_all_scores(date(2025, 1, 28))
+
+        assert test_db.query(SignalTransition).count() == 0
+
+    def test_get_signal_changes_pages_newest_first(self, test_db):
+        today = date.today()
+        for ticker in ("AAA", "BBB", "CCC"):
+            add_scored_stock(test_db, ticker, "60")
+        stocks = {s.ticker: s for s in test_db.query(Stock)}
+        for ticker, days_ago in [("AAA", 1), ("BBB", 1), ("CCC", 3), ("AAA", 40)]:
+            test_db.add(SignalTransition(
+                stock_id=stocks[ticker].id,
+                transition_date=today - timedelta(days=days_ago),
+                previous_signal=Signal.HOLD,
+                new_signal=Signal.BUY,
+                previous_score=Decimal("60"),
+                new_score=Decimal("66.5"),
+            ))
+        test_db.commit()
+        service = ScoreTrackingService(test_db)
+
+        first = service.get_signal_changes(days=7, limit=2)
+        second = service.get_signal_changes(days=7, limit=2, offset=2)
+
+        assert [c["ticker"] for c in first] == ["AAA", "BBB"]
+        assert [c["ticker"] for c in second] == ["CCC"]
+        assert first[0] == {
+            "ticker": "AAA",
+            "name": "AAA Inc.",
+            "sector": None,
+            "previous_signal": "HOLD",
+            "current_signal": "BUY",
+            "score_change": 6.5,
+            "current_score": 66.5,
+            "historical_score": 60.0,
+            "change_date": (today - timedelta(days=1)).isoformat(),
+        }
+        assert len(service.get_signal_changes(days=60)) == 4
+
+
+class TestScoreHistoryBatch:
+    def test_columnar_series_share_one_axis(self, test_db):
+        friday = date(2025, 1, 31)
+        aaa, _ = add_scored_stock(test_db, "AAA", "70")
+        bbb, _ = add_scored_stock(test_db, "BBB", "50")
+        add_history(test_db, aaa, friday - timedelta(days=10), "60")
+        add_history(test_db, aaa, friday - timedelta(days=1), "65", signal=Signal.BUY)
+        add_history(test_db, bbb, friday - timedelta(days=2), "40")
+        add_history(test_db, bbb, friday, "45")
+
+        result = ScoreTrackingService(test_db).get_score_history_batch(
+            ["AAA", "BBB", "NOPE"], start_date=date(2025, 1, 27)
+        )
+
+        assert result["dates"] == ["2025-01-27", "2025-01-28", "2025-01-29", "2025-01-30", "2025-01-31"]
+        assert result["series"]["AAA"]["total_score"] == [60.0, 60.0, 60.0, 65.0, 65.0]
+        assert result["series"]["AAA"]["signal"] == ["HOLD", "HOLD", "HOLD", "BUY", "BUY"]
+        assert result["series"]["BBB"]["total_score"] == [None, None, 40.0, 40.0, 45.0]
+        assert result["series"]["BBB"]["value_score"] == [None, None, 10.0, 10.0, 10.0]
+        assert result["missing"] == ["NOPE"]
+
+    def test_single_query_and_end_date(self, test_db):
+        for i in range(10):
+            stock, _ = add_scored_stock(test_db, f"S{i}", "50")
+            add_history(test_db, stock, date(2025, 1, 27), str(40 + i))
+            add_history(test_db, stock, date(2025, 1, 29), str(50 + i))
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        engine = test_db.get_bind()
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            result = ScoreTrackingService(test_db).get_score_history_batch(
+                [f"S{i}" for i in range(10)], date(2025, 1, 20), end_date=date(2025, 1, 28)
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 1
+        assert result["dates"] == ["2025-01-27", "2025-01-28"]
+        assert result["series"]["S3"]["total_score"] == [43.0, 43.0]
@@ -10,6 +10,7 @@ def _import_score_tasks():
     if "celery" not in sys.modules:
         fake_celery = ModuleType("celery")
         fake_celery.Celery = MagicMock()
+        fake_celery.chord = MagicMock()
         sys.modules["celery"] = fake_celery
 
     if "celery.schedules" not in sys.modules:
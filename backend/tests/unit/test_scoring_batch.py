@@ -0,0 +1,129 @@
+"""Unit tests for the vectorized batch scoring path."""
+import random
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.features.stocks.models import Stock, StockFundamental, StockScore
+from app.features.stocks.services.scoring_service import (
+    ScoringService,
+    SectorBenchmarks,
+    SCORING_METRICS,
+    encode_sectors,
+    fundamentals_to_columns,
+)
+from app.features.stocks.services.sector_service import SectorService
+
+SECTORS = ["Technology", "Utilities", "Banks", "Financial Services", "Industrials", None]
+
+# Values sitting exactly on ladder boundaries, so strict vs inclusive comparisons are exercised.
+EDGE_VALUES = [None, "-1", "0", "0.3", "0.5", "1", "1.5", "2", "2.5", "3", "5", "8", "10",
+               "15", "20", "25", "50", "50.01", "100", "150", "250"]
+
+
+def random_fundamentals(rng, n):
+    rows = []
+    for _ in range(n):
+        values = {}
+        for metric in SCORING_METRICS:
+            if rng.random() < 0.3:
+                raw = rng.choice(EDGE_VALUES)
+                values[metric] = Decimal(raw) if raw is not None else None
+            else:
+                values[metric] = Decimal(str(round(rng.uniform(-20, 120), 2)))
+        rows.append(SimpleNamespace(**values))
+    return rows
+
+
+def make_benchmarks():
+    return {
+        "Technology": SectorBenchmarks("Technology", 25.0, 18.0, 20.0, 22.0, 0.4, 60.0, 25.0, 20.0, 10),
+        "Utilities": SectorBenchmarks("Utilities", 15.0, None, 8.0, 10.0, 1.5, 40.0, 20.0, 12.0, 4),
+        "Banks": SectorBenchmarks("Banks", 10.0, 8.0, None, 12.5, None, None, None, None, 3),
+    }
+
+
+class TestScoreBatch:
+    def test_matches_per_stock_path(self):
+        rng = random.Random(42)
+        fundamentals = random_fundamentals(rng, 2000)
+        sectors = [rng.choice(SECTORS) for _ in fundamentals]
+        service = ScoringService(fundamentals, make_benchmarks())
+
+        codes, names = encode_sectors(sectors)
+        batch = service.score_batch(fundamentals_to_columns(fundamentals), codes, names)
+
+        assert len(batch) == len(fundamentals)
+        for i, (f, sector) in enumerate(zip(fundamentals, sectors)):
+            expected = service.calculate_score(f, sector)
+            assert batch.value_score[i] == expected.value_score
+            assert batch.quality_score[i] == expected.quality_score
+            assert batch.momentum_score[i] == expected.momentum_score
+            assert batch.health_score[i] == expected.health_score
+            assert batch.total_score[i] == expected.total_score
+            assert batch.signal(i) == expected.signal
+
+    def test_from_columns_matches_row_percentiles(self):
+        rng = random.Random(7)
+        fundamentals = random_fundamentals(rng, 500)
+
+        by_rows = ScoringService(fundamentals, {})
+        by_columns = ScoringService.from_columns(fundamentals_to_columns(fundamentals), {})
+
+        assert (by_columns.roic_p90, by_columns.roic_p75, by_columns.roic_p50, by_columns.roic_p25) == \
+            (by_rows.roic_p90, by_rows.roic_p75, by_rows.roic_p50, by_rows.roic_p25)
+
+    def test_momentum_scores_are_used(self):
+        fundamentals = random_fundamentals(random.Random(1), 3)
+        service = ScoringService(fundamentals, {})
+        codes, names = encode_sectors([None] * 3)
+
+        batch = service.score_batch(
+            fundamentals_to_columns(fundamentals), codes, names,
+            momentum_scores=np.array([0.0, 12.5, 25.0]),
+        )
+
+        assert list(batch.momentum_score) == [0.0, 12.5, 25.0]
+
+    def test_empty_universe(self):
+        service = ScoringService([], {})
+        codes, names = encode_sectors([])
+
+        batch = service.score_batch(fundamentals_to_columns([]), codes, names)
+
+        assert len(batch) == 0
+
+
+class TestEncodeSectors:
+    def test_codes_and_missing_sector(self):
+        codes, names = encode_sectors(["Tech", None, "Banks", "Tech", ""])
+
+        assert names == ["Tech", "Banks"]
+        assert list(codes) == [0, -1, 1, 0, -1]
+
+
+class TestCalculateScoresForAllStocks:
+    def test_stored_scores_match_per_stock_path(self, test_db):
+        rng = random.Random(3)
+        for i, f in enumerate(random_fundamentals(rng, 40)):
+            stock = Stock(ticker=f"TST{i}", name=f"Test {i}", sector=rng.choice(SECTORS))
+            test_db.add(stock)
+            test_db.flush()
+            test_db.add(StockFundamental(stock_id=stock.id, **vars(f)))
+        test_db.commit()
+
+        sector_service = SectorService(test_db)
+        benchmarks = sector_service.calculate_and_cache_sector_averages()
+        scored = sector_service.calculate_scores_for_all_stocks()
+
+        assert scored == 40
+        stocks = test_db.query(Stock).all()
+        reference = ScoringService([s.fundamentals for s in stocks], sector_service.get_cached_sector_benchmarks())
+        assert benchmarks
+        for stock in stocks:
+            stored = test_db.query(StockScore).filter(StockScore.stock_id == stock.id).one()
+            expected = reference.calculate_score(stock.fundamentals, stock.sector)
+            assert float(stored.total_score) == pytest.approx(expected.total_score)
+            assert stored.signal == expected.signal
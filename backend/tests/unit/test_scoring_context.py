@@ -0,0 +1,96 @@
+"""Unit tests for the versioned scoring context."""
+from decimal import Decimal
+
+import pytest
+
+from app.features.stocks.models import Stock, StockFundamental, ScoringContextSnapshot
+from app.features.stocks.services import scoring_context
+from app.features.stocks.services.scoring_context import (
+    KEEP_CONTEXT_VERSIONS,
+    build_scoring_context,
+    get_scoring_context,
+)
+from app.features.stocks.services.scoring_service import ScoringService
+from app.features.stocks.services.sector_service import SectorService
+
+
+def add_stock(db, ticker, roic, sector="Technology", pe="15"):
+    stock = Stock(ticker=ticker, name=f"{ticker} Inc.", sector=sector)
+    db.add(stock)
+    db.flush()
+    db.add(StockFundamental(stock_id=stock.id, roic=Decimal(roic), pe_ratio=Decimal(pe)))
+    db.commit()
+    return stock
+
+
+@pytest.fixture(autouse=True)
+def reset_context():
+    scoring_context._current_context = None
+    yield
+    scoring_context._current_context = None
+
+
+class TestScoringContext:
+    def test_bootstraps_when_none_stored(self, test_db):
+        for i, roic in enumerate(["5", "10", "15", "20", "30"]):
+            add_stock(test_db, f"S{i}", roic)
+
+        context = get_scoring_context(test_db)
+
+        all_fundamentals = test_db.query(StockFundamental).all()
+        assert context.version == 1
+        assert context.stock_count == 5
+        assert context.roic_percentiles == ScoringService(all_fundamentals, {}).roic_percentiles
+        assert test_db.query(ScoringContextSnapshot).count() == 1
+
+    def test_cached_context_is_reused(self, test_db):
+        add_stock(test_db, "AAA", "12")
+        first = get_scoring_context(test_db)
+
+        assert get_scoring_context(test_db) is first
+
+    def test_recompute_publishes_new_version(self, test_db):
+        add_stock(test_db, "AAA", "12")
+        first = get_scoring_context(test_db)
+
+        add_stock(test_db, "BBB", "40")
+        sector_service = SectorService(test_db)
+        sector_service.calculate_and_cache_sector_averages()
+        sector_service.calculate_scores_for_all_stocks()
+
+        current = get_scoring_context(test_db)
+        assert current.version == first.version + 1
+        assert current.stock_count == 2
+        assert "Technology" in current.sector_benchmarks
+
+    def test_reloads_version_published_elsewhere(self, test_db):
+        add_stock(test_db, "AAA", "12")
+        first = get_scoring_context(test_db)
+
+        # Simulate another process publishing: forget the in-memory copy and rebuild.
+        newer = build_scoring_context(test_db)
+        scoring_context._current_context = first
+
+        assert get_scoring_context(test_db).id == newer.id
+
+    def test_old_versions_are_pruned(self, test_db):
+        add_stock(test_db, "AAA", "12")
+        for _ in range(KEEP_CONTEXT_VERSIONS + 3):
+            build_scoring_context(test_db)
+
+        versions = [v for (v,) in test_db.query(ScoringContextSnapshot.version).all()]
+        assert len(versions) == KEEP_CONTEXT_VERSIONS
+        assert max(versions) == KEEP_CONTEXT_VERSIONS + 3
+
+    def test_context_scoring_matches_recompute(self, test_db):
+        for i, roic in enumerate(["5", "10", "15", "20", "30", "45"]):
+            add_stock(test_db, f"S{i}", roic, pe=str(10 + i * 5))
+        sector_service = SectorService(test_db)
+        sector_service.calculate_and_cache_sector_averages()
+        sector_service.calculate_scores_for_all_stocks()
+
+        service = get_scoring_context(test_db).scoring_service()
+
+        for stock in test_db.query(Stock).all():
+            breakdown = service.calculate_score(stock.fundamentals, stock.sector)
+            assert breakdown.total_score == float(stock.scores.total_score)
@@ -0,0 +1,53 @@
+"""Unit tests for the declarative scoring threshold tables."""
+import numpy as np
+import pytest
+
+from app.features.stocks.services.scoring_tables import (
+    Band,
+    PE_VS_SECTOR,
+    PEG,
+    ThresholdTable,
+    ladder,
+    roic_percentile_table,
+)
+
+
+class TestThresholdTable:
+    def test_strict_and_inclusive_bounds(self):
+        # P/E ratio: <0.5 -> 8, <0.75 -> 6, <=1.25 -> 4, <=2.0 -> 2, else 0
+        assert PE_VS_SECTOR.lookup(0.4999) == 8.0
+        assert PE_VS_SECTOR.lookup(0.5) == 6.0
+        assert PE_VS_SECTOR.lookup(0.75) == 4.0
+        assert PE_VS_SECTOR.lookup(1.25) == 4.0
+        assert PE_VS_SECTOR.lookup(1.2501) == 2.0
+        assert PE_VS_SECTOR.lookup(2.0) == 2.0
+        assert PE_VS_SECTOR.lookup(2.0001) == 0.0
+
+    def test_missing_values(self):
+        assert PEG.lookup(None) == 3.0
+        assert PEG.lookup(float("nan")) == 3.0
+        with pytest.raises(ValueError):
+            PE_VS_SECTOR.lookup(None)
+
+    def test_array_lookup_matches_scalar(self):
+        values = np.array([-1.0, 0.0, 0.25, 0.5, 0.99, 1.0, 1.5, 1.99, 2.0, 10.0, np.nan])
+
+        scores = PEG.lookup_array(values)
+
+        assert list(scores) == [PEG.lookup(v) for v in values]
+
+    def test_bounds_must_ascend(self):
+        with pytest.raises(ValueError):
+            ThresholdTable(name="bad", bands=(Band(2.0, 1.0), Band(1.0, 2.0)), above=0.0)
+
+    def test_ladder_needs_one_more_score_than_bounds(self):
+        with pytest.raises(ValueError):
+            ladder("bad", [1.0, 2.0], [0.0, 1.0])
+
+    def test_roic_table_with_tied_percentiles(self):
+        # Small universes can produce equal thresholds; the highest band wins.
+        table = roic_percentile_table(p25=5.0, p50=10.0, p75=20.0, p90=20.0)
+
+        assert table.lookup(4.0) == 0.0
+        assert table.lookup(10.0) == 5.0
+        assert table.lookup(20.0) == 10.0
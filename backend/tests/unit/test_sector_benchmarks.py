@@ -0,0 +1,58 @@
+"""Unit tests for SQL-side sector benchmark aggregation."""
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.features.stocks.models import Stock, StockFundamental
+from app.features.stocks.services.sector_service import SectorService
+
+
+def add_stock(db, ticker, sector, **metrics):
+    stock = Stock(ticker=ticker, name=f"{ticker} Inc.", sector=sector)
+    db.add(stock)
+    db.flush()
+    db.add(StockFundamental(stock_id=stock.id, **{k: Decimal(str(v)) for k, v in metrics.items()}))
+    db.commit()
+
+
+class TestComputeSectorBenchmarks:
+    def test_averages_exclude_non_positive_and_capped_values(self, test_db):
+        add_stock(test_db, "AAA", "Technology", pe_ratio=10, roic=20, debt_equity=1)
+        add_stock(test_db, "BBB", "Technology", pe_ratio=20, roic=250, debt_equity=6)
+        add_stock(test_db, "CCC", "Technology", pe_ratio=-5, roic=0)
+        add_stock(test_db, "DDD", "Technology", pe_ratio=150)
+
+        benchmarks = SectorService(test_db).compute_sector_benchmarks()["Technology"]
+
+        assert benchmarks.avg_pe == pytest.approx(15.0)
+        assert benchmarks.avg_roic == pytest.approx(20.0)
+        assert benchmarks.avg_debt_equity == pytest.approx(1.0)
+        assert benchmarks.avg_net_margin is None
+        assert benchmarks.stock_count == 4
+
+    def test_groups_by_sector_and_skips_unknown_sector(self, test_db):
+        add_stock(test_db, "AAA", "Technology", pe_ratio=10)
+        add_stock(test_db, "BBB", "Energy", pe_ratio=30)
+        add_stock(test_db, "CCC", None, pe_ratio=50)
+
+        benchmarks = SectorService(test_db).compute_sector_benchmarks()
+
+        assert set(benchmarks) == {"Technology", "Energy"}
+        assert benchmarks["Energy"].avg_pe == pytest.approx(30.0)
+
+    def test_single_query(self, test_db):
+        for i in range(20):
+            add_stock(test_db, f"T{i}", f"Sector {i % 4}", pe_ratio=10 + i, roe=5 + i)
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        engine = test_db.get_bind()
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            benchmarks = SectorService(test_db).compute_sector_benchmarks()
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert len(benchmarks) == 4
+        assert len(statements) == 1
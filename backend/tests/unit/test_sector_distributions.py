@@ -0,0 +1,110 @@
+"""Unit tests for per-sector metric distributions."""
+from decimal import Decimal
+
+import numpy as np
+
+from app.features.stocks.models import SectorDistribution, Stock, StockFundamental
+from app.features.stocks.schemas import ScreenerCriteria
+from app.features.stocks.services.screener_service import ScreenerService
+from app.features.stocks.services.sector_distributions import (
+    DISTRIBUTION_METRICS,
+    MetricDistribution,
+    compute_sector_distributions,
+    grouped_quantiles,
+    load_sector_distributions,
+)
+from app.features.stocks.services.sector_service import SectorService
+
+
+def add_stock(db, ticker, sector, **metrics):
+    stock = Stock(ticker=ticker, name=f"{ticker} Inc.", sector=sector)
+    db.add(stock)
+    db.flush()
+    db.add(StockFundamental(stock_id=stock.id, **{k: Decimal(str(v)) for k, v in metrics.items()}))
+    db.commit()
+
+
+class TestGroupedQuantiles:
+    def test_matches_numpy_per_group(self):
+        rng = np.random.default_rng(4)
+        codes = rng.integers(-1, 6, 2000)
+        values = rng.normal(10, 5, 2000)
+        values[rng.random(2000) < 0.2] = np.nan
+        levels = np.array([0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0])
+
+        counts, quantiles = grouped_quantiles(codes, values, 6, levels)
+
+        for code in range(6):
+            group = values[(codes == code) & ~np.isnan(values)]
+            assert counts[code] == len(group)
+            np.testing.assert_allclose(quantiles[code], np.quantile(group, levels))
+
+    def test_groups_without_values(self):
+        counts, quantiles = grouped_quantiles(np.array([0, 0, 1]), np.array([1.0, 3.0, np.nan]), 3)
+
+        assert counts.tolist() == [2, 0, 0]
+        assert quantiles[0, 3] == 2.0
+        assert np.isnan(quantiles[1]).all()
+
+    def test_compute_sector_distributions(self):
+        distributions = compute_sector_distributions(
+            np.array([0, 0, 0, 1]),
+            ["Energy", "Utilities"],
+            {"pe_ratio": np.array([10.0, 20.0, 30.0, np.nan])},
+        )
+
+        assert len(distributions) == 1
+        assert distributions[0].sector == "Energy"
+        assert distributions[0].median == 20.0
+        assert distributions[0].sample_count == 3
+
+
+class TestMetricDistribution:
+    def test_percentile_of(self):
+        distribution = MetricDistribution("Energy", "pe_ratio", 100, (5.0, 8.0, 10.0, 15.0, 20.0, 30.0, 50.0))
+
+        assert distribution.percentile_of(15.0) == 50
+        assert distribution.percentile_of(12.5) == 38
+        assert distribution.percentile_of(1.0) == 0
+        assert distribution.percentile_of(99.0) == 100
+
+
+class TestStoredDistributions:
+    def test_refreshed_with_sector_averages(self, test_db):
+        for i, pe in enumerate([8, 12, 16, 20, 400]):
+            add_stock(test_db, f"E{i}", "Energy", pe_ratio=pe, roic=10 + i)
+        add_stock(test_db, "U0", "Utilities", pe_ratio=18)
+
+        SectorService(test_db).calculate_and_cache_sector_averages()
+
+        energy_pe = test_db.query(SectorDistribution).filter_by(sector="Energy", metric="pe_ratio").one()
+        assert float(energy_pe.median) == 16.0
+        assert float(energy_pe.max_value) == 400.0
+        assert energy_pe.sample_count == 5
+        assert test_db.query(SectorDistribution).filter_by(metric="net_margin").count() == 0
+
+        distributions = load_sector_distributions(test_db, ["Utilities"])
+        assert len(distributions) == 1
+        assert distributions.get("Utilities", "pe_ratio").median == 18.0
+
+    def test_refresh_replaces_previous_tables(self, test_db):
+        add_stock(test_db, "E0", "Energy", pe_ratio=10)
+        service = SectorService(test_db)
+        service.calculate_and_cache_sector_averages()
+
+        test_db.query(Stock).filter_by(ticker="E0").one().sector = "Utilities"
+        test_db.commit()
+        service.calculate_and_cache_sector_averages()
+
+        assert [row.sector for row in test_db.query(SectorDistribution).all()] == ["Utilities"]
+
+    def test_screener_reports_sector_percentiles(self, test_db):
+        for i, roic in enumerate([5, 10, 15, 20, 25]):
+            add_stock(test_db, f"E{i}", "Energy", roic=roic)
+        SectorService(test_db).calculate_and_cache_sector_averages()
+
+        response = ScreenerService(test_db).screen_stocks(ScreenerCriteria(roic_min=Decimal("25")))
+
+        assert [r.ticker for r in response.results] == ["E4"]
+        assert response.results[0].sector_percentiles == {"roic": 100}
+        assert set(response.results[0].sector_percentiles) <= set(DISTRIBUTION_METRICS)
@@ -0,0 +1,111 @@
+"""Unit tests for running sector statistics on SectorAverage."""
+import random
+from decimal import Decimal
+
+import pytest
+
+from app.features.stocks.models import SectorAverage, Stock, StockFundamental
+from app.features.stocks.services.sector_service import SectorService
+from app.features.stocks.services.sector_stats import BENCHMARK_AVERAGES, BENCHMARK_COLUMNS
+
+SECTORS = ["Technology", "Energy", "Utilities"]
+
+
+def random_metric(rng):
+    return rng.choice([None, Decimal("0"), Decimal(str(round(rng.uniform(-20, 260), 2)))])
+
+
+def add_stock(db, rng, ticker, sector):
+    stock = Stock(ticker=ticker, name=f"{ticker} Inc.", sector=sector)
+    db.add(stock)
+    db.flush()
+    db.add(StockFundamental(stock_id=stock.id, **{name: random_metric(rng) for name in BENCHMARK_COLUMNS}))
+    db.commit()
+    return stock
+
+
+def assert_matches_full_scan(db):
+    expected = SectorService(db).compute_sector_benchmarks()
+    cached = SectorService(db).get_cached_sector_benchmarks()
+    for sector, benchmarks in expected.items():
+        assert cached[sector].stock_count == benchmarks.stock_count
+        for field, _, _ in BENCHMARK_AVERAGES:
+            actual = getattr(cached[sector], field)
+            wanted = getattr(benchmarks, field)
+            if wanted is None:
+                assert actual is None, (sector, field)
+            else:
+                assert actual == pytest.approx(wanted, abs=0.01), (sector, field)
+
+
+class TestRunningSectorStats:
+    def test_insert_creates_and_updates_sector_row(self, test_db):
+        stock = Stock(ticker="AAA", name="AAA Inc.", sector="Energy")
+        test_db.add(stock)
+        test_db.flush()
+        test_db.add(StockFundamental(stock_id=stock.id, pe_ratio=Decimal("10"), roic=Decimal("300")))
+        test_db.commit()
+
+        average = test_db.query(SectorAverage).filter_by(sector="Energy").one()
+        assert (average.stock_count, average.count_pe, average.count_roic) == (1, 1, 0)
+        assert float(average.avg_pe) == 10.0
+        assert average.avg_roic is None
+
+        other = Stock(ticker="BBB", name="BBB Inc.", sector="Energy")
+        test_db.add(other)
+        test_db.flush()
+        test_db.add(StockFundamental(stock_id=other.id, pe_ratio=Decimal("20")))
+        test_db.commit()
+        test_db.refresh(average)
+
+        assert average.stock_count == 2
+        assert float(average.avg_pe) == 15.0
+
+    def test_update_replaces_contribution(self, test_db):
+        rng = random.Random(1)
+        stock = add_stock(test_db, rng, "AAA", "Energy")
+        fundamentals = test_db.query(StockFundamental).filter_by(stock_id=stock.id).one()
+
+        test_db.expire_all()
+        fundamentals.pe_ratio = Decimal("42")
+        test_db.commit()
+
+        average = test_db.query(SectorAverage).filter_by(sector="Energy").one()
+        assert (average.stock_count, average.count_pe, float(average.avg_pe)) == (1, 1, 42.0)
+
+    def test_delete_and_sector_change(self, test_db):
+        rng = random.Random(2)
+        first = add_stock(test_db, rng, "AAA", "Energy")
+        add_stock(test_db, rng, "BBB", "Energy")
+
+        first.sector = "Utilities"
+        test_db.commit()
+        assert test_db.query(SectorAverage).filter_by(sector="Utilities").one().stock_count == 1
+        assert test_db.query(SectorAverage).filter_by(sector="Energy").one().stock_count == 1
+
+        test_db.delete(first)
+        test_db.commit()
+        assert test_db.query(SectorAverage).filter_by(sector="Utilities").one().stock_count == 0
+
+    def test_random_writes_match_full_scan(self, test_db):
+        rng = random.Random(7)
+        stocks = [add_stock(test_db, rng, f"S{i}", rng.choice(SECTORS)) for i in range(30)]
+        SectorService(test_db).calculate_and_cache_sector_averages()
+
+        for step in range(60):
+            action = rng.random()
+            if action < 0.5:
+                stock = rng.choice(stocks)
+                test_db.expire_all()
+                fundamentals = test_db.query(StockFundamental).filter_by(stock_id=stock.id).one()
+                for name in rng.sample(BENCHMARK_COLUMNS, 3):
+                    setattr(fundamentals, name, random_metric(rng))
+            elif action < 0.65:
+                rng.choice(stocks).sector = rng.choice(SECTORS)
+            elif action < 0.8 and len(stocks) > 5:
+                test_db.delete(stocks.pop(rng.randrange(len(stocks))))
+            else:
+                stocks.append(add_stock(test_db, rng, f"N{step}", rng.choice(SECTORS)))
+            test_db.commit()
+
+        assert_matches_full_scan(test_db)
@@ -0,0 +1,54 @@
+"""Unit tests for the synthetic benchmark universe generator."""
+from app.features.stocks.models import Stock, StockFundamental, StockPrice, StockScore
+from app.features.stocks.services.sector_service import SectorService
+from benchmarks.run_benchmarks import compare
+from benchmarks.synthetic_universe import generate_universe, load_universe
+
+
+class TestGenerateUniverse:
+    def test_deterministic_for_seed(self):
+        first = generate_universe(200, seed=7, price_days=5)
+        second = generate_universe(200, seed=7, price_days=5)
+        other = generate_universe(200, seed=8, price_days=5)
+
+        assert first.fundamentals == second.fundamentals
+        assert first.prices == second.prices
+        assert first.fundamentals["pe_ratio"] != other.fundamentals["pe_ratio"]
+
+    def test_shapes(self):
+        universe = generate_universe(50, price_days=4)
+
+        assert len(set(universe.stocks["ticker"])) == 50
+        assert len(universe.prices["close"]) == 200
+        assert all(0 <= s <= 100 for s in universe.scores["total_score"])
+
+    def test_loads_and_scores(self, test_db):
+        counts = load_universe(test_db.get_bind(), generate_universe(120, price_days=3))
+
+        assert counts == {"stocks": 120, "stock_fundamentals": 120, "stock_scores": 120, "stock_prices": 360}
+        assert test_db.query(Stock).count() == 120
+        assert test_db.query(StockFundamental).count() == 120
+        assert test_db.query(StockPrice).count() == 360
+
+        sector_service = SectorService(test_db)
+        sector_service.calculate_and_cache_sector_averages()
+        assert sector_service.calculate_scores_for_all_stocks() == 120
+        assert test_db.query(StockScore).count() == 120
+
+
+class TestCompare:
+    def test_flags_slower_operations(self):
+        baseline = {"results": [
+            {"size": 1000, "operation": "screen_stocks", "seconds": {"median": 0.10}},
+            {"size": 1000, "operation": "leaderboard_top", "seconds": {"median": 0.10}},
+        ]}
+        results = [
+            {"size": 1000, "operation": "screen_stocks", "seconds": {"median": 0.20}},
+            {"size": 1000, "operation": "leaderboard_top", "seconds": {"median": 0.11}},
+            {"size": 5000, "operation": "screen_stocks", "seconds": {"median": 9.0}},
+        ]
+
+        regressions = compare(results, baseline)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith("screen_stocks @ 1,000")
@@ -16,6 +16,7 @@ import type {
   Signal,
   ScoreChangeData,
   ScoreHistoryResponse,
+  ScoreHistoryBatchResponse,
   MoversResponse,
   SignalChangesResponse,
   HorizonProfile,
@@ -245,6 +246,15 @@ export const stockApi = {
     return response.data;
   },
 
+  // Get historical score data for many stocks in one request (watchlists, comparisons)
+  getScoreHistoryBatch: async (tickers: string[], days: number = 30): Promise<ScoreHistoryBatchResponse> => {
+    const response = await apiClient.post<ScoreHistoryBatchResponse>('/stocks/score-history/batch', {
+      tickers,
+      days
+    });
+    return response.data;
+  },
+
   // Weekly Changes Dashboard - Get top movers (gainers or losers)
   getScoreMovers: async (direction: 'up' | 'down', days: number = 7, limit: number = 10): Promise<MoversResponse> => {
     // Backend field names (score_change, historical_*) differ from the
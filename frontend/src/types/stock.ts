@@ -308,6 +308,24 @@ export interface ScoreHistoryResponse {
   history: ScoreHistoryPoint[];
 }
 
+// Columnar score history for many tickers; every array is aligned with `dates`
+export interface ScoreHistorySeries {
+  total_score: (number | null)[];
+  value_score: (number | null)[];
+  quality_score: (number | null)[];
+  momentum_score: (number | null)[];
+  health_score: (number | null)[];
+  signal: (string | null)[];
+}
+
+export interface ScoreHistoryBatchResponse {
+  start_date: string;
+  end_date: string | null;
+  dates: string[];
+  series: Record<string, ScoreHistorySeries>;
+  missing: string[];
+}
+
 // Investment Horizon Recommendations & Trade Signals
 
 export type InvestmentHorizon = 'short' | 'medium' | 'long';